@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Batch Docs Builder
+
+Builds many Docs trees in one run on a bounded process pool, instead of one
+interpreter launch per checkout:
+
+    python3 batch_build.py ~/checkouts/*/Docs --jobs 4
+    python3 batch_build.py "/srv/projects/**/Docs" --renderer local
+
+Arguments may be Docs folders, project checkouts containing `Docs/`, or glob
+patterns. All trees share one SVG cache (and parsed-YAML cache) directory, so
+a diagram rendered for one tree is reused by every other. Each worker process
+keeps one render backend - the pooled HTTP session or the local PlantUML
+processes - alive across all trees it builds. Per-tree output is captured and
+a single summary with status and timings is printed at the end.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+if __name__ == "__main__":
+    from docs_env import ensure_docs_venv
+    ensure_docs_venv(Path(__file__).parent / 'docs_venv', __file__)
+
+import argparse
+import glob
+import io
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import redirect_stdout
+from multiprocessing.util import Finalize
+
+import docs_builder
+from render_backend import create_backend
+from svg_cache import SvgCache
+from yaml_ingest import YamlCache, YamlIngest
+
+DEFAULT_CACHE_DIR = Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")) / "inspektor-docs"
+
+# Per-process state, set up once by _init_worker and reused for every tree the process builds
+_worker = {}
+
+
+def resolve_docs_roots(patterns) -> list:
+    """Expand globs and map project checkouts to their Docs folder; keeps order, drops duplicates."""
+    roots = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(os.path.expanduser(pattern), recursive=True)) or [pattern]
+        for match in matches:
+            path = Path(match)
+            if (path / 'Docs').is_dir():
+                path = path / 'Docs'
+            path = path.resolve()
+            if path not in roots:
+                roots.append(path)
+    return roots
+
+
+def _init_worker(options):
+    _worker["options"] = options
+    _worker["backend"] = create_backend(
+        options["renderer"],
+        server=options["plantuml_server"],
+        command=options["plantuml_cmd"],
+        pool_size=options["render_workers"],
+        retries=options["render_retries"],
+    )
+    # Close pooled connections / local PlantUML processes when the worker process exits
+    Finalize(_worker["backend"], _worker["backend"].close, exitpriority=10)
+    cache_dir = options["cache_dir"]
+    _worker["svg_cache"] = None if cache_dir is None else SvgCache(cache_dir / 'svg')
+    _worker["ingest"] = YamlIngest(None if cache_dir is None else YamlCache(cache_dir / 'yaml'),
+                                   streaming=options["stream_yaml"])
+
+
+def build_tree(docs_path):
+    """Build one Docs tree in a worker process; returns a result dict for the summary."""
+    options = _worker["options"]
+    log = io.StringIO()
+    start = time.perf_counter()
+    result = {"docs": str(docs_path), "log": ""}
+    try:
+        if not docs_path.is_dir():
+            raise FileNotFoundError(f"Docs folder not found: {docs_path}")
+        with redirect_stdout(log):
+            summary = docs_builder.build_docs(
+                docs_path,
+                _worker["svg_cache"],
+                render_workers=options["render_workers"],
+                backend=_worker["backend"],
+                full=options["full"],
+                ingest=_worker["ingest"],
+                shard_mode=options["shard"],
+                page_size=options["page_size"],
+                optimize=options["optimize"],
+                trace_db=options["trace_db"],
+            )
+        result.update(summary)
+        result["status"] = "issues" if summary["errors"] else "ok"
+    except Exception:
+        result["status"] = "failed"
+        result["errors"] = [traceback.format_exc(limit=3).strip()]
+    result["seconds"] = time.perf_counter() - start
+    result["log"] = log.getvalue()
+    return result
+
+
+def build_many(docs_roots, jobs, options):
+    """Build every tree on a pool of `jobs` processes; yields result dicts as trees finish."""
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(options,)) as pool:
+        futures = [pool.submit(build_tree, docs_path) for docs_path in docs_roots]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def print_summary(results, elapsed):
+    width = max([len(r["docs"]) for r in results] + [4])
+    print(f"\n{'tree':<{width}}  {'status':<7} {'pages':>11} {'written':>7} {'errors':>6} {'seconds':>8}")
+    for r in results:
+        pages = f"{r.get('regenerated', '-')}/{r.get('pages', '-')}"
+        print(f"{r['docs']:<{width}}  {r['status']:<7} {pages:>11} {r.get('written', '-'):>7} "
+              f"{len(r.get('errors', [])):>6} {r['seconds']:>8.2f}")
+    busy = sum(r["seconds"] for r in results)
+    counts = {status: sum(1 for r in results if r["status"] == status) for status in ("ok", "issues", "failed")}
+    print(f"\n{len(results)} tree(s): {counts['ok']} ok, {counts['issues']} with issues, {counts['failed']} failed "
+          f"in {elapsed:.2f} s wall ({busy:.2f} s of tree builds).")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Build many Docs trees in parallel with shared caches.")
+    parser.add_argument("roots", nargs="+", help="Docs folders, project checkouts or glob patterns.")
+    parser.add_argument("--jobs", type=int, default=min(4, os.cpu_count() or 1),
+                        help="Trees built concurrently (default: min(4, CPUs)).")
+    parser.add_argument("--cache-dir", type=Path, default=DEFAULT_CACHE_DIR,
+                        help=f"Cache directory shared by all trees (default: {DEFAULT_CACHE_DIR}).")
+    parser.add_argument("--show-logs", action="store_true", help="Print each tree's build output, not only errors.")
+    docs_builder.add_build_arguments(parser)
+    return parser.parse_args(argv)
+
+
+def main():
+    args = parse_args()
+    docs_roots = resolve_docs_roots(args.roots)
+    if not docs_roots:
+        print("No Docs trees matched.")
+        sys.exit(1)
+    cache_dir = None if args.no_cache else args.cache_dir
+    if args.purge_cache:
+        removed = SvgCache(args.cache_dir / 'svg').purge() + YamlCache(args.cache_dir / 'yaml').purge()
+        print(f"Purged {removed} cached file(s) from {args.cache_dir}")
+
+    options = {
+        "cache_dir": cache_dir,
+        "renderer": args.renderer,
+        "plantuml_server": args.plantuml_server,
+        "plantuml_cmd": args.plantuml_cmd,
+        "render_workers": args.render_workers,
+        "render_retries": args.render_retries,
+        "stream_yaml": args.stream_yaml,
+        "full": args.full,
+        "shard": args.shard,
+        "page_size": args.page_size,
+        "optimize": args.optimize,
+        "trace_db": args.trace_db,
+    }
+    jobs = max(1, min(args.jobs, len(docs_roots)))
+    print(f"Building {len(docs_roots)} Docs tree(s) with {jobs} job(s)...")
+
+    start = time.perf_counter()
+    results = []
+    for result in build_many(docs_roots, jobs, options):
+        results.append(result)
+        print(f"[{len(results)}/{len(docs_roots)}] {result['status']:<7} {result['docs']} ({result['seconds']:.2f} s)")
+        if args.show_logs and result["log"]:
+            print(result["log"].rstrip())
+        if result["status"] == "failed":
+            print(result["errors"][0])
+    results.sort(key=lambda r: docs_roots.index(Path(r["docs"])))
+    print_summary(results, time.perf_counter() - start)
+
+    if any(r["status"] == "failed" for r in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Startup Benchmark
+
+Measures how long `docs_builder` takes to import (`python -X importtime`) and
+to start (`docs_builder.py --help`), and checks that heavy dependencies stay
+lazily imported. Exits with code 1 on a regression, so it can gate CI:
+
+    python3 benchmarks/bench_import_time.py --runs 5 --budget-ms 80
+"""
+
+import argparse
+import re
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+AUTOMATION_PATH = Path(__file__).resolve().parent.parent
+# Imported only in the stages that need them (see render_backend._requests and yaml_ingest.safe_loader)
+LAZY_MODULES = ("requests", "urllib3", "yaml")
+IMPORT_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def import_profile(module):
+    """Return [(self us, cumulative us, depth, name)] from one `-X importtime` run."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=AUTOMATION_PATH, capture_output=True, text=True, check=True,
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            rows.append((int(self_us), int(cumulative_us), len(indent) // 2, name))
+    return rows
+
+
+def startup_seconds():
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "docs_builder.py", "--help"], cwd=AUTOMATION_PATH,
+                   capture_output=True, check=True)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark docs_builder import and startup time.")
+    parser.add_argument("--runs", type=int, default=5, help="Runs per measurement; the best is kept.")
+    parser.add_argument("--budget-ms", type=float, default=None,
+                        help="Fail if importing docs_builder takes longer than this.")
+    parser.add_argument("--top", type=int, default=10, help="Slowest imports to list.")
+    args = parser.parse_args()
+
+    profiles = [import_profile("docs_builder") for _ in range(args.runs)]
+    totals = [next(cumulative for _, cumulative, depth, name in rows if name == "docs_builder" and depth == 0)
+              for rows in profiles]
+    best = profiles[totals.index(min(totals))]
+    startup = min(startup_seconds() for _ in range(args.runs))
+
+    print(f"import docs_builder: {min(totals) / 1e3:.1f} ms (best of {args.runs})")
+    print(f"docs_builder.py --help: {startup * 1e3:.1f} ms wall, including interpreter startup")
+    print("\nSlowest imports under docs_builder (self ms / cumulative ms):")
+    # Children are listed before their parent: take the rows since the previous top-level import
+    end = next(i for i, row in enumerate(best) if row[3] == "docs_builder" and row[2] == 0)
+    start = end
+    while start > 0 and best[start - 1][2] > 0:
+        start -= 1
+    inside = best[start:end + 1]
+    for self_us, cumulative_us, _, name in sorted(inside, key=lambda row: -row[0])[:args.top]:
+        print(f"  {name:<32} {self_us / 1e3:>7.2f} {cumulative_us / 1e3:>9.2f}")
+
+    problems = []
+    imported = {name for _, _, _, name in best}
+    eager = [name for name in LAZY_MODULES if name in imported]
+    if eager:
+        problems.append(f"imported at startup but should be lazy: {', '.join(eager)}")
+    if args.budget_ms is not None and min(totals) / 1e3 > args.budget_ms:
+        problems.append(f"import took {min(totals) / 1e3:.1f} ms, budget is {args.budget_ms:.1f} ms")
+    if problems:
+        print("\nStartup regressions:")
+        for problem in problems:
+            print(f" - {problem}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Page Writer Benchmark
+
+Compares the streaming requirements page writer (`iter_requirements_html` +
+`stream_if_changed`) against the original writer, which grew the whole page
+with `content +=` over the YAML dicts and handed it to `write_text`. A copy
+of that writer is kept below as the baseline. Reports wall time and peak
+traced memory:
+
+    python3 benchmarks/bench_page_writer.py --sizes 1000 10000 100000
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from build_manifest import stream_if_changed  # noqa: E402
+from docs_builder import (  # noqa: E402
+    generate_html_footer,
+    generate_html_head,
+    generate_navigation,
+    iter_requirements_html,
+)
+
+STATUSES = ["Draft", "In Progress", "In Review", "Finished"]
+
+
+def legacy_requirements_html(requirements_data, title, page_name, links):
+    """The original string-concatenating writer; only the card markup follows today's pages, for comparison."""
+    content = f"""
+{generate_html_head(title)}
+{generate_navigation(page_name)}
+<main>
+    <h1>{title}</h1>
+    <p>This section contains all {title.lower()} with their current status and details.</p>
+"""
+
+    for req in requirements_data:
+        status = req.get('status', 'draft')
+        status_slug = status.lower().replace(' ', '-')
+        req_id = req['id']
+
+        refines_links = {link.split('#')[1]: link for link in links.get(f"refines_{req_id}", [])}
+        refined = req.get('refines')
+        refined = [refined] if isinstance(refined, str) else refined or []
+        refines = ', '.join(
+            f'<a href="{refines_links[parent_id]}">{parent_id}</a>' if parent_id in refines_links else parent_id
+            for parent_id in refined
+        ) or 'N/A'
+
+        content += f"""
+    <div class="requirement status-{status_slug}" id="{req_id}">
+        <h3>{req_id}: {req['name']}</h3>
+        <p><strong>Status:</strong> <span class="status-badge badge-{status_slug}">{status}</span></p>
+        <p><strong>Refines:</strong> {refines}</p>
+        <p><strong>Description:</strong></p>
+        <p>{req.get('description', 'N/A').replace('> ', '').strip()}</p>
+"""
+
+        refining_links = links.get(f"refined_by_{req_id}", [])
+        if refining_links:
+            content += "<p><strong>Refined by:</strong></p><ul>"
+            for link in refining_links:
+                content += f'<li><a href="{link}">{link.split("#")[1]}</a></li>'
+            content += "</ul>"
+
+        content += "</div>"
+
+    content += """
+</main>
+"""
+    content += generate_html_footer()
+    return content
+
+
+def synthetic_requirements(count):
+    return [
+        {
+            "id": f"REQ-SW-{i:06d}",
+            "name": f"Synthetic requirement {i}",
+            "status": STATUSES[i % len(STATUSES)],
+            "refines": f"REQ-{i % 97:03d}",
+            "description": "> Generated description text for benchmarking the page writer. " * 3,
+        }
+        for i in range(count)
+    ]
+
+
+def measure(func, trace_memory):
+    """Return (seconds, peak bytes); timing and memory are taken in separate runs."""
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    if not trace_memory:
+        return elapsed, None
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark streaming vs. whole-page string writers.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc pass.")
+    args = parser.parse_args()
+
+    print(f"{'requirements':>12}  {'string s':>9}  {'string peak':>12}  {'stream s':>9}  {'stream peak':>12}")
+    with tempfile.TemporaryDirectory() as tmp:
+        string_path = Path(tmp) / "string.html"
+        stream_path = Path(tmp) / "stream.html"
+        for size in args.sizes:
+            reqs = synthetic_requirements(size)
+            links = {f"refines_{req['id']}": [f"high_level.html#{req['refines']}"] for req in reqs}
+
+            def write_string():
+                html = legacy_requirements_html(reqs, "Software Requirements", "software", links)
+                string_path.write_text(html, encoding="utf-8")
+
+            def write_stream():
+                stream_path.unlink(missing_ok=True)
+                stream_if_changed(stream_path, iter_requirements_html(reqs, "Software Requirements", "software", links))
+
+            string_time, string_peak = measure(write_string, not args.no_memory)
+            stream_time, stream_peak = measure(write_stream, not args.no_memory)
+            assert string_path.read_bytes() == stream_path.read_bytes()
+
+            def fmt_peak(peak):
+                return "n/a" if peak is None else f"{peak / 1e6:.1f}MB"
+
+            print(
+                f"{size:>12}  {string_time:>9.3f}  {fmt_peak(string_peak):>12}"
+                f"  {stream_time:>9.3f}  {fmt_peak(stream_peak):>12}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+PlantUML Codec Benchmark
+
+Times `plantuml_codec.encode` against the original per-byte encoder on
+synthetic class diagrams of growing size. The original encoder is kept here
+as the reference; tests/test_plantuml_codec.py checks that both produce
+identical output and that `decode` round-trips:
+
+    python3 benchmarks/bench_plantuml_codec.py --sizes 10000 100000 500000
+"""
+
+import argparse
+import random
+import sys
+import time
+import zlib
+from pathlib import Path
+
+AUTOMATION_PATH = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(AUTOMATION_PATH))
+
+import plantuml_codec  # noqa: E402
+
+
+def legacy_encode(puml_text: str) -> str:
+    """The original per-byte encoder, kept as the reference implementation."""
+    compressor = zlib.compressobj(level=9, wbits=-zlib.MAX_WBITS)
+    compressed = compressor.compress(puml_text.encode("utf-8")) + compressor.flush()
+
+    alphabet = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz-_"
+    encoded_chars = []
+
+    for i in range(0, len(compressed), 3):
+        b1 = compressed[i]
+        b2 = compressed[i + 1] if i + 1 < len(compressed) else 0
+        b3 = compressed[i + 2] if i + 2 < len(compressed) else 0
+
+        encoded_chars.append(alphabet[(b1 >> 2) & 0x3F])
+        encoded_chars.append(alphabet[((b1 & 0x03) << 4) | ((b2 >> 4) & 0x0F)])
+
+        if i + 1 < len(compressed):
+            encoded_chars.append(alphabet[((b2 & 0x0F) << 2) | ((b3 >> 6) & 0x03)])
+        if i + 2 < len(compressed):
+            encoded_chars.append(alphabet[b3 & 0x3F])
+
+    return "".join(encoded_chars)
+
+
+def synthetic_class_diagram(target_chars, seed=0):
+    rng = random.Random(seed)
+    lines = ["@startuml Synthetic"]
+    size = len(lines[0])
+    i = 0
+    while size < target_chars:
+        fields = "\n".join(f"  +field{j}: {rng.choice(['int', 'str', 'List<Case>'])}" for j in range(rng.randint(1, 6)))
+        block = f"class C{i} {{\n{fields}\n}}\nC{i} --> C{rng.randint(0, i)} : uses{rng.randint(0, 99)}"
+        lines.append(block)
+        size += len(block) + 1
+        i += 1
+    lines.append("@enduml")
+    return "\n".join(lines)
+
+
+def best_of(func, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the PlantUML URL encoder.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 500_000],
+                        help="Diagram sizes in characters.")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    print(f"{'chars':>9}  {'deflated':>9}  {'legacy ms':>10}  {'codec ms':>9}  {'mapping ms':>11}  {'legacy map ms':>14}")
+    for size in args.sizes:
+        text = synthetic_class_diagram(size, args.seed)
+        if plantuml_codec.encode(text) != legacy_encode(text):
+            raise AssertionError(f"Encoder mismatch for input of {len(text)} chars")
+        deflated = plantuml_codec.deflate(text)
+        legacy_time = best_of(lambda: legacy_encode(text), args.repeat)
+        codec_time = best_of(lambda: plantuml_codec.encode(text), args.repeat)
+        mapping_time = best_of(lambda: plantuml_codec.encode_bytes(deflated), args.repeat)
+        deflate_time = best_of(lambda: plantuml_codec.deflate(text), args.repeat)
+        print(
+            f"{len(text):>9}  {len(deflated):>9}  {legacy_time * 1e3:>10.2f}  {codec_time * 1e3:>9.2f}"
+            f"  {mapping_time * 1e3:>11.3f}  {max(legacy_time - deflate_time, 0) * 1e3:>14.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Requirement Model Benchmark
+
+Compares raw YAML dicts with `RequirementStore` on synthetic requirement files:
+memory retained by the parsed requirements (tracemalloc, after the dicts are
+dropped) and the cost of rendering the requirement cards, against the
+original dict-based card loop kept here as the reference:
+
+    python3 benchmarks/bench_requirement_model.py --sizes 1000 10000 100000
+"""
+
+import argparse
+import gc
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from corpus import write_requirements  # noqa: E402
+from docs_builder import iter_requirements_html  # noqa: E402
+from requirement_model import RequirementStore  # noqa: E402
+from traceability import TraceGraph, refined_ids  # noqa: E402
+from yaml_ingest import load_file  # noqa: E402
+
+
+def legacy_cards(requirements_data, links):
+    """The original per-card loop over YAML dicts, kept as the reference implementation."""
+    for req in requirements_data:
+        status = req.get('status', 'draft')
+        status_slug = status.lower().replace(' ', '-')
+        status_class = f"status-{status_slug}"
+        req_id = req['id']
+
+        refines_links = {link.split('#')[1]: link for link in links.get(f"refines_{req_id}", [])}
+        refines = ', '.join(
+            f'<a href="{refines_links[parent_id]}">{parent_id}</a>' if parent_id in refines_links else parent_id
+            for parent_id in refined_ids(req)
+        ) or 'N/A'
+
+        card = [f"""
+    <div class="requirement {status_class}" id="{req_id}">
+        <h3>{req_id}: {req['name']}</h3>
+        <p><strong>Status:</strong> <span class="status-badge badge-{status_slug}">{status}</span></p>
+        <p><strong>Refines:</strong> {refines}</p>
+        <p><strong>Description:</strong></p>
+        <p>{req.get('description', 'N/A').replace('> ', '').strip()}</p>
+"""]
+
+        refining_links = links.get(f"refined_by_{req_id}", [])
+        if refining_links:
+            card.append("<p><strong>Refined by:</strong></p><ul>")
+            for link in refining_links:
+                child_id = link.split('#')[1]
+                card.append(f'<li><a href="{link}">{child_id}</a></li>')
+            card.append("</ul>")
+
+        card.append("</div>")
+        yield "".join(card)
+
+
+def retained_bytes(path):
+    """Return (bytes held by the parsed dicts, bytes held by the store once the dicts are dropped)."""
+    gc.collect()
+    tracemalloc.start()
+    data = load_file(path)
+    dict_bytes = tracemalloc.get_traced_memory()[0]
+    store = RequirementStore.from_items(data)
+    del data
+    gc.collect()
+    store_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del store
+    return dict_bytes, store_bytes
+
+
+def best_of(func, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark YAML dicts vs. the columnar requirement store.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'requirements':>12}  {'dicts MB':>9}  {'store MB':>9}  {'legacy cards s':>15}  {'store cards s':>14}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            write_requirements(Path(tmp), size)
+            sw_path = Path(tmp) / "software_requirements.yaml"
+            hl_data = load_file(Path(tmp) / "high_level_requirements.yaml")
+            sw_data = load_file(sw_path)
+            links = TraceGraph.build([("high_level", hl_data), ("software", sw_data)]).page_links()
+            store = RequirementStore.from_items(sw_data)
+
+            # The page body must not change: compare against the reference loop
+            page = "".join(iter_requirements_html(store, "Software Requirements", "software", links))
+            if "".join(legacy_cards(sw_data, links)) not in page:
+                raise AssertionError(f"Card markup mismatch for {size} requirements")
+
+            legacy_time = best_of(lambda: sum(1 for _ in legacy_cards(sw_data, links)), args.repeat)
+            store_time = best_of(
+                lambda: sum(1 for _ in iter_requirements_html(store, "Software Requirements", "software", links)),
+                args.repeat,
+            )
+            del hl_data, sw_data, store
+            dict_bytes, store_bytes = retained_bytes(sw_path)
+            print(
+                f"{size:>12}  {dict_bytes / 1e6:>9.1f}  {store_bytes / 1e6:>9.1f}"
+                f"  {legacy_time:>15.3f}  {store_time:>14.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Traceability Database Benchmark
+
+Builds synthetic requirement stores (one high-level requirement per ten
+software ones, ~1% dangling refines, like corpus.py), exports them with
+`trace_db.export_trace_db` and times every query of the `trace_db.py` CLI:
+
+    python3 benchmarks/bench_trace_db.py --requirements 1000000 --runs 5
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from requirement_model import RequirementStore  # noqa: E402
+from trace_db import DEFAULT_LEVELS, QUERIES, export_trace_db, run_query  # noqa: E402
+from traceability import TraceGraph  # noqa: E402
+from validation import Diagnostic  # noqa: E402
+
+STATUSES = ["Draft", "In Progress", "In Review", "Finished"]
+
+
+def synthetic_levels(requirements, seed=0):
+    rng = random.Random(seed)
+    hl_count = max(1, requirements // 10)
+    high_level = RequirementStore.from_items(
+        {"id": f"REQ-{i:06d}", "name": f"High-level {i}", "status": rng.choice(STATUSES), "description": "HL"}
+        for i in range(hl_count)
+    )
+    software = RequirementStore.from_items(
+        {
+            "id": f"REQ-SW-{i:07d}",
+            "name": f"Software {i}",
+            "status": rng.choice(STATUSES),
+            "refines": "REQ-MISSING" if rng.random() < 0.01 else f"REQ-{rng.randrange(hl_count):06d}",
+            "description": "SW",
+        }
+        for i in range(requirements - hl_count)
+    )
+    return [("high_level", high_level), ("software", software)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the SQLite traceability export and its queries.")
+    parser.add_argument("--requirements", type=int, default=1000000)
+    parser.add_argument("--runs", type=int, default=5, help="Runs per query; the best is kept.")
+    args = parser.parse_args()
+
+    levels = synthetic_levels(args.requirements)
+    graph = TraceGraph.build(levels)
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "traceability.sqlite"
+        start = time.perf_counter()
+        counts = export_trace_db(db_path, levels, graph, [
+            Diagnostic("dangling-refines", "example diagnostic", file="requirements/software_requirements.yaml",
+                       id="REQ-000042"),
+        ])
+        export_seconds = time.perf_counter() - start
+        print(f"export: {counts['requirements']} requirements, {counts['refines']} edges in {export_seconds:.2f} s "
+              f"({db_path.stat().st_size / 1e6:.1f} MB)")
+
+        params = {"parent": "REQ-000042"}
+        print(f"\n{'query':<18} {'rows':>8} {'best ms':>9}  (counts only; printing rows is not timed)")
+        for name in sorted(QUERIES):
+            timings = []
+            for _ in range(args.runs):
+                start = time.perf_counter()
+                _, rows = run_query(db_path, name, level=DEFAULT_LEVELS.get(name), **params)
+                timings.append(time.perf_counter() - start)
+            print(f"{name:<18} {len(rows):>8} {min(timings) * 1e3:>9.2f}")
+        _, rows = run_query(db_path, "status-by-parent", level=None, parent=None)
+        print(f"{'status-by-parent*':<18} {len(rows):>8}  (all parents)")
+
+
+if __name__ == "__main__":
+    main()
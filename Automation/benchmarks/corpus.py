@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Synthetic Docs Corpus
+
+Generates a Docs tree (requirements YAML + architecture PUML) of a given size
+for benchmarking the docs pipeline. Software requirements are spread across
+the high-level ones (about one HL per ten SW) with a mix of statuses, list
+refines and a small share of dangling references:
+
+    python3 benchmarks/corpus.py --out /tmp/bench-docs --requirements 10000 --diagrams 50
+"""
+
+import argparse
+import random
+from pathlib import Path
+
+STANDARD_DIAGRAMS = ["runtime_diagram.puml", "class_diagram.puml", "block_diagram.puml"]
+STATUSES = ["Draft", "In Progress", "In Review", "Finished"]
+WORDS = (
+    "korisnik slucaj dokument dokaz istraga prijava sidebar tab backend frontend "
+    "validacija baza token ruta stranica status objava tim pregled arhiva"
+).split()
+
+
+def _sentence(rng, words):
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize()
+
+
+def write_requirements(requirements_path, requirements, seed=0):
+    """Write HL + SW YAML files; returns (hl_count, sw_count)."""
+    rng = random.Random(seed)
+    hl_count = max(1, requirements // 10)
+    sw_count = max(0, requirements - hl_count)
+    requirements_path.mkdir(parents=True, exist_ok=True)
+
+    with open(requirements_path / "high_level_requirements.yaml", "w", encoding="utf-8") as f:
+        f.write("# Synthetic high-level requirements\n\n")
+        for i in range(hl_count):
+            f.write(
+                f"- id: REQ-{i:06d}\n"
+                f"  name: {_sentence(rng, 4)}\n"
+                f"  status: {rng.choice(STATUSES)}\n"
+                f"  description: >\n"
+                f"    {_sentence(rng, 20)}\n"
+                f"    {_sentence(rng, 16)}\n\n"
+            )
+
+    with open(requirements_path / "software_requirements.yaml", "w", encoding="utf-8") as f:
+        f.write("# Synthetic software requirements\n\n")
+        for i in range(sw_count):
+            roll = rng.random()
+            if roll < 0.01:
+                refines = "REQ-MISSING"
+            elif roll < 0.2:
+                refines = f"[REQ-{rng.randrange(hl_count):06d}, REQ-{rng.randrange(hl_count):06d}]"
+            else:
+                refines = f"REQ-{rng.randrange(hl_count):06d}"
+            f.write(
+                f"- id: REQ-SW-{i:07d}\n"
+                f"  name: {_sentence(rng, 5)}\n"
+                f"  status: {rng.choice(STATUSES)}\n"
+                f"  refines: {refines}\n"
+                f"  description: >\n"
+                f"    {_sentence(rng, 24)}\n\n"
+            )
+    return hl_count, sw_count
+
+
+def synthetic_diagram(index, rng, classes=40):
+    lines = [f"@startuml Diagram {index}", f"title Synthetic diagram {index}"]
+    for i in range(classes):
+        fields = "\n".join(f"  +{rng.choice(WORDS)}{j}: String" for j in range(rng.randint(1, 5)))
+        lines.append(f"class C{i} {{\n{fields}\n}}")
+        if i:
+            lines.append(f"C{i} --> C{rng.randrange(i)} : {rng.choice(WORDS)}")
+    lines.append("@enduml")
+    return "\n".join(lines) + "\n"
+
+
+def write_diagrams(architecture_path, diagrams, seed=0):
+    """Write `diagrams` PUML files; returns their file names."""
+    rng = random.Random(seed)
+    architecture_path.mkdir(parents=True, exist_ok=True)
+    names = []
+    for i in range(diagrams):
+        # The first diagrams take the names docs_builder expects in a real Docs tree
+        name = STANDARD_DIAGRAMS[i] if i < len(STANDARD_DIAGRAMS) else f"synthetic_{i:04d}_diagram.puml"
+        (architecture_path / name).write_text(synthetic_diagram(i, rng), encoding="utf-8")
+        names.append(name)
+    return names
+
+
+def generate_corpus(docs_path, requirements, diagrams, seed=0):
+    docs_path = Path(docs_path)
+    counts = write_requirements(docs_path / "requirements", requirements, seed)
+    names = write_diagrams(docs_path / "architecture", diagrams, seed)
+    return counts, names
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic Docs tree.")
+    parser.add_argument("--out", type=Path, required=True, help="Docs folder to create.")
+    parser.add_argument("--requirements", type=int, default=1000)
+    parser.add_argument("--diagrams", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    (hl_count, sw_count), names = generate_corpus(args.out, args.requirements, args.diagrams, args.seed)
+    print(f"Wrote {hl_count} high-level, {sw_count} software requirements and {len(names)} diagrams to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
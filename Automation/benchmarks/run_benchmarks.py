@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Docs Pipeline Benchmark Suite
+
+Generates synthetic corpora (see corpus.py) and times each pipeline stage:
+YAML load, validate_requirement_list, link graph, generate_requirements_html,
+page writes, PUML encoding, diagram rendering through a local stub PlantUML
+server, and a full end-to-end build_docs. Results are written as JSON, and a
+later run can be compared against an earlier one so CI fails on regressions.
+Timings only compare on the same machine, so no baseline is kept in the
+repository; record one where the comparison runs:
+
+    python3 benchmarks/run_benchmarks.py --requirements 1000 10000 --diagrams 10 100 \\
+        --output bench-baseline.json
+    python3 benchmarks/run_benchmarks.py --requirements 1000 10000 --diagrams 10 100 \\
+        --output bench-results.json --baseline bench-baseline.json
+"""
+
+import argparse
+import io
+import json
+import platform
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from datetime import datetime, timezone
+from pathlib import Path
+
+BENCH_PATH = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCH_PATH.parent))
+sys.path.insert(0, str(BENCH_PATH))
+
+import plantuml_codec  # noqa: E402
+from corpus import write_diagrams, write_requirements  # noqa: E402
+from docs_builder import (  # noqa: E402
+    build_docs,
+    generate_requirements_html,
+    load_yaml,
+    render_diagrams,
+    validate_requirement_list,
+)
+from plantuml_stub_server import start_stub_server  # noqa: E402
+from render_backend import HttpRenderBackend  # noqa: E402
+from traceability import TraceGraph  # noqa: E402
+
+# Stages faster than this are too noisy to flag as regressions
+MIN_COMPARABLE_SECONDS = 0.005
+
+
+def best_of(func, repeat):
+    """Return (best seconds, last result)."""
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def bench_requirements(docs_path, size, repeat, stub_url):
+    """Time the requirement stages for one corpus size; returns {stage: seconds}."""
+    requirements_path = docs_path / "requirements"
+    write_requirements(requirements_path, size)
+    hl_path = requirements_path / "high_level_requirements.yaml"
+    sw_path = requirements_path / "software_requirements.yaml"
+    timings = {}
+    errors = []
+
+    timings["load_yaml"], (hl_raw, sw_raw) = best_of(lambda: (load_yaml(hl_path), load_yaml(sw_path)), repeat)
+    timings["validate"], (hl_data, sw_data) = best_of(lambda: (
+        validate_requirement_list(hl_raw, "High-level", ["id", "name", "status", "description"], errors.append),
+        validate_requirement_list(sw_raw, "Software", ["id", "name", "status", "refines", "description"],
+                                  errors.append),
+    ), repeat)
+    timings["link_graph"], links = best_of(lambda: TraceGraph.build(
+        [("high_level", hl_data), ("software", sw_data)]
+    ).page_links(), repeat)
+    timings["generate_html"], pages = best_of(lambda: (
+        generate_requirements_html(hl_data, "High-Level Requirements", "high_level", links),
+        generate_requirements_html(sw_data, "Software Requirements", "software", links),
+    ), repeat)
+
+    out_path = docs_path / "bench_out"
+    out_path.mkdir(exist_ok=True)
+    timings["write_pages"], _ = best_of(lambda: [
+        (out_path / f"page{i}.html").write_text(page, encoding="utf-8") for i, page in enumerate(pages)
+    ], repeat)
+
+    # End to end, forcing a full rebuild each time; diagrams come from the stub server
+    write_diagrams(docs_path / "architecture", 3)
+    backend = HttpRenderBackend(stub_url)
+    try:
+        with redirect_stdout(io.StringIO()):
+            timings["build_docs"], _ = best_of(lambda: build_docs(docs_path, None, backend=backend, full=True), repeat)
+    finally:
+        backend.close()
+    return timings
+
+
+def bench_diagrams(docs_path, count, repeat, stub_url, workers):
+    """Time encoding and stub-server rendering of `count` diagrams; returns {stage: seconds}."""
+    names = write_diagrams(docs_path / "architecture", count)
+    sources = [(docs_path / "architecture" / name).read_text(encoding="utf-8") for name in names]
+    diagrams = [(name, name, name[:-len(".puml")]) for name in names]
+    timings = {}
+
+    timings["encode"], _ = best_of(lambda: [plantuml_codec.encode(source) for source in sources], repeat)
+    backend = HttpRenderBackend(stub_url, pool_size=workers)
+    try:
+        with redirect_stdout(io.StringIO()):
+            timings["render"], _ = best_of(
+                lambda: render_diagrams(docs_path, diagrams, None, workers, backend), repeat
+            )
+    finally:
+        backend.close()
+    return timings
+
+
+def compare(results, baseline, tolerance):
+    """Return a list of regression messages for stages slower than baseline * (1 + tolerance)."""
+    previous = {(r["case"], r["stage"]): r["seconds"] for r in baseline.get("results", [])}
+    regressions = []
+    for result in results:
+        old = previous.get((result["case"], result["stage"]))
+        if old is None or max(old, result["seconds"]) < MIN_COMPARABLE_SECONDS:
+            continue
+        if result["seconds"] > old * (1 + tolerance):
+            regressions.append(
+                f"{result['case']} {result['stage']}: {result['seconds']:.4f}s vs baseline {old:.4f}s "
+                f"(+{(result['seconds'] / old - 1) * 100:.0f}%)"
+            )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the docs pipeline on synthetic corpora.")
+    parser.add_argument("--requirements", type=int, nargs="*", default=[1000, 10000],
+                        help="Corpus sizes in total requirements (e.g. 1000 10000 100000 1000000).")
+    parser.add_argument("--diagrams", type=int, nargs="*", default=[10, 100],
+                        help="Diagram counts (e.g. 10 100 1000).")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per stage; the best time is kept.")
+    parser.add_argument("--render-workers", type=int, default=8)
+    parser.add_argument("--stub-delay", type=float, default=0.0, help="Simulated PlantUML latency in seconds.")
+    parser.add_argument("--output", type=Path, default=None, help="Write JSON results here.")
+    parser.add_argument("--baseline", type=Path, default=None, help="Compare against a previous JSON result.")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown vs baseline (0.25 = 25%%).")
+    args = parser.parse_args()
+
+    stub = start_stub_server(delay=args.stub_delay)
+    results = []
+    try:
+        for size in args.requirements:
+            with tempfile.TemporaryDirectory() as tmp:
+                timings = bench_requirements(Path(tmp), size, args.repeat, stub.base_url)
+            results.extend({"case": f"requirements={size}", "stage": k, "seconds": v} for k, v in timings.items())
+        for count in args.diagrams:
+            with tempfile.TemporaryDirectory() as tmp:
+                timings = bench_diagrams(Path(tmp), count, args.repeat, stub.base_url, args.render_workers)
+            results.extend({"case": f"diagrams={count}", "stage": k, "seconds": v} for k, v in timings.items())
+    finally:
+        stub.shutdown()
+
+    print(f"{'case':<24} {'stage':<16} {'seconds':>10}")
+    for result in results:
+        print(f"{result['case']:<24} {result['stage']:<16} {result['seconds']:>10.4f}")
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "repeat": args.repeat,
+            "stub_delay": args.stub_delay,
+        },
+        "results": results,
+    }
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"\nResults written to {args.output}")
+
+    if args.baseline:
+        regressions = compare(results, json.loads(args.baseline.read_text(encoding="utf-8")), args.tolerance)
+        if regressions:
+            print("\nRegressions against baseline:")
+            for message in regressions:
+                print(f" - {message}")
+            sys.exit(1)
+        print(f"\nNo regressions against {args.baseline} (tolerance {args.tolerance:.0%}).")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Build Manifest
+
+Records the inputs each generated page was built from (source file hashes,
+builder version, template hash) in `Docs/build/.manifest.json`, so the next
+build only regenerates pages whose inputs changed and leaves the rest untouched.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+MANIFEST_NAME = ".manifest.json"
+MANIFEST_FORMAT = 1
+WRITE_CHUNK = 1 << 16
+
+
+def hash_bytes(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def hash_text(text: str) -> str:
+    return hash_bytes(text.encode("utf-8"))
+
+
+def hash_file(file_path):
+    """Return the sha256 of a file, or None if it cannot be read."""
+    try:
+        return hash_bytes(Path(file_path).read_bytes())
+    except OSError:
+        return None
+
+
+def inputs_digest(inputs: dict) -> str:
+    return hash_text(json.dumps(inputs, sort_keys=True))
+
+
+class BuildManifest:
+    """Per-page input digests for one build folder."""
+
+    def __init__(self, build_path):
+        self.build_path = Path(build_path)
+        self.path = self.build_path / MANIFEST_NAME
+        self.pages = {}
+        self._load()
+
+    def _load(self):
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if isinstance(data, dict) and data.get("format") == MANIFEST_FORMAT:
+            self.pages = data.get("pages", {})
+
+    def is_current(self, page: str, inputs: dict) -> bool:
+        """True if the page exists on disk and was built from exactly these inputs."""
+        entry = self.pages.get(page)
+        if not entry or entry.get("inputs") != inputs_digest(inputs):
+            return False
+        return (self.build_path / page).exists()
+
+    def record(self, page: str, inputs: dict):
+        self.pages[page] = {"inputs": inputs_digest(inputs)}
+
+    def forget(self, page: str):
+        self.pages.pop(page, None)
+
+    def prune(self, keep) -> list:
+        """Forget and delete recorded pages not in `keep`; returns the removed page names."""
+        removed = [page for page in self.pages if page not in keep]
+        for page in removed:
+            (self.build_path / page).unlink(missing_ok=True)
+            del self.pages[page]
+        return removed
+
+    def save(self):
+        tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        payload = {"format": MANIFEST_FORMAT, "pages": self.pages}
+        tmp_path.write_text(json.dumps(payload, indent=2, sort_keys=True), encoding="utf-8")
+        os.replace(tmp_path, self.path)
+
+
+def _file_digest(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.digest()
+
+
+def stream_if_changed(path, fragments) -> bool:
+    """Stream text fragments to a file, replacing it only if the bytes differ.
+
+    Fragments are joined into ~64 KB chunks and written to a temp file next to
+    the target, so memory stays bounded by one chunk rather than the whole page.
+    Returns True if the target was (re)written.
+    """
+    path = Path(path)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    digest = hashlib.sha256()
+    try:
+        with open(tmp_path, "wb") as out:
+            pending = []
+            pending_len = 0
+            for fragment in fragments:
+                pending.append(fragment)
+                pending_len += len(fragment)
+                if pending_len >= WRITE_CHUNK:
+                    data = "".join(pending).encode("utf-8")
+                    digest.update(data)
+                    out.write(data)
+                    pending = []
+                    pending_len = 0
+            data = "".join(pending).encode("utf-8")
+            digest.update(data)
+            out.write(data)
+            size = out.tell()
+
+        try:
+            unchanged = path.stat().st_size == size and _file_digest(path) == digest.digest()
+        except OSError:
+            unchanged = False
+
+        if unchanged:
+            tmp_path.unlink()
+            return False
+        os.replace(tmp_path, path)
+        return True
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def write_if_changed(path, content: str) -> bool:
+    """Write text only when it differs from what is on disk; returns True if written."""
+    path = Path(path)
+    data = content.encode("utf-8")
+    try:
+        if path.stat().st_size == len(data) and path.read_bytes() == data:
+            return False
+    except OSError:
+        pass
+    path.write_bytes(data)
+    return True
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Build Profiler
+
+Per-stage and per-page timers, byte counts and counters for `build_docs`.
+`summary_table()` prints an aggregate view; `write_chrome_trace()` writes a
+Chrome `trace_event` JSON timeline (open it in chrome://tracing or Perfetto).
+"""
+
+import json
+import os
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+
+
+class BuildProfiler:
+    """Collects timed spans and counters; safe to use from render worker threads."""
+
+    enabled = True
+
+    def __init__(self):
+        self.events = []
+        self.counters = Counter()
+        self.byte_counts = Counter()
+        self._origin = time.perf_counter_ns()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name, page=None, **args):
+        """Time a block; `page` groups per-page spans under the same stage name."""
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            end = time.perf_counter_ns()
+            if page is not None:
+                args["page"] = page
+            with self._lock:
+                self.events.append({
+                    "name": name,
+                    "start": start - self._origin,
+                    "duration": end - start,
+                    "tid": threading.get_ident(),
+                    "args": args,
+                })
+
+    def count(self, name, amount=1):
+        with self._lock:
+            self.counters[name] += amount
+
+    def add_bytes(self, name, amount):
+        with self._lock:
+            self.byte_counts[name] += amount
+
+    def summary_table(self) -> str:
+        stats = defaultdict(lambda: [0, 0, 0])
+        for event in self.events:
+            entry = stats[event["name"]]
+            entry[0] += 1
+            entry[1] += event["duration"]
+            entry[2] = max(entry[2], event["duration"])
+
+        lines = [f"{'stage':<24} {'calls':>6} {'total ms':>10} {'mean ms':>9} {'max ms':>9} {'bytes':>12}"]
+        for name, (calls, total, longest) in sorted(stats.items(), key=lambda item: -item[1][1]):
+            byte_count = self.byte_counts.get(name, "")
+            lines.append(
+                f"{name:<24} {calls:>6} {total / 1e6:>10.2f} {total / calls / 1e6:>9.2f} "
+                f"{longest / 1e6:>9.2f} {byte_count:>12}"
+            )
+        if self.counters:
+            lines.append("")
+            lines.extend(f"{name:<24} {value:>6}" for name, value in sorted(self.counters.items()))
+        return "\n".join(lines)
+
+    def write_chrome_trace(self, path):
+        pid = os.getpid()
+        thread_ids = {}
+        trace = []
+        for event in sorted(self.events, key=lambda e: e["start"]):
+            tid = thread_ids.setdefault(event["tid"], len(thread_ids) + 1)
+            trace.append({
+                "name": event["name"] if "page" not in event["args"] else f"{event['name']} {event['args']['page']}",
+                "cat": event["name"],
+                "ph": "X",
+                "ts": event["start"] / 1e3,
+                "dur": event["duration"] / 1e3,
+                "pid": pid,
+                "tid": tid,
+                "args": event["args"],
+            })
+        end_ts = max((e["ts"] + e["dur"] for e in trace), default=0)
+        if self.counters:
+            trace.append({"name": "counters", "ph": "C", "ts": end_ts, "pid": pid, "args": dict(self.counters)})
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": trace, "displayTimeUnit": "ms"}, f)
+
+
+class NullProfiler:
+    """Drop-in profiler that records nothing, used when profiling is off."""
+
+    enabled = False
+
+    @contextmanager
+    def stage(self, name, page=None, **args):
+        yield
+
+    def count(self, name, amount=1):
+        pass
+
+    def add_bytes(self, name, amount):
+        pass
+
+
+NULL_PROFILER = NullProfiler()
@@ -10,72 +10,232 @@ import os
 import sys
 from pathlib import Path
 
-# Check if running in docs_venv, if not, restart in venv
-venv_python = Path(__file__).parent / 'docs_venv' / 'bin' / 'python'
-if venv_python.exists() and sys.executable != str(venv_python):
-    import subprocess
-    result = subprocess.run([str(venv_python), __file__], check=False)
-    sys.exit(result.returncode)
-
-import yaml
-import requests
+# Make docs_venv's packages importable in-process (re-exec only as a last resort, see docs_env)
+if __name__ == "__main__":
+    from docs_env import ensure_docs_venv
+    ensure_docs_venv(Path(__file__).parent / 'docs_venv', __file__)
+
+import argparse
+import functools
+import hashlib
+import html
+import json
+import re
 import shutil
-import zlib
-
-
+from concurrent.futures import ThreadPoolExecutor
+
+import plantuml_codec
+import yaml_ingest
+from build_profile import NULL_PROFILER, BuildProfiler
+from build_manifest import BuildManifest, hash_text, stream_if_changed, write_if_changed
+from docs_watch import DEFAULT_WATCH_INTERVAL, watch_docs
+from page_shards import DEFAULT_PAGE_SIZE, SHARD_MODES, page_map, plan_shards, shard_slug
+from postprocess import POSTPROCESS_VERSION, clear_postprocess, format_report, minify_css, postprocess_build
+from puml_includes import IncludeResolver
+from render_backend import BACKENDS, PLANTUML_COMMAND, PLANTUML_SERVER, HttpRenderBackend, RenderError, create_backend
+from requirement_model import RequirementStore, iter_rows
+from search_index import SEARCH_DIR, SEARCH_META, write_search_index
+from svg_cache import SvgCache
+from trace_db import TRACE_DB_FORMAT, TRACE_DB_NAME, export_trace_db
+from traceability import TraceGraph
+from validation import (
+    REQUIREMENT_FILES, Diagnostic, check_item, check_links, report_json, store_result, validate_docs,
+)
+from yaml_ingest import YamlCache, YamlIngest
+
+# Bump whenever generated markup changes so incremental builds regenerate every page
+BUILDER_VERSION = "6"
+DEFAULT_RENDER_WORKERS = 4
+
+# Rendered diagrams are written as standalone files under build/diagrams/<slug>.svg
+DIAGRAM_ASSET_DIR = 'diagrams'
+# Hub card text of the original diagrams; other diagrams show their source path
+DIAGRAM_DESCRIPTIONS = {
+    'runtime': 'Sequence of runtime interactions.',
+    'class': 'Class structure and relationships.',
+    'block': 'High-level blocks and data flows.',
+}
+# Output pages a diagram slug must not take over
+RESERVED_PAGES = {'index', 'architecture', 'search', 'high_level', 'software'}
+
+# (requirements level / output page slug, page title)
+REQUIREMENT_LEVELS = [
+    ('high_level', 'High-Level Requirements'),
+    ('software', 'Software Requirements'),
+]
+
+
+# One write per line: render threads log concurrently and print() writes the newline separately
 def log_warning(message: str):
-    print(f"WARNING: {message}")
+    print(f"WARNING: {message}\n", end="")
 
 
 def log_error(message: str):
-    print(f"ERROR: {message}")
+    print(f"ERROR: {message}\n", end="")
+
+
+def iter_valid_requirements(items, label, required_keys, add_error, file=None):
+    """Validate requirement items one at a time (see validation.check_item), yielding the valid ones.
 
+    Problems go to add_error as validation.Diagnostic objects for `file` (relative to Docs).
+    """
+    seen_ids = set()
+
+    def report(rule, message, item_id):
+        add_error(Diagnostic(rule, message, file=file, index=idx, id=item_id))
+
+    for idx, item in enumerate(items):
+        if check_item(item, idx, label, required_keys, seen_ids, report):
+            yield item
 
-def validate_requirement_list(data, label, required_keys, add_error):
+
+def validate_requirement_list(data, label, required_keys, add_error, file=None):
     """Validate a requirement YAML list; returns a cleaned list (invalid entries skipped)."""
     if data is None:
         return []
     if not isinstance(data, list):
-        add_error(f"{label} YAML must be a list of items.")
+        add_error(Diagnostic("schema", f"{label} YAML must be a list of items.", file=file))
         return []
 
-    cleaned = []
-    seen_ids = set()
-    allowed_status = {"draft", "in progress", "in review", "finished"}
+    return list(iter_valid_requirements(data, label, required_keys, add_error, file))
 
-    for idx, item in enumerate(data):
-        if not isinstance(item, dict):
-            add_error(f"{label}[{idx}] must be a mapping/dict.")
-            continue
 
-        missing = [k for k in required_keys if k not in item or item[k] in (None, "")]
-        if missing:
-            add_error(f"{label}[{idx}] missing required fields: {', '.join(missing)}.")
-            continue
+def load_yaml(file_path, ingest=None):
+    """Load YAML file content."""
+    try:
+        if ingest is not None:
+            return ingest.load(file_path)
+        return yaml_ingest.load_file(file_path)
+    except Exception as e:
+        log_error(f"Failed to load YAML '{file_path}': {e}")
+        return None
 
-        item_id = item.get("id")
-        if item_id in seen_ids:
-            add_error(f"{label} duplicate id '{item_id}'.")
-            continue
-        seen_ids.add(item_id)
 
-        status = str(item.get("status", "")).lower()
-        if status and status not in allowed_status:
-            add_error(f"{label} '{item_id}' has unknown status '{item['status']}'.")
+def load_requirements(file_path, label, required_keys, add_error, ingest=None, profiler=NULL_PROFILER, file=None):
+    """Load and validate one requirements file into a RequirementStore.
+
+    With a streaming ingest, items are parsed and validated in batches instead
+    of materializing the whole YAML document first. Problems go to add_error
+    as validation.Diagnostic objects; `file` is the path relative to Docs.
+    """
+    if ingest is not None and ingest.streaming:
+        with profiler.stage("ingest", page=file_path.name):
+            try:
+                return RequirementStore.from_items(
+                    iter_valid_requirements(ingest.iter_items(file_path), label, required_keys, add_error, file)
+                )
+            except yaml_ingest.YamlShapeError:
+                add_error(Diagnostic("schema", f"{label} YAML must be a list of items.", file=file))
+            except Exception as e:
+                log_error(f"Failed to load YAML '{file_path}': {e}")
+                add_error(Diagnostic("yaml", f"Could not load {file_path}", file=file))
+            return RequirementStore()
+
+    with profiler.stage("load_yaml", page=file_path.name):
+        data = load_yaml(file_path, ingest)
+    if data is None:
+        add_error(Diagnostic("yaml", f"Could not load {file_path}", file=file))
+    with profiler.stage("validate", page=label):
+        return RequirementStore.from_items(validate_requirement_list(data, label, required_keys, add_error, file))
+
 
-        cleaned.append(item)
+def file_stat_key(file_path):
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
 
-    return cleaned
 
+class BuildSession:
+    """Requirements and link state kept in memory between builds of one Docs tree (watch mode)."""
 
-def load_yaml(file_path):
-    """Load YAML file content."""
+    def __init__(self):
+        # file path -> (stat key, RequirementStore, validation Diagnostics)
+        self.requirements = {}
+        # (hl store, sw store, shard mode, page size, linked result); stores compared by identity
+        self.linked = None
+        # (id, name, status, description) -> search terms, see search_index.build_index
+        self.search_terms = {}
+        # postings, shards and document chunks last written, see search_index.write_search_index
+        self.search_index = {}
+        # PUML files read while expanding !include, memoized by stat
+        self.includes = IncludeResolver()
+        # requirements file -> (stat key, validation.FileResult) for --check-only requests (build daemon)
+        self.checks = {}
+        self.builds = 0
+
+
+def load_requirements_cached(session, file_path, label, required_keys, add_error, ingest=None,
+                             profiler=NULL_PROFILER, file=None):
+    """load_requirements, reusing the session's store (and replaying its errors) while the file is unchanged."""
+    if session is None:
+        return load_requirements(file_path, label, required_keys, add_error, ingest, profiler, file)
+
+    key = file_stat_key(file_path)
+    cached = session.requirements.get(file_path)
+    if key is not None and cached is not None and cached[0] == key:
+        for diagnostic in cached[2]:
+            add_error(diagnostic)
+        return cached[1]
+
+    diagnostics = []
+
+    def record_error(diagnostic):
+        diagnostics.append(diagnostic)
+        add_error(diagnostic)
+
+    store = load_requirements(file_path, label, required_keys, record_error, ingest, profiler, file)
+    session.requirements[file_path] = (key, store, diagnostics)
+    return store
+
+
+def diagram_slug(source):
+    """'runtime_diagram.puml' -> 'runtime', 'network/flow_diagram.puml' -> 'network-flow'."""
+    stem = re.sub(r'_diagram$', '', source[:-len('.puml')])
+    return shard_slug(stem.replace('/', '-'))
+
+
+def diagram_title(source):
+    """'runtime_diagram.puml' -> 'Runtime Diagram'."""
+    stem = re.sub(r'_diagram$', '', Path(source).stem)
+    return f"{re.sub(r'[_-]+', ' ', stem).strip().title()} Diagram"
+
+
+def is_include_fragment(puml_path):
+    """Shared files meant for !include (no @startuml of their own) are not diagrams."""
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            return yaml.safe_load(f)
-    except Exception as e:
-        log_error(f"Failed to load YAML '{file_path}': {e}")
-        return None
+        return '@startuml' not in puml_path.read_text(encoding='utf-8')
+    except (OSError, UnicodeDecodeError):
+        return False
+
+
+def discover_diagrams(docs_path):
+    """[(source relative to Docs/architecture, page title, output page slug)] for every *.puml, by path."""
+    architecture_path = docs_path / 'architecture'
+    diagrams = []
+    used = set(RESERVED_PAGES)
+    for puml_path in sorted(architecture_path.rglob('*.puml')):
+        if is_include_fragment(puml_path):
+            continue
+        source = puml_path.relative_to(architecture_path).as_posix()
+        slug = base = diagram_slug(source)
+        counter = 1
+        # Also keep clear of requirement shard pages (high_level-1, software-draft, ...)
+        while slug in used or slug.startswith(('high_level-', 'software-')):
+            counter += 1
+            slug = f"{base}~{counter}"
+        used.add(slug)
+        diagrams.append((source, diagram_title(source), slug))
+    return diagrams
+
+
+def fallback_svg(title):
+    """Placeholder asset for a diagram that could not be rendered."""
+    return (
+        '<svg xmlns="http://www.w3.org/2000/svg" width="360" height="60">'
+        f'<text x="12" y="36" font-family="sans-serif" font-size="14">{html.escape(title)}: not rendered</text></svg>'
+    )
 
 
 def load_puml(file_path):
@@ -90,50 +250,41 @@ def load_puml(file_path):
 
 def _plantuml_encode(puml_text: str) -> str:
     """Encode PlantUML text using the official deflate + 6-bit algorithm."""
-    # Raw DEFLATE (no zlib header) is required; wbits=-15 turns off headers/checksums
-    compressor = zlib.compressobj(level=9, wbits=-zlib.MAX_WBITS)
-    compressed = compressor.compress(puml_text.encode("utf-8")) + compressor.flush()
-
-    alphabet = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz-_"
-    encoded_chars = []
-
-    for i in range(0, len(compressed), 3):
-        b1 = compressed[i]
-        b2 = compressed[i + 1] if i + 1 < len(compressed) else 0
-        b3 = compressed[i + 2] if i + 2 < len(compressed) else 0
+    return plantuml_codec.encode(puml_text)
 
-        encoded_chars.append(alphabet[(b1 >> 2) & 0x3F])
-        encoded_chars.append(alphabet[((b1 & 0x03) << 4) | ((b2 >> 4) & 0x0F)])
 
-        if i + 1 < len(compressed):
-            encoded_chars.append(alphabet[((b2 & 0x0F) << 2) | ((b3 >> 6) & 0x03)])
-        if i + 2 < len(compressed):
-            encoded_chars.append(alphabet[b3 & 0x3F])
+def is_fallback_render(svg: str) -> bool:
+    return svg.startswith("<div class='puml-fallback'>")
 
-    return "".join(encoded_chars)
 
-
-def render_puml_to_svg(puml_text):
-    """Render PUML text to SVG using PlantUML server."""
+def render_puml_to_svg(puml_text, cache=None, backend=None):
+    """Render PUML text to SVG using the render backend (served from cache when available)."""
     try:
         if not isinstance(puml_text, str) or not puml_text.strip():
             raise ValueError("PUML source is empty or invalid.")
 
-        encoded = _plantuml_encode(puml_text)
-        url = f"https://www.plantuml.com/plantuml/svg/{encoded}"
-        response = requests.get(url, timeout=10)
+        if backend is None:
+            backend = HttpRenderBackend()
+        if cache is not None:
+            cached = cache.get(puml_text, backend.identity)
+            if cached is not None:
+                return cached
 
-        if response.status_code == 200 and '<svg' in response.text:
-            return response.text
+        try:
+            svg = backend.render(puml_text)
+        except RenderError as e:
+            log_warning(f"PlantUML render fallback ({e})")
+            svg = None
 
-        log_warning(
-            f"PlantUML render fallback (status={response.status_code}, content-type={response.headers.get('Content-Type')})"
-        )
+        if svg is not None:
+            if cache is not None:
+                cache.put(puml_text, backend.identity, svg)
+            return svg
 
         # Fallback to text view
         return (
             "<div class='puml-fallback'><h4>PlantUML Diagram (Text View)</h4>"
-            f"<pre>{puml_text}</pre>"
+            f"<pre>{html.escape(puml_text)}</pre>"
             "<p>Unable to render. Copy to <a href='https://www.plantuml.com/plantuml/uml' target='_blank'>PlantUML Online Editor</a> to visualize.</p></div>"
         )
 
@@ -141,196 +292,248 @@ def render_puml_to_svg(puml_text):
         log_warning(f"PlantUML render failed: {e}")
         return (
             "<div class='puml-fallback'><h4>PlantUML Diagram (Text View)</h4>"
-            f"<pre>{puml_text}</pre>"
-            f"<p>Error: {e}</p></div>"
+            f"<pre>{html.escape(puml_text)}</pre>"
+            f"<p>Error: {html.escape(str(e))}</p></div>"
         )
 
 
-def generate_html_head(title):
-    """Generate HTML head section with improved styling."""
-    return f"""<!DOCTYPE html>
+STYLESHEET = """
+* {
+    margin: 0;
+    padding: 0;
+    box-sizing: border-box;
+}
+body {
+    font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
+    line-height: 1.6;
+    color: #000;
+    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+    min-height: 100vh;
+}
+.container {
+    max-width: 1200px;
+    margin: 0 auto;
+    background-color: white;
+    min-height: 100vh;
+    box-shadow: 0 0 20px rgba(0,0,0,0.1);
+}
+header {
+    background: linear-gradient(135deg, #4facfe 0%, #00f2fe 100%);
+    color: white;
+    padding: 2rem 0;
+    text-align: center;
+    box-shadow: 0 2px 10px rgba(0,0,0,0.1);
+}
+header h1 {
+    font-size: 2.5rem;
+    margin-bottom: 0.5rem;
+}
+header p {
+    font-size: 1.2rem;
+    opacity: 0.9;
+}
+nav {
+    background-color: #f8f9fa;
+    padding: 1rem 0;
+    border-bottom: 1px solid #e9ecef;
+}
+nav .nav-container {
+    max-width: 1200px;
+    margin: 0 auto;
+    display: flex;
+    justify-content: center;
+    flex-wrap: wrap;
+}
+nav a {
+    margin: 0 1rem;
+    text-decoration: none;
+    color: #495057;
+    font-weight: 500;
+    padding: 0.5rem 1rem;
+    border-radius: 5px;
+    transition: all 0.3s ease;
+}
+nav a:hover {
+    background-color: #007bff;
+    color: white;
+}
+nav .active {
+    background-color: #007bff;
+    color: white;
+}
+main {
+    padding: 2rem;
+}
+h1, h2, h3 {
+    color: #000;
+    margin-bottom: 1rem;
+}
+h1 {
+    font-size: 2rem;
+    border-bottom: 3px solid #3498db;
+    padding-bottom: 0.5rem;
+}
+h2 {
+    font-size: 1.5rem;
+    margin-top: 2rem;
+}
+.requirement {
+    background-color: #f8f9fa;
+    border: 1px solid #dee2e6;
+    border-left: 5px solid #dee2e6;
+    border-radius: 8px;
+    padding: 1.5rem;
+    margin-bottom: 1.5rem;
+    transition: transform 0.2s ease, box-shadow 0.2s ease;
+}
+.requirement:hover {
+    transform: translateY(-2px);
+    box-shadow: 0 4px 15px rgba(0,0,0,0.1);
+}
+.status-draft { border-left-color: #ffc107; }
+.status-in-progress { border-left-color: #17a2b8; }
+.status-in-review { border-left-color: #6c757d; }
+.status-finished { border-left-color: #28a745; }
+
+.status-badge {
+    padding: 0.2rem 0.6rem;
+    border-radius: 20px;
+    font-size: 0.85rem;
+    font-weight: 600;
+    display: inline-block;
+    margin-left: 0.5rem;
+}
+.badge-draft { background-color: #fff3cd; color: #856404; border: 1px solid #ffeeba; }
+.badge-in-progress { background-color: #d1ecf1; color: #0c5460; border: 1px solid #bee5eb; }
+.badge-in-review { background-color: #e2e3e5; color: #383d41; border: 1px solid #d6d8db; }
+.badge-finished { background-color: #d4edda; color: #155724; border: 1px solid #c3e6cb; }
+.requirement h3 {
+    color: #495057;
+    margin-bottom: 0.5rem;
+}
+.requirement p {
+    margin-bottom: 0.5rem;
+}
+.diagram {
+    background-color: white;
+    border: 1px solid #dee2e6;
+    border-radius: 8px;
+    padding: 1rem;
+    margin-bottom: 2rem;
+    text-align: center;
+}
+.diagram svg, .diagram img {
+    max-width: 100%;
+    height: auto;
+}
+.diagram-thumb {
+    display: block;
+    width: 100%;
+    height: 180px;
+    object-fit: contain;
+    background-color: white;
+    border: 1px solid #dee2e6;
+    border-radius: 5px;
+    margin-bottom: 0.75rem;
+}
+.puml-fallback {
+    background-color: #f8f9fa;
+    border: 1px solid #dee2e6;
+    padding: 1rem;
+    border-radius: 5px;
+}
+pre {
+    background-color: #f8f9fa;
+    border: 1px solid #dee2e6;
+    border-radius: 5px;
+    padding: 1rem;
+    overflow-x: auto;
+    white-space: pre-wrap;
+}
+footer {
+    background-color: #343a40;
+    color: white;
+    text-align: center;
+    padding: 1rem 0;
+    margin-top: 2rem;
+}
+.btn {
+    display: inline-block;
+    background-color: #007bff;
+    color: white;
+    padding: 0.5rem 1rem;
+    text-decoration: none;
+    border-radius: 5px;
+    transition: background-color 0.3s ease;
+}
+.btn:hover {
+    background-color: #0056b3;
+}
+.pager {
+    display: flex;
+    justify-content: space-between;
+    align-items: center;
+    margin: 1rem 0;
+}
+.search-box {
+    width: 100%;
+    padding: 0.75rem 1rem;
+    font-size: 1.1rem;
+    border: 1px solid #ced4da;
+    border-radius: 5px;
+    margin-bottom: 1rem;
+}
+.search-results li {
+    list-style: none;
+    padding: 0.5rem 0;
+    border-bottom: 1px solid #e9ecef;
+}
+.shard-index {
+    width: 100%;
+    border-collapse: collapse;
+    margin-top: 1rem;
+}
+.shard-index th, .shard-index td {
+    text-align: left;
+    padding: 0.5rem;
+    border-bottom: 1px solid #dee2e6;
+}
+@media (max-width: 768px) {
+    header h1 {
+        font-size: 2rem;
+    }
+    nav .nav-container {
+        flex-direction: column;
+    }
+    nav a {
+        margin: 0.25rem 0;
+    }
+    main {
+        padding: 1rem;
+    }
+}
+"""
+
+
+@functools.lru_cache(maxsize=None)
+def stylesheet_asset():
+    """Return (file name, minified CSS) for the shared, content-hashed stylesheet."""
+    css = minify_css(STYLESHEET)
+    return f"styles.{hash_text(css)[:12]}.css", css
+
+
+@functools.lru_cache(maxsize=None)
+def _head_template():
+    """Split the page head around the title once per build; pages only fill in the title."""
+    stylesheet_name, _ = stylesheet_asset()
+    prefix = """<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{title} - Project Documentation</title>
-    <style>
-        * {{
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }}
-        body {{
-            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-            line-height: 1.6;
-            color: #000;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            min-height: 100vh;
-        }}
-        .container {{
-            max-width: 1200px;
-            margin: 0 auto;
-            background-color: white;
-            min-height: 100vh;
-            box-shadow: 0 0 20px rgba(0,0,0,0.1);
-        }}
-        header {{
-            background: linear-gradient(135deg, #4facfe 0%, #00f2fe 100%);
-            color: white;
-            padding: 2rem 0;
-            text-align: center;
-            box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-        }}
-        header h1 {{
-            font-size: 2.5rem;
-            margin-bottom: 0.5rem;
-        }}
-        header p {{
-            font-size: 1.2rem;
-            opacity: 0.9;
-        }}
-        nav {{
-            background-color: #f8f9fa;
-            padding: 1rem 0;
-            border-bottom: 1px solid #e9ecef;
-        }}
-        nav .nav-container {{
-            max-width: 1200px;
-            margin: 0 auto;
-            display: flex;
-            justify-content: center;
-            flex-wrap: wrap;
-        }}
-        nav a {{
-            margin: 0 1rem;
-            text-decoration: none;
-            color: #495057;
-            font-weight: 500;
-            padding: 0.5rem 1rem;
-            border-radius: 5px;
-            transition: all 0.3s ease;
-        }}
-        nav a:hover {{
-            background-color: #007bff;
-            color: white;
-        }}
-        nav .active {{
-            background-color: #007bff;
-            color: white;
-        }}
-        main {{
-            padding: 2rem;
-        }}
-        h1, h2, h3 {{
-            color: #000;
-            margin-bottom: 1rem;
-        }}
-        h1 {{
-            font-size: 2rem;
-            border-bottom: 3px solid #3498db;
-            padding-bottom: 0.5rem;
-        }}
-        h2 {{
-            font-size: 1.5rem;
-            margin-top: 2rem;
-        }}
-        .requirement {{
-            background-color: #f8f9fa;
-            border: 1px solid #dee2e6;
-            border-left: 5px solid #dee2e6;
-            border-radius: 8px;
-            padding: 1.5rem;
-            margin-bottom: 1.5rem;
-            transition: transform 0.2s ease, box-shadow 0.2s ease;
-        }}
-        .requirement:hover {{
-            transform: translateY(-2px);
-            box-shadow: 0 4px 15px rgba(0,0,0,0.1);
-        }}
-        .status-draft {{ border-left-color: #ffc107; }}
-        .status-in-progress {{ border-left-color: #17a2b8; }}
-        .status-in-review {{ border-left-color: #6c757d; }}
-        .status-finished {{ border-left-color: #28a745; }}
-        
-        .status-badge {{
-            padding: 0.2rem 0.6rem;
-            border-radius: 20px;
-            font-size: 0.85rem;
-            font-weight: 600;
-            display: inline-block;
-            margin-left: 0.5rem;
-        }}
-        .badge-draft {{ background-color: #fff3cd; color: #856404; border: 1px solid #ffeeba; }}
-        .badge-in-progress {{ background-color: #d1ecf1; color: #0c5460; border: 1px solid #bee5eb; }}
-        .badge-in-review {{ background-color: #e2e3e5; color: #383d41; border: 1px solid #d6d8db; }}
-        .badge-finished {{ background-color: #d4edda; color: #155724; border: 1px solid #c3e6cb; }}
-        .requirement h3 {{
-            color: #495057;
-            margin-bottom: 0.5rem;
-        }}
-        .requirement p {{
-            margin-bottom: 0.5rem;
-        }}
-        .diagram {{
-            background-color: white;
-            border: 1px solid #dee2e6;
-            border-radius: 8px;
-            padding: 1rem;
-            margin-bottom: 2rem;
-            text-align: center;
-        }}
-        .diagram svg {{
-            max-width: 100%;
-            height: auto;
-        }}
-        .puml-fallback {{
-            background-color: #f8f9fa;
-            border: 1px solid #dee2e6;
-            padding: 1rem;
-            border-radius: 5px;
-        }}
-        pre {{
-            background-color: #f8f9fa;
-            border: 1px solid #dee2e6;
-            border-radius: 5px;
-            padding: 1rem;
-            overflow-x: auto;
-            white-space: pre-wrap;
-        }}
-        footer {{
-            background-color: #343a40;
-            color: white;
-            text-align: center;
-            padding: 1rem 0;
-            margin-top: 2rem;
-        }}
-        .btn {{
-            display: inline-block;
-            background-color: #007bff;
-            color: white;
-            padding: 0.5rem 1rem;
-            text-decoration: none;
-            border-radius: 5px;
-            transition: background-color 0.3s ease;
-        }}
-        .btn:hover {{
-            background-color: #0056b3;
-        }}
-        @media (max-width: 768px) {{
-            header h1 {{
-                font-size: 2rem;
-            }}
-            nav .nav-container {{
-                flex-direction: column;
-            }}
-            nav a {{
-                margin: 0.25rem 0;
-            }}
-            main {{
-                padding: 1rem;
-            }}
-        }}
-    </style>
+    <title>"""
+    suffix = f""" - Project Documentation</title>
+    <link rel="stylesheet" href="{stylesheet_name}">
 </head>
 <body>
     <div class="container">
@@ -339,8 +542,16 @@ def generate_html_head(title):
             <p>Comprehensive project overview and requirements</p>
         </header>
 """
+    return prefix, suffix
 
 
+def generate_html_head(title):
+    """Generate HTML head section linking the shared stylesheet."""
+    prefix, suffix = _head_template()
+    return f"{prefix}{title}{suffix}"
+
+
+@functools.lru_cache(maxsize=None)
 def generate_html_footer():
     """Generate HTML footer section."""
     return """
@@ -353,13 +564,15 @@ def generate_html_footer():
 """
 
 
+@functools.lru_cache(maxsize=None)
 def generate_navigation(current_page):
     """Generate navigation menu."""
     pages = {
         'index': 'Home',
         'architecture': 'Architecture',
         'high_level': 'High-Level Requirements',
-        'software': 'Software Requirements'
+        'software': 'Software Requirements',
+        'search': 'Search',
     }
     nav = '<nav><div class="nav-container">'
     for page, title in pages.items():
@@ -369,6 +582,11 @@ def generate_navigation(current_page):
     return nav
 
 
+def template_hash():
+    """Hash of the shared page shell, so style/nav/footer edits invalidate every page."""
+    return hash_text(generate_html_head("") + generate_navigation("") + generate_html_footer())
+
+
 def generate_index_html():
     """Generate index.html page."""
     content = f"""
@@ -402,8 +620,27 @@ def generate_index_html():
     return content
 
 
-def generate_architecture_html(docs_path):
-    """Generate a hub page for architecture diagrams with links to per-diagram pages."""
+def _escaped_diagrams(diagrams):
+    """Diagram (source, title, slug) tuples with source and title escaped for HTML; slugs are already safe."""
+    return [(html.escape(source), html.escape(title), slug) for source, title, slug in diagrams]
+
+
+def generate_architecture_html(diagrams):
+    """Generate a hub page for architecture diagrams with links to per-diagram pages.
+
+    Thumbnails reference the standalone SVG assets with `loading="lazy"`, so the
+    browser only fetches them as they scroll into view and the hub stays small
+    however many diagrams there are.
+    """
+    cards = "".join(f"""
+        <div class="requirement">
+            <a href="{slug}.html"><img class="diagram-thumb" src="{DIAGRAM_ASSET_DIR}/{slug}.svg" alt="{title}" loading="lazy" decoding="async"></a>
+            <h3>{title}</h3>
+            <p>{DIAGRAM_DESCRIPTIONS.get(slug, f"Rendered from {source}.")}</p>
+            <a class="btn" href="{slug}.html">Open {title.lower()}</a>
+        </div>""" for source, title, slug in _escaped_diagrams(diagrams))
+    if not cards:
+        cards = "<p>No diagrams found in Docs/architecture.</p>"
     content = f"""
 {generate_html_head("Architecture")}
 {generate_navigation('architecture')}
@@ -411,22 +648,7 @@ def generate_architecture_html(docs_path):
     <h1>System Architecture Diagrams</h1>
     <p>Select a diagram to view it on its dedicated page.</p>
 
-    <div style="display: grid; grid-template-columns: repeat(auto-fit, minmax(240px, 1fr)); gap: 1rem; margin-top: 2rem;">
-        <div class="requirement">
-            <h3>Runtime Diagram</h3>
-            <p>Sequence of runtime interactions.</p>
-            <a class="btn" href="runtime.html">Open runtime diagram</a>
-        </div>
-        <div class="requirement">
-            <h3>Class Diagram</h3>
-            <p>Class structure and relationships.</p>
-            <a class="btn" href="class.html">Open class diagram</a>
-        </div>
-        <div class="requirement">
-            <h3>Block Diagram</h3>
-            <p>High-level blocks and data flows.</p>
-            <a class="btn" href="block.html">Open block diagram</a>
-        </div>
+    <div style="display: grid; grid-template-columns: repeat(auto-fit, minmax(240px, 1fr)); gap: 1rem; margin-top: 2rem;">{cards}
     </div>
 </main>
 {generate_html_footer()}
@@ -434,19 +656,191 @@ def generate_architecture_html(docs_path):
     return content
 
 
-def generate_single_diagram_page(docs_path, filename, title, page_slug):
-    """Generate a dedicated page for one PlantUML diagram."""
-    puml_path = docs_path / 'architecture' / filename
-    puml_source = load_puml(puml_path)
+SEARCH_SCRIPT = """
+(function () {
+    var meta = null, terms = {}, docs = {}, loading = {}, pending = null;
+    window.DocsSearch = {
+        add: function (kind, key, data) {
+            if (kind === "meta") { meta = data; } else if (kind === "terms") { terms[key] = data; } else { docs[key] = data; }
+        }
+    };
+    function load(file) {
+        if (!loading[file]) {
+            loading[file] = new Promise(function (resolve, reject) {
+                var script = document.createElement("script");
+                script.src = "search/" + file;
+                script.onload = resolve;
+                script.onerror = function () { delete loading[file]; reject(new Error("Cannot load " + file)); };
+                document.head.appendChild(script);
+            });
+        }
+        return loading[file];
+    }
+    function shardKey(term) {
+        return Array.from(term).map(function (c) {
+            return /^[a-z0-9]$/.test(c) ? c : "_" + ("00000" + c.codePointAt(0).toString(16)).slice(-6);
+        }).join("");
+    }
+    function queryTerms(text) {
+        var result = [];
+        text.toLowerCase().split(/\\s+/).forEach(function (piece) {
+            if (piece.indexOf("-") > 0) { result.push(piece); return; }
+            (piece.match(/[\\p{L}\\p{N}]+/gu) || []).forEach(function (word) {
+                if (word.length > 1) { result.push(word); }
+            });
+        });
+        return result;
+    }
+    function matches(term) {
+        // Shards keyed by a prefix of the term, or by a longer prefix starting with it
+        var key = shardKey(term), keys = meta.shards.filter(function (shard) {
+            return key.lastIndexOf(shard, 0) === 0 || shard.lastIndexOf(key, 0) === 0;
+        });
+        return Promise.all(keys.map(function (shard) { return load("terms-" + shard + ".js"); })).then(function () {
+            var found = new Set();
+            keys.forEach(function (shard) {
+                Object.keys(terms[shard]).forEach(function (candidate) {
+                    if (candidate.lastIndexOf(term, 0) !== 0) { return; }
+                    var number = 0;
+                    terms[shard][candidate].forEach(function (delta) { number += delta; found.add(number); });
+                });
+            });
+            return found;
+        });
+    }
+    function search(text) {
+        var query = queryTerms(text);
+        if (!query.length) { return Promise.resolve(null); }
+        return Promise.all(query.map(matches)).then(function (sets) {
+            sets.sort(function (a, b) { return a.size - b.size; });
+            var hits = Array.from(sets[0]).filter(function (number) {
+                return sets.every(function (set) { return set.has(number); });
+            });
+            return hits.sort(function (a, b) { return a - b; });
+        });
+    }
+    function show(hits, limit) {
+        var status = document.getElementById("search-status"), list = document.getElementById("search-results");
+        list.textContent = "";
+        if (hits === null) { status.textContent = meta.documents + " requirements indexed."; return Promise.resolve(); }
+        var shown = hits.slice(0, limit);
+        var chunks = Array.from(new Set(shown.map(function (n) { return Math.floor(n / meta.docChunk); })));
+        return Promise.all(chunks.map(function (chunk) { return load("docs-" + chunk + ".js"); })).then(function () {
+            status.textContent = hits.length + " match(es)" + (hits.length > limit ? ", showing the first " + limit : "") + ".";
+            shown.forEach(function (number) {
+                var doc = docs[Math.floor(number / meta.docChunk)][number % meta.docChunk];
+                var item = document.createElement("li"), link = document.createElement("a"), badge = document.createElement("span");
+                link.href = doc[3];
+                link.textContent = doc[0];
+                badge.className = "status-badge badge-" + doc[2].toLowerCase().replace(/ /g, "-");
+                badge.textContent = doc[2];
+                item.appendChild(link);
+                item.appendChild(document.createTextNode(": " + doc[1]));
+                item.appendChild(badge);
+                list.appendChild(item);
+            });
+        });
+    }
+    function run() {
+        var text = document.getElementById("search-input").value;
+        var current = pending = search(text).then(function (hits) {
+            if (current === pending) { return show(hits, 100); }
+        });
+        current.catch(function (error) { document.getElementById("search-status").textContent = error.message; });
+    }
+    load("index.js").then(function () {
+        var input = document.getElementById("search-input"), timer = null;
+        input.addEventListener("input", function () { clearTimeout(timer); timer = setTimeout(run, 120); });
+        input.value = new URLSearchParams(location.search).get("q") || "";
+        run();
+    }, function () {
+        document.getElementById("search-status").textContent = "Search index not found; rebuild the docs.";
+    });
+})();
+"""
+
+
+def generate_search_html():
+    """Static search page querying the prebuilt index in build/search (see search_index)."""
+    return f"""
+{generate_html_head("Search")}
+{generate_navigation('search')}
+<main>
+    <h1>Search Requirements</h1>
+    <input id="search-input" class="search-box" type="search" placeholder="Id, name, description or status" autofocus>
+    <p id="search-status">Loading search index...</p>
+    <ul id="search-results" class="search-results"></ul>
+</main>
+<script>{SEARCH_SCRIPT}</script>
+{generate_html_footer()}
+"""
+
+
+def render_diagram_file(puml_path, svg_cache=None, backend=None, profiler=NULL_PROFILER, resolver=None, report=None):
+    """Load one PUML file, expand its local !include directives and render it; returns SVG or a fallback.
+
+    Include errors (missing files, cycles) go to `report(message)`, or are logged as warnings without one.
+    """
+    with profiler.stage("load_puml", page=puml_path.name):
+        puml_source = load_puml(puml_path)
+        include_errors = []
+        if puml_source is not None:
+            puml_source, _, include_errors = (resolver or IncludeResolver()).expand(puml_path, puml_source)
 
     if puml_source is None:
-        svg = f"<div class='puml-fallback'><p>Missing or unreadable file: {puml_path.name}</p></div>"
         log_warning(f"Skipping render for missing/invalid PUML: {puml_path}")
-    else:
-        if "@startuml" not in puml_source or "@enduml" not in puml_source:
-            log_warning(f"PUML file may be invalid (missing @startuml/@enduml): {puml_path}")
-        svg = render_puml_to_svg(puml_source)
+        return f"<div class='puml-fallback'><p>Missing or unreadable file: {html.escape(puml_path.name)}</p></div>"
+
+    if include_errors:
+        for error in include_errors:
+            if report is not None:
+                report(error)
+            else:
+                log_warning(f"{puml_path.name}: {error}")
+        return (
+            "<div class='puml-fallback'><h4>PlantUML Diagram (Text View)</h4>"
+            f"<p>Include error: {html.escape('; '.join(include_errors))}</p>"
+            f"<pre>{html.escape(puml_source)}</pre></div>"
+        )
+
+    if "@startuml" not in puml_source or "@enduml" not in puml_source:
+        log_warning(f"PUML file may be invalid (missing @startuml/@enduml): {puml_path}")
+    with profiler.stage("render", page=puml_path.name):
+        return render_puml_to_svg(puml_source, svg_cache, backend)
+
+
+def render_diagrams(docs_path, diagrams, svg_cache=None, workers=DEFAULT_RENDER_WORKERS, backend=None,
+                    profiler=NULL_PROFILER, resolver=None, add_error=None):
+    """Render all diagrams concurrently through one shared backend; returns {slug: svg}.
+
+    Include errors go to add_error as validation.Diagnostic objects, in diagram order.
+    """
+    if not diagrams:
+        return {}
+
+    puml_paths = [docs_path / 'architecture' / source for source, _, _ in diagrams]
+    workers = max(1, min(workers, len(puml_paths) or 1))
+    include_errors = [[] for _ in puml_paths]
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        svgs = list(pool.map(
+            lambda path, errors: render_diagram_file(
+                path, svg_cache, backend, profiler, resolver, errors.append if add_error is not None else None
+            ),
+            puml_paths, include_errors,
+        ))
+
+    for path, errors in zip(puml_paths, include_errors):
+        for message in errors:
+            add_error(Diagnostic("puml", message, file=path.relative_to(docs_path).as_posix()))
+    return {slug: svg for (_, _, slug), svg in zip(diagrams, svgs)}
 
+
+def generate_single_diagram_page(filename, title, svg, slug):
+    """Generate a dedicated page for one PlantUML diagram, referencing its standalone SVG asset."""
+    filename, title = html.escape(filename), html.escape(title)
+    if not is_fallback_render(svg):
+        svg = f'<img src="{DIAGRAM_ASSET_DIR}/{slug}.svg" alt="{title}" decoding="async">'
     content = f"""
 {generate_html_head(title)}
 {generate_navigation('architecture')}
@@ -463,14 +857,18 @@ def generate_single_diagram_page(docs_path, filename, title, page_slug):
     return content
 
 
-def generate_requirements_html(requirements_data, title, page_name, links=None):
-    """Generate requirements HTML page."""
+def iter_requirements_html(requirements_data, title, page_name, links=None, intro=None, pager=""):
+    """Yield a requirements HTML page fragment by fragment (one card at a time).
+
+    `intro` replaces the default lead paragraph and `pager` (shard navigation
+    markup) is placed above and below the cards.
+    """
     if links is None:
         links = {}
-    
+
     if isinstance(requirements_data, str):
         # Error message
-        content = f"""
+        yield f"""
 {generate_html_head(title)}
 {generate_navigation(page_name)}
 <main>
@@ -479,138 +877,382 @@ def generate_requirements_html(requirements_data, title, page_name, links=None):
 </main>
 {generate_html_footer()}
 """
-        return content
+        return
 
-    content = f"""
+    yield f"""
 {generate_html_head(title)}
 {generate_navigation(page_name)}
 <main>
     <h1>{title}</h1>
-    <p>This section contains all {title.lower()} with their current status and details.</p>
-"""
-
-    for req in requirements_data:
-        status = req.get('status', 'draft')
-        status_slug = status.lower().replace(' ', '-')
-        status_class = f"status-{status_slug}"
-        req_id = req['id']
-        
-        if page_name == 'software':
-            refines = req.get('refines', 'N/A')
-            refines_link = links.get(f"sw_{req_id}", "#")
-            if refines_link != "#":
-                refines = f'<a href="{refines_link}">{refines}</a>'
-        else:
-            refines = req.get('refines', 'N/A')
-        
-        content += f"""
-    <div class="requirement {status_class}" id="{req_id}">
-        <h3>{req_id}: {req['name']}</h3>
+    <p>{intro or f"This section contains all {title.lower()} with their current status and details."}</p>
+{pager}"""
+
+    for req_id, name, status, status_slug, refined, description in iter_rows(requirements_data):
+        # Link every resolved parent; unknown ids stay as plain text
+        refines_links = {link.split('#')[1]: link for link in links.get(f"refines_{req_id}", [])}
+        refines = ', '.join(
+            f'<a href="{refines_links[parent_id]}">{parent_id}</a>' if parent_id in refines_links else parent_id
+            for parent_id in refined
+        ) or 'N/A'
+
+        card = [f"""
+    <div class="requirement status-{status_slug}" id="{req_id}">
+        <h3>{req_id}: {name}</h3>
         <p><strong>Status:</strong> <span class="status-badge badge-{status_slug}">{status}</span></p>
         <p><strong>Refines:</strong> {refines}</p>
         <p><strong>Description:</strong></p>
-        <p>{req.get('description', 'N/A').replace('> ', '').strip()}</p>
+        <p>{description}</p>
+"""]
+
+        # List the requirements that refine this one
+        refining_links = links.get(f"refined_by_{req_id}", [])
+        if refining_links:
+            card.append("<p><strong>Refined by:</strong></p><ul>")
+            for link in refining_links:
+                child_id = link.split('#')[1]
+                card.append(f'<li><a href="{link}">{child_id}</a></li>')
+            card.append("</ul>")
+
+        card.append("</div>")
+        yield "".join(card)
+
+    yield f"""{pager}
+</main>
+"""
+    yield generate_html_footer()
+
+
+def generate_shard_pager(index_page, shards, position):
+    """Previous / index / next links for the shard at `position`."""
+    previous_link = (
+        f'<a class="btn" href="{shards[position - 1].page}">⬅ Previous</a>' if position > 0 else '<span></span>'
+    )
+    next_link = (
+        f'<a class="btn" href="{shards[position + 1].page}">Next ➡</a>' if position + 1 < len(shards) else '<span></span>'
+    )
+    return f"""    <div class="pager">{previous_link}<a href="{index_page}">Page {position + 1} of {len(shards)}</a>{next_link}</div>
 """
-        
-        # For high-level, add list of refining software requirements
-        if page_name == 'high_level':
-            refining_links = links.get(f"hl_{req_id}", [])
-            if refining_links:
-                content += "<p><strong>Refined by:</strong></p><ul>"
-                for link in refining_links:
-                    sw_id = link.split('#')[1]
-                    content += f'<li><a href="{link}">{sw_id}</a></li>'
-                content += "</ul>"
-        
-        content += "</div>"
-
-    content += """
+
+
+def iter_shard_html(store, shard, shards, position, title, page_name, links):
+    """Yield one shard page of a sharded requirements level."""
+    return iter_requirements_html(
+        store.subset(shard.indices),
+        title,
+        page_name,
+        links,
+        intro=f"{shard.label}: {len(shard.indices)} of {len(store)} {title.lower()}.",
+        pager=generate_shard_pager(f"{page_name}.html", shards, position),
+    )
+
+
+def generate_requirements_index_html(store, shards, title, page_name):
+    """Compact index page listing the shards of a sharded requirements level."""
+    rows = "".join(
+        f'<tr><td><a href="{shard.page}">{shard.label}</a></td><td>{len(shard.indices)}</td>'
+        f'<td>{store.ids[shard.indices[0]]} – {store.ids[shard.indices[-1]]}</td></tr>\n'
+        for shard in shards
+    )
+    return f"""
+{generate_html_head(title)}
+{generate_navigation(page_name)}
+<main>
+    <h1>{title}</h1>
+    <p>{len(store)} {title.lower()} split into {len(shards)} pages.</p>
+    <table class="shard-index">
+        <thead><tr><th>Page</th><th>Requirements</th><th>Range</th></tr></thead>
+        <tbody>
+{rows}        </tbody>
+    </table>
 </main>
+{generate_html_footer()}
 """
-    content += generate_html_footer()
-    return content
 
 
-def build_docs(docs_path):
-    """Build HTML documentation from Docs folder."""
+def generate_requirements_html(requirements_data, title, page_name, links=None):
+    """Generate requirements HTML page."""
+    return "".join(iter_requirements_html(requirements_data, title, page_name, links))
+
+
+def _rows_digest(store, indices, links, context=""):
+    digest = hashlib.sha256(context.encode("utf-8"))
+    for index in indices:
+        req_id = store.ids[index]
+        fields = (req_id, store.names[index], store.statuses[index], store.descriptions[index], *store.refines[index])
+        digest.update("\x1f".join(fields).encode("utf-8"))
+        digest.update("\x1e".join(links.get(f"refines_{req_id}", ())).encode("utf-8"))
+        digest.update(b"\x1d")
+        digest.update("\x1e".join(links.get(f"refined_by_{req_id}", ())).encode("utf-8"))
+        digest.update(b"\x1c")
+    return digest.hexdigest()
+
+
+def requirement_page_digests(stores, level_shards, links):
+    """Fingerprint of what each requirement page shows, so an edit only invalidates the pages it changes.
+
+    A high-level edit therefore regenerates its own page plus only those software
+    pages whose refines links to it changed.
+    """
+    digests = {}
+    for level, _ in REQUIREMENT_LEVELS:
+        store, shards = stores[level], level_shards.get(level)
+        if not shards:
+            digests[f'{level}.html'] = _rows_digest(store, range(len(store)), links)
+            continue
+        digests[f'{level}.html'] = hash_text(json.dumps([len(store)] + [
+            [shard.page, shard.label, len(shard.indices), store.ids[shard.indices[0]], store.ids[shard.indices[-1]]]
+            for shard in shards
+        ]))
+        for position, shard in enumerate(shards):
+            neighbours = [shards[i].page for i in (position - 1, position + 1) if 0 <= i < len(shards)]
+            context = "\x1f".join([shard.label, str(position), str(len(shards)), str(len(store)), *neighbours])
+            digests[shard.page] = _rows_digest(store, shard.indices, links, context)
+    return digests
+
+
+def link_requirements(stores, shard_mode, page_size):
+    """Build the trace graph, shard layout and link map; returns (graph, level_shards, links, link diagnostics, digests).
+
+    Link diagnostics come from validation.check_links, the same rules as --check-only.
+    """
+    graph = TraceGraph.build([(level, stores[level]) for level, _ in REQUIREMENT_LEVELS])
+    level_shards = {}
+    for level, store in stores.items():
+        shards = plan_shards(level, store, shard_mode, page_size, graph)
+        if shards:
+            level_shards[level] = shards
+            graph.assign_pages(page_map(shards, store))
+    links = graph.page_links()
+    link_diagnostics = check_links([
+        store_result(level, label, relative, stores[level]) for level, label, relative, _ in REQUIREMENT_FILES
+    ])
+    return graph, level_shards, links, link_diagnostics, requirement_page_digests(stores, level_shards, links)
+
+
+def collect_page_inputs(docs_path, backend, requirement_digests, diagrams, resolver, optimize=False):
+    """Map each output page to the inputs it is built from (see build_manifest)."""
+    common_inputs = {"builder": BUILDER_VERSION, "template": template_hash()}
+    if optimize:
+        # Minified pages are different bytes; toggling --optimize regenerates them
+        common_inputs["optimize"] = POSTPROCESS_VERSION
+    page_inputs = {
+        'index.html': common_inputs,
+        'architecture.html': {**common_inputs, "diagrams": hash_text(json.dumps(diagrams))},
+        'search.html': common_inputs,
+    }
+    for source, _, slug in diagrams:
+        diagram_inputs = {
+            **common_inputs,
+            # The diagram and everything it !includes, so a shared include edit re-renders its dependents
+            "puml": resolver.closure_digest(docs_path / 'architecture' / source),
+            "renderer": backend.identity,
+        }
+        page_inputs[f'{slug}.html'] = diagram_inputs
+        page_inputs[f'{DIAGRAM_ASSET_DIR}/{slug}.svg'] = diagram_inputs
+    for page, digest in requirement_digests.items():
+        page_inputs[page] = {**common_inputs, "content": digest}
+    return page_inputs
+
+
+def build_docs(docs_path, svg_cache=None, render_workers=DEFAULT_RENDER_WORKERS, backend=None, full=False,
+               profiler=NULL_PROFILER, ingest=None, shard_mode="none", page_size=DEFAULT_PAGE_SIZE, session=None,
+               optimize=False, trace_db=None):
+    """Build HTML documentation from Docs folder, regenerating only pages whose inputs changed.
+
+    With a `shard_mode` other than "none", each requirements level is split into
+    pages of at most `page_size` requirements (see page_shards) behind an index page.
+    A BuildSession keeps parsed requirements and the link graph in memory for
+    repeated builds (watch mode). `optimize` minifies the output and writes
+    precompressed siblings (see postprocess). `trace_db` is the path of the
+    SQLite traceability export, relative to the build folder (see trace_db).
+    Returns a summary dict: pages, regenerated, written and the list of errors.
+    """
     build_path = docs_path / 'build'
     build_path.mkdir(exist_ok=True)
 
+    owns_backend = backend is None
+    if owns_backend:
+        backend = HttpRenderBackend(pool_size=render_workers)
+    backend.profiler = profiler
+
+    # Messages for the console and the summary; the Diagnostics themselves go to the trace database
     errors = []
+    diagnostics = []
 
-    def add_error(msg):
-        errors.append(msg)
-        log_error(msg)
+    def add_error(diagnostic):
+        diagnostics.append(diagnostic)
+        errors.append(diagnostic.message)
+        log_error(diagnostic.message)
 
     # Load requirements
-    hl_req_path = docs_path / 'requirements/high_level_requirements.yaml'
-    sw_req_path = docs_path / 'requirements/software_requirements.yaml'
-
-    hl_req_data = load_yaml(hl_req_path)
-    sw_req_data = load_yaml(sw_req_path)
-
-    # Validate YAML load results
-    if hl_req_data is None:
-        add_error(f"Could not load {hl_req_path}")
-    if sw_req_data is None:
-        add_error(f"Could not load {sw_req_path}")
-
-    # Validate requirement schema
-    hl_req_data = validate_requirement_list(
-        hl_req_data, "High-level", ["id", "name", "status", "description"], add_error
-    )
-    sw_req_data = validate_requirement_list(
-        sw_req_data, "Software", ["id", "name", "status", "refines", "description"], add_error
-    )
+    stores = {
+        level: load_requirements_cached(session, docs_path / relative, label, required_keys, add_error, ingest,
+                                        profiler, relative)
+        for level, label, relative, required_keys in REQUIREMENT_FILES
+    }
+    hl_req_data, sw_req_data = stores['high_level'], stores['software']
 
-    # Build links and detect dangling software requirements
-    links = {}
-    dangling_sw = []
-
-    if isinstance(hl_req_data, list) and isinstance(sw_req_data, list):
-        # Map high-level IDs
-        hl_ids = {req['id']: req for req in hl_req_data}
-        # For each software req, add link to high-level
-        for sw_req in sw_req_data:
-            refines = sw_req.get('refines')
-            if refines and refines in hl_ids:
-                links[f"sw_{sw_req['id']}"] = f"high_level.html#{refines}"
-            else:
-                dangling_sw.append(sw_req.get('id', '<unknown>'))
-
-        # For each high-level, find software that refines it
-        for hl_req in hl_req_data:
-            hl_id = hl_req['id']
-            refining_sw = [sw['id'] for sw in sw_req_data if sw.get('refines') == hl_id]
-            if refining_sw:
-                links[f"hl_{hl_id}"] = [f"software.html#{sw_id}" for sw_id in refining_sw]
+    # Build links and check them like --check-only does (reused while neither file changed)
+    linked = session.linked if session is not None else None
+    if linked is not None and linked[0] is hl_req_data and linked[1] is sw_req_data \
+            and linked[2:4] == (shard_mode, page_size):
+        graph, level_shards, links, link_diagnostics, requirement_digests = linked[4]
     else:
-        if not isinstance(hl_req_data, list):
-            add_error("High-level requirements YAML must be a list of entries.")
-        if not isinstance(sw_req_data, list):
-            add_error("Software requirements YAML must be a list of entries.")
+        with profiler.stage("link_graph"):
+            linked_result = link_requirements(stores, shard_mode, page_size)
+        graph, level_shards, links, link_diagnostics, requirement_digests = linked_result
+        if session is not None:
+            session.linked = (hl_req_data, sw_req_data, shard_mode, page_size, linked_result)
+
+    # Work out which pages are stale
+    with profiler.stage("manifest"):
+        manifest = BuildManifest(build_path)
+        diagrams = discover_diagrams(docs_path)
+        resolver = session.includes if session is not None else IncludeResolver()
+        page_inputs = collect_page_inputs(docs_path, backend, requirement_digests, diagrams, resolver, optimize)
+        stale = [page for page, inputs in page_inputs.items() if full or not manifest.is_current(page, inputs)]
+    profiler.count("pages_regenerated", len(stale))
+    profiler.count("pages_skipped", len(page_inputs) - len(stale))
 
     # Generate pages
-    index_html = generate_index_html()
-    architecture_html = generate_architecture_html(docs_path)
-    runtime_html = generate_single_diagram_page(docs_path, 'runtime_diagram.puml', 'Runtime Diagram', 'runtime')
-    class_html = generate_single_diagram_page(docs_path, 'class_diagram.puml', 'Class Diagram', 'class')
-    block_html = generate_single_diagram_page(docs_path, 'block_diagram.puml', 'Block Diagram', 'block')
-
-    high_level_html = generate_requirements_html(hl_req_data, "High-Level Requirements", 'high_level', links)
-    software_html = generate_requirements_html(sw_req_data, "Software Requirements", 'software', links)
-
-    # Write files
-    (build_path / 'index.html').write_text(index_html, encoding='utf-8')
-    (build_path / 'architecture.html').write_text(architecture_html, encoding='utf-8')
-    (build_path / 'runtime.html').write_text(runtime_html, encoding='utf-8')
-    (build_path / 'class.html').write_text(class_html, encoding='utf-8')
-    (build_path / 'block.html').write_text(block_html, encoding='utf-8')
-    (build_path / 'high_level.html').write_text(high_level_html, encoding='utf-8')
-    (build_path / 'software.html').write_text(software_html, encoding='utf-8')
-
-    if dangling_sw:
-        add_error(f"Dangling software requirements (no matching high-level refines): {', '.join(dangling_sw)}")
+    generators = {
+        'index.html': generate_index_html,
+        'architecture.html': lambda: generate_architecture_html(diagrams),
+        'search.html': generate_search_html,
+    }
+    for level, title in REQUIREMENT_LEVELS:
+        store, shards = stores[level], level_shards.get(level)
+        if not shards:
+            generators[f'{level}.html'] = (
+                lambda store=store, title=title, level=level: iter_requirements_html(store, title, level, links)
+            )
+            continue
+        generators[f'{level}.html'] = (
+            lambda store=store, shards=shards, title=title, level=level:
+            generate_requirements_index_html(store, shards, title, level)
+        )
+        for position, shard in enumerate(shards):
+            generators[shard.page] = (
+                lambda store=store, shard=shard, shards=shards, position=position, title=title, level=level:
+                iter_shard_html(store, shard, shards, position, title, level, links)
+            )
+    # Each diagram produces its page and its standalone SVG asset
+    diagram_pages = {}
+    for _, _, slug in diagrams:
+        diagram_pages[f'{slug}.html'] = diagram_pages[f'{DIAGRAM_ASSET_DIR}/{slug}.svg'] = slug
+    stale_slugs = {diagram_pages[page] for page in stale if page in diagram_pages}
+    stale_diagrams = [diagram for diagram in diagrams if diagram[2] in stale_slugs]
+    cache_hits, cache_misses = (svg_cache.hits, svg_cache.misses) if svg_cache is not None else (0, 0)
+    with profiler.stage("render_diagrams"):
+        diagram_svgs = render_diagrams(
+            docs_path, stale_diagrams, svg_cache, render_workers, backend, profiler, resolver, add_error
+        )
+    if svg_cache is not None:
+        profiler.count("svg_cache_hit", svg_cache.hits - cache_hits)
+        profiler.count("svg_cache_miss", svg_cache.misses - cache_misses)
+    for source, title, slug in stale_diagrams:
+        svg = diagram_svgs[slug]
+        generators[f'{slug}.html'] = (
+            lambda source=source, title=title, svg=svg, slug=slug: generate_single_diagram_page(source, title, svg, slug)
+        )
+        generators[f'{DIAGRAM_ASSET_DIR}/{slug}.svg'] = (
+            lambda title=title, svg=svg: fallback_svg(title) if is_fallback_render(svg) else svg
+        )
+    if stale_diagrams:
+        (build_path / DIAGRAM_ASSET_DIR).mkdir(exist_ok=True)
+
+    # Shared stylesheet; old hashed copies are removed so the build folder does not accumulate them
+    with profiler.stage("write_page", page="stylesheet"):
+        stylesheet_name, stylesheet_css = stylesheet_asset()
+        write_if_changed(build_path / stylesheet_name, stylesheet_css)
+        for old_stylesheet in build_path.glob('styles.*.css'):
+            if old_stylesheet.name != stylesheet_name:
+                old_stylesheet.unlink()
+
+    # Write files; requirement pages are streamed so memory stays bounded by one card
+    written = 0
+    for page in stale:
+        with profiler.stage("write_page", page=page):
+            fragments = generators[page]()
+            if isinstance(fragments, str):
+                fragments = [fragments]
+            if stream_if_changed(build_path / page, fragments):
+                written += 1
+        if profiler.enabled:
+            profiler.add_bytes("write_page", (build_path / page).stat().st_size)
+        slug = diagram_pages.get(page)
+        if slug is not None and is_fallback_render(diagram_svgs[slug]):
+            # Retry failed renders on the next build instead of pinning the fallback
+            manifest.forget(page)
+        else:
+            manifest.record(page, page_inputs[page])
+
+    # Search index over all requirements; it changes exactly when the requirement pages do
+    search_inputs = {"builder": BUILDER_VERSION, "content": hash_text(json.dumps(requirement_digests, sort_keys=True))}
+    if full or not manifest.is_current(SEARCH_META, search_inputs):
+        with profiler.stage("search_index"):
+            search_stats = write_search_index(
+                build_path, [(level, stores[level]) for level, _ in REQUIREMENT_LEVELS], graph.anchor,
+                session.search_terms if session is not None else None,
+                session.search_index if session is not None else None,
+            )
+        profiler.add_bytes("search_index", search_stats["bytes"])
+        profiler.count("search_terms", search_stats["terms"])
+        manifest.record(SEARCH_META, search_inputs)
+
+    for diagnostic in link_diagnostics:
+        add_error(diagnostic)
+
+    # Traceability database with this build's requirements, edges and errors
+    keep = {**page_inputs, SEARCH_META: search_inputs}
+    if trace_db is not None:
+        trace_db_path = build_path / trace_db
+        trace_inputs = {
+            "format": TRACE_DB_FORMAT,
+            "content": search_inputs["content"],
+            "errors": hash_text(json.dumps([diagnostic.to_dict() for diagnostic in diagnostics])),
+        }
+        trace_name = os.path.relpath(trace_db_path, build_path)
+        # Only a database inside the build folder is tracked (and pruned) by the manifest
+        managed = not trace_name.startswith('..')
+        if full or not managed or not manifest.is_current(trace_name, trace_inputs):
+            with profiler.stage("trace_db"):
+                trace_counts = export_trace_db(
+                    trace_db_path, [(level, stores[level]) for level, _ in REQUIREMENT_LEVELS], graph, diagnostics
+                )
+            profiler.count("trace_db_rows", trace_counts["requirements"] + trace_counts["refines"])
+            if managed:
+                manifest.record(trace_name, trace_inputs)
+        if managed:
+            keep[trace_name] = trace_inputs
+
+    # Drop pages this build no longer produces, e.g. shards after a layout change
+    removed = manifest.prune(keep)
+
+    # Minify and precompress before saving the manifest, so page mtimes stay older than it
+    optimized = None
+    if optimize:
+        with profiler.stage("postprocess"):
+            optimized = postprocess_build(build_path)
+        profiler.count("files_postprocessed", len(optimized))
+    else:
+        clear_postprocess(build_path)
+    manifest.save()
+
+    if owns_backend:
+        backend.close()
+    profiler.count("files_written", written)
+    print(f"Regenerated {len(stale)} of {len(page_inputs)} page(s), {written} file(s) changed on disk.")
+    if removed:
+        print(f"Removed {len(removed)} page(s) no longer generated.")
+    if optimized is not None:
+        print(format_report(optimized, groups=(SEARCH_DIR,)))
+
+    # Eviction scans the whole cache; once per session is enough
+    if svg_cache is not None and (session is None or session.builds == 0):
+        svg_cache.evict()
+    if session is not None:
+        session.builds += 1
 
     if errors:
         print("\nBuild completed with issues:")
@@ -619,9 +1261,135 @@ def build_docs(docs_path):
     else:
         print(f"Documentation built successfully in {build_path}")
     print(f"Open {build_path / 'index.html'} in your browser to view the documentation.")
+    return {"pages": len(page_inputs), "regenerated": len(stale), "written": written, "errors": errors}
+
+
+def add_build_arguments(parser):
+    """Options shared by the single-tree builder and batch_build.py."""
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Build without the on-disk caches (rendered SVGs and parsed YAML).")
+    parser.add_argument("--purge-cache", action="store_true", help="Delete all cached SVGs and parsed YAML before building.")
+    parser.add_argument("--stream-yaml", action="store_true",
+                        help="Parse and validate requirement files in batches of items instead of whole documents.")
+    parser.add_argument("--render-workers", type=int, default=DEFAULT_RENDER_WORKERS,
+                        help=f"Number of diagrams rendered concurrently (default: {DEFAULT_RENDER_WORKERS}).")
+    parser.add_argument("--renderer", choices=BACKENDS, default=os.environ.get("DOCS_RENDERER", "server"),
+                        help="Diagram renderer: PlantUML server or local PlantUML processes "
+                             "(default: $DOCS_RENDERER or 'server').")
+    parser.add_argument("--plantuml-cmd", default=os.environ.get("PLANTUML_CMD", PLANTUML_COMMAND),
+                        help="Command starting local PlantUML for --renderer local, e.g. "
+                             "'java -jar plantuml.jar' (default: $PLANTUML_CMD or 'plantuml').")
+    parser.add_argument("--plantuml-server", default=PLANTUML_SERVER,
+                        help="PlantUML server base URL, e.g. a local server or plantuml_stub_server.py.")
+    parser.add_argument("--render-retries", type=int, default=2,
+                        help="Retries per diagram for transient PlantUML server errors (default: 2).")
+    parser.add_argument("--shard", choices=SHARD_MODES, default="none",
+                        help="Split requirement pages by page size, status or parent high-level requirement, "
+                             "behind a compact index page (default: none).")
+    parser.add_argument("--page-size", type=int, default=DEFAULT_PAGE_SIZE,
+                        help=f"Maximum requirements per shard page (default: {DEFAULT_PAGE_SIZE}).")
+    parser.add_argument("--full", action="store_true",
+                        help="Regenerate every page even if the build manifest says it is up to date.")
+    parser.add_argument("--trace-db", nargs="?", const=TRACE_DB_NAME, default=None, metavar="PATH",
+                        help="Export requirements, refines edges and errors to SQLite for trace_db.py queries "
+                             f"(default path: Docs/build/{TRACE_DB_NAME}).")
+    parser.add_argument("--optimize", action="store_true",
+                        help="Minify HTML/SVG/CSS and write .gz (and .br with the brotli package) siblings "
+                             "for static hosting.")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="docs_builder.py",
+                                     description="Generate HTML documentation from the Docs folder.")
+    parser.add_argument("command", nargs="?", choices=("build", "serve"), default="build",
+                        help="'serve' builds, then serves Docs/build with live reload while watching the sources.")
+    add_build_arguments(parser)
+    parser.add_argument("--profile", action="store_true",
+                        help="Print per-stage timings, byte counts and cache counters after the build.")
+    parser.add_argument("--trace-file", type=Path, default=None,
+                        help="Also write a Chrome trace_event JSON timeline to this path (implies --profile).")
+    parser.add_argument("--check-only", action="store_true",
+                        help="Only validate requirements and diagrams (no HTML); print JSON diagnostics and "
+                             "exit with status 1 if there are errors.")
+    parser.add_argument("--watch", action="store_true",
+                        help="Keep running and rebuild the affected pages whenever a requirement or diagram changes.")
+    parser.add_argument("--watch-interval", type=float, default=DEFAULT_WATCH_INTERVAL,
+                        help=f"Seconds between source polls in --watch mode (default: {DEFAULT_WATCH_INTERVAL}).")
+    parser.add_argument("--host", default="127.0.0.1", help="Address the serve command listens on (default: 127.0.0.1).")
+    parser.add_argument("--port", type=int, default=8000, help="Port of the serve command (default: 8000).")
+    return parser.parse_args(argv)
+
+
+def open_caches(args, docs_path):
+    """(svg_cache or None, YamlIngest) for the parsed options; --purge-cache empties both caches first."""
+    # Cache lives next to Docs/build so it survives rebuilds but not a fresh clone
+    svg_cache = SvgCache(docs_path / '.cache' / 'svg')
+    yaml_cache = YamlCache(docs_path / '.cache' / 'yaml')
+    if args.purge_cache:
+        # On stderr, so --check-only still prints nothing but its JSON report on stdout
+        removed = svg_cache.purge()
+        print(f"Purged {removed} cached SVG(s) from {svg_cache.cache_dir}", file=sys.stderr)
+        removed = yaml_cache.purge()
+        print(f"Purged {removed} parsed YAML file(s) from {yaml_cache.cache_dir}", file=sys.stderr)
+    ingest = YamlIngest(None if args.no_cache else yaml_cache, streaming=args.stream_yaml)
+    return (None if args.no_cache else svg_cache), ingest
+
+
+def backend_from_args(args):
+    return create_backend(
+        args.renderer,
+        server=args.plantuml_server,
+        command=args.plantuml_cmd,
+        pool_size=args.render_workers,
+        retries=args.render_retries,
+    )
+
 
+def profiler_from_args(args):
+    return BuildProfiler() if args.profile or args.trace_file else NULL_PROFILER
+
+
+def report_profile(profiler, args):
+    if profiler.enabled:
+        print("\nBuild profile:")
+        print(profiler.summary_table())
+        if args.trace_file:
+            profiler.write_chrome_trace(args.trace_file)
+            print(f"Chrome trace written to {args.trace_file}")
+
+
+def check_from_args(args, docs_path, ingest, session=None) -> int:
+    """Run the validation engine for --check-only; prints the JSON report and returns the exit status."""
+    if session is not None:
+        report = validate_docs(docs_path, ingest, resolver=session.includes, cache=session.checks)
+    else:
+        report = validate_docs(docs_path, ingest)
+    print(report_json(report))
+    return 0 if report["ok"] else 1
+
+
+def build_from_args(args, docs_path, svg_cache, ingest, backend, profiler, session=None, full=None):
+    """One build_docs() run configured by the parsed command-line options; returns its result."""
+    with profiler.stage("build_docs"):
+        return build_docs(
+            docs_path,
+            svg_cache,
+            render_workers=args.render_workers,
+            backend=backend,
+            full=args.full if full is None else full,
+            profiler=profiler,
+            ingest=ingest,
+            shard_mode=args.shard,
+            page_size=args.page_size,
+            session=session,
+            optimize=args.optimize,
+            trace_db=args.trace_db,
+        )
+
+
+def main(argv=None):
+    args = parse_args(argv)
 
-def main():
     # Script is run from Automation folder
     automation_path = Path.cwd()
     project_root = automation_path.parent
@@ -631,7 +1399,40 @@ def main():
         print("Docs folder not found. Please run this script from the Automation folder within the project.")
         return
 
-    build_docs(docs_path)
+    svg_cache, ingest = open_caches(args, docs_path)
+    if args.check_only:
+        sys.exit(check_from_args(args, docs_path, ingest))
+    backend = backend_from_args(args)
+    profiler = profiler_from_args(args)
+    # In watch mode parsed requirements and the link graph stay in memory between builds
+    watching = args.watch or args.command == "serve"
+    session = BuildSession() if watching else None
+    server = None
+
+    def run_build(full):
+        result = build_from_args(args, docs_path, svg_cache, ingest, backend, profiler, session, full)
+        if server is not None:
+            server.refresh()
+        return result
+
+    try:
+        result = run_build(args.full)
+        if args.command == "serve":
+            from docs_server import DocsServer
+            server = DocsServer(docs_path / 'build', args.host, args.port)
+            server.start()
+            print(f"\nServing {docs_path / 'build'} at {server.url} (live reload on rebuild)")
+        if watching:
+            watch_docs(docs_path, lambda changed: run_build(False), args.watch_interval)
+    finally:
+        if server is not None:
+            server.stop()
+        backend.close()
+
+    report_profile(profiler, args)
+    # Same exit status as --check-only for the problems both report
+    if not watching and result["errors"]:
+        sys.exit(1)
 
 
 if __name__ == "__main__":
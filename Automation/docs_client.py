@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+Docs Build Client
+
+Drop-in replacement for `docs_builder.py` that hands the build to a running
+build daemon (`docs_daemon.py start`) and prints its output. Only the
+standard library is imported up front, so a warm build costs little more
+than the daemon's own work. When no daemon is listening (or for `serve` and
+`--watch`, which keep running), the build runs in-process exactly as
+`docs_builder.py` would; so do builds with options the daemon refuses
+(`--plantuml-cmd`, output paths outside the project).
+"""
+
+import sys
+from pathlib import Path
+
+from docs_daemon import LONG_RUNNING, default_socket_path, send_request
+
+
+def main():
+    argv = sys.argv[1:]
+    # Script is run from Automation folder
+    docs_path = Path.cwd().parent / 'Docs'
+    if docs_path.exists() and not any(arg in LONG_RUNNING for arg in argv):
+        reply = send_request(default_socket_path(docs_path), {"command": "build", "argv": argv})
+        if reply is not None and not reply.get("refused"):
+            sys.stdout.write(reply["output"])
+            sys.stderr.write(reply.get("errors", ""))
+            sys.exit(reply["status"])
+
+    from docs_env import ensure_docs_venv
+    ensure_docs_venv(Path(__file__).parent / 'docs_venv', __file__)
+    import docs_builder
+    docs_builder.main(argv)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+Build Daemon
+
+Keeps a docs builder resident for one Docs tree, so repeated builds (editor
+save hooks, pre-commit, local CI steps) skip interpreter startup, the
+`docs_venv` setup and re-parsing unchanged requirement files:
+
+    python3 docs_daemon.py start &        # from the Automation folder
+    python3 docs_client.py --shard parent # same options as docs_builder.py
+    python3 docs_daemon.py status
+    python3 docs_daemon.py stop
+
+Between builds the daemon holds a BuildSession (parsed requirement stores and
+their validation errors, the link graph and page digests, memoized search
+terms and PUML include files), the renderer backend with its open
+connections or PlantUML processes, and the SVG cache's in-memory index.
+Unchanged pages are skipped through the build manifest as usual.
+
+Requests are JSON lines over a Unix domain socket
+(`Docs/.cache/builder.sock`); builds run one at a time and the client gets
+the build's console output back. The daemon exits when its own modules are
+edited, so a client never talks to stale code (`docs_client.py` then builds
+in-process).
+
+The socket is only accessible to the daemon's owner (mode 0600). Even so,
+the daemon does not run requests that choose an executable (`--plantuml-cmd`)
+or write outside the project (`--trace-db`, `--trace-file`); it refuses them
+and `docs_client.py` runs those builds in-process.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import socket
+import socketserver
+import sys
+import threading
+import time
+import traceback
+from pathlib import Path
+
+SOCKET_NAME = "builder.sock"
+PROTOCOL_VERSION = 1
+# Commands that keep running; the client never sends them to the daemon
+LONG_RUNNING = ("serve", "--watch")
+
+
+def default_socket_path(docs_path) -> Path:
+    return Path(os.environ.get("DOCS_DAEMON_SOCKET") or Path(docs_path) / ".cache" / SOCKET_NAME)
+
+
+def send_request(socket_path, payload, timeout=None):
+    """Send one request and return the daemon's reply, or None when no daemon is listening."""
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        client.settimeout(1.0)
+        try:
+            client.connect(str(socket_path))
+        except (FileNotFoundError, ConnectionRefusedError, socket.timeout, OSError):
+            return None
+        # Builds can take long; only connecting is bounded by default
+        client.settimeout(timeout)
+        client.sendall(json.dumps({"protocol": PROTOCOL_VERSION, **payload}).encode("utf-8") + b"\n")
+        reply = client.makefile("rb").readline()
+    finally:
+        client.close()
+    if not reply:
+        return None
+    return json.loads(reply)
+
+
+def _inside(path, root) -> bool:
+    path, root = Path(path).resolve(), Path(root).resolve()
+    return path == root or root in path.parents
+
+
+def _module_stamp(automation_path):
+    """(module file, mtime_ns) of every loaded Automation module."""
+    stamp = []
+    for module in list(sys.modules.values()):
+        path = getattr(module, "__file__", None)
+        if path and Path(path).parent == automation_path:
+            with contextlib.suppress(OSError):
+                stamp.append((path, os.stat(path).st_mtime_ns))
+    return sorted(stamp)
+
+
+class BuildDaemon(socketserver.UnixStreamServer):
+    """Unix socket server running builds of one Docs tree against warm in-memory state."""
+
+    def __init__(self, socket_path, docs_path):
+        import docs_builder
+        self.builder = docs_builder
+        self.docs_path = Path(docs_path)
+        self.session = docs_builder.BuildSession()
+        self.started = time.time()
+        # renderer options -> backend, recreated when a request asks for different ones
+        self.backend_key = None
+        self.backend = None
+        # (no_cache, stream_yaml) -> (svg cache, YAML ingest)
+        self.caches = {}
+        self.automation_path = Path(docs_builder.__file__).resolve().parent
+        self.stamp = _module_stamp(self.automation_path)
+        self.stale = False
+        # Option values of a request without options; --plantuml-cmd must keep the daemon's own
+        self.defaults = docs_builder.parse_args([])
+        super().__init__(str(socket_path), DaemonRequestHandler)
+
+    def server_bind(self):
+        # Only the owner may connect: a client can make the daemon run builds as the owner
+        umask = os.umask(0o177)
+        try:
+            super().server_bind()
+        finally:
+            os.umask(umask)
+        os.chmod(self.server_address, 0o600)
+
+    def refused(self, args):
+        """Why the daemon will not run these options (they pick an executable or an output path), or None."""
+        project_path = self.docs_path.parent
+        if args.plantuml_cmd != self.defaults.plantuml_cmd:
+            return "--plantuml-cmd"
+        if args.trace_db is not None and not _inside(self.docs_path / "build" / args.trace_db, project_path):
+            return "--trace-db outside the project"
+        if args.trace_file is not None and not _inside(args.trace_file, project_path):
+            return "--trace-file outside the project"
+        return None
+
+    def _backend(self, args):
+        key = (args.renderer, args.plantuml_server, args.plantuml_cmd, args.render_workers, args.render_retries)
+        if key != self.backend_key:
+            if self.backend is not None:
+                self.backend.close()
+            self.backend = self.builder.backend_from_args(args)
+            self.backend_key = key
+        return self.backend
+
+    def _caches(self, args):
+        # Kept across requests so parsed YAML stays in the cache's memory layer
+        key = (args.no_cache, args.stream_yaml)
+        if args.purge_cache or key not in self.caches:
+            self.caches[key] = self.builder.open_caches(args, self.docs_path)
+        return self.caches[key]
+
+    def build(self, argv) -> dict:
+        """Run one build; returns {"status", "output", "errors", "seconds"}, plus "refused" for options it does not run.
+
+        "output" and "errors" are the build's stdout and stderr.
+        """
+        start = time.perf_counter()
+        output = io.StringIO()
+        errors = io.StringIO()
+        status = 0
+        with contextlib.redirect_stdout(output), contextlib.redirect_stderr(errors):
+            try:
+                args = self.builder.parse_args(argv)
+                refused = self.refused(args)
+                if refused is not None:
+                    return {"status": 2, "output": "", "errors": f"The build daemon does not run {refused}.\n",
+                            "seconds": time.perf_counter() - start, "refused": refused}
+                svg_cache, ingest = self._caches(args)
+                if args.check_only:
+                    status = self.builder.check_from_args(args, self.docs_path, ingest, self.session)
+                else:
+                    profiler = self.builder.profiler_from_args(args)
+                    result = self.builder.build_from_args(args, self.docs_path, svg_cache, ingest,
+                                                          self._backend(args), profiler, self.session)
+                    status = 1 if result["errors"] else 0
+                    self.builder.report_profile(profiler, args)
+            except SystemExit as e:
+                # argparse errors and --help
+                status = e.code if isinstance(e.code, int) else 1
+            except Exception:
+                traceback.print_exc()
+                status = 1
+        return {"status": status, "output": output.getvalue(), "errors": errors.getvalue(),
+                "seconds": time.perf_counter() - start}
+
+    def status(self) -> dict:
+        return {
+            "status": 0,
+            "output": f"Build daemon for {self.docs_path} (pid {os.getpid()}): "
+                      f"{self.session.builds} build(s), up {time.time() - self.started:.0f} s\n",
+        }
+
+    def close(self):
+        self.server_close()
+        if self.backend is not None:
+            self.backend.close()
+        with contextlib.suppress(OSError):
+            os.unlink(self.server_address)
+
+
+class DaemonRequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        daemon = self.server
+        try:
+            request = json.loads(self.rfile.readline())
+        except ValueError:
+            return
+        command = request.get("command")
+        if request.get("protocol") != PROTOCOL_VERSION or daemon.stale:
+            reply = None
+        elif _module_stamp(daemon.automation_path) != daemon.stamp:
+            # Builder code changed since the daemon started; let the client build with the new code
+            print("Builder modules changed on disk; exiting.", flush=True)
+            daemon.stale = True
+            reply = None
+        elif command == "build":
+            reply = daemon.build(request.get("argv", []))
+            print(f"build {' '.join(request.get('argv', [])) or '(defaults)'}: "
+                  f"status {reply['status']} in {reply['seconds'] * 1e3:.0f} ms", flush=True)
+        elif command == "status":
+            reply = daemon.status()
+        elif command == "stop":
+            reply = {"status": 0, "output": "Build daemon stopped.\n"}
+            daemon.stale = True
+        else:
+            reply = {"status": 2, "output": f"Unknown daemon command: {command}\n"}
+        if reply is not None:
+            self.wfile.write(json.dumps(reply).encode("utf-8") + b"\n")
+        if daemon.stale:
+            # shutdown() blocks until serve_forever returns, which cannot happen while this handler runs
+            threading.Thread(target=daemon.shutdown, daemon=True).start()
+
+
+def serve(docs_path, socket_path):
+    socket_path = Path(socket_path)
+    if send_request(socket_path, {"command": "status"}) is not None:
+        print(f"A build daemon is already listening on {socket_path}")
+        return 1
+    # Left behind by a daemon that did not shut down cleanly
+    with contextlib.suppress(FileNotFoundError):
+        socket_path.unlink()
+    socket_path.parent.mkdir(parents=True, exist_ok=True)
+    daemon = BuildDaemon(socket_path, docs_path)
+    print(f"Build daemon for {docs_path} listening on {socket_path} (Ctrl+C to stop)", flush=True)
+    try:
+        daemon.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        daemon.close()
+    print("Build daemon stopped.")
+    return 0
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Resident docs builder for the Docs folder next to Automation.")
+    parser.add_argument("command", choices=("start", "stop", "status"),
+                        help="'start' runs the daemon in the foreground; 'stop' and 'status' talk to a running one.")
+    parser.add_argument("--socket", type=Path, default=None,
+                        help=f"Unix socket path (default: $DOCS_DAEMON_SOCKET or Docs/.cache/{SOCKET_NAME}).")
+    return parser.parse_args(argv)
+
+
+def main():
+    args = parse_args()
+    # Script is run from Automation folder
+    docs_path = Path.cwd().parent / 'Docs'
+    if not docs_path.exists():
+        print("Docs folder not found. Please run this script from the Automation folder within the project.")
+        sys.exit(1)
+    socket_path = args.socket or default_socket_path(docs_path)
+
+    if args.command == "start":
+        from docs_env import ensure_docs_venv
+        ensure_docs_venv(Path(__file__).parent / 'docs_venv', __file__)
+        sys.exit(serve(docs_path, socket_path))
+
+    reply = send_request(socket_path, {"command": args.command}, timeout=5)
+    if reply is None:
+        print(f"No build daemon is listening on {socket_path}")
+        sys.exit(1)
+    sys.stdout.write(reply["output"])
+    sys.stderr.write(reply.get("errors", ""))
+    sys.exit(reply["status"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Docs Environment
+
+Makes the packages of `Automation/docs_venv` available to the running
+interpreter without launching a second one:
+
+1. nothing to do when already running inside the venv, or when the
+   dependencies are importable anyway (system / active environment);
+2. otherwise the venv's site-packages is added to `sys.path` in-process,
+   provided it was built for this Python version;
+3. only for a venv of a different Python version does the script re-exec
+   itself with the venv interpreter (compiled extensions would not load).
+"""
+
+import importlib.util
+import os
+import site
+import sys
+from pathlib import Path
+
+REQUIRED_MODULES = ("yaml", "requests")
+
+
+def venv_site_packages(venv_path):
+    """site-packages of the venv matching this interpreter's version, or None."""
+    path = Path(venv_path) / 'lib' / f'python{sys.version_info.major}.{sys.version_info.minor}' / 'site-packages'
+    return path if path.is_dir() else None
+
+
+def ensure_docs_venv(venv_path, script=None, argv=None):
+    """Ensure the docs dependencies can be imported; may replace the process via exec."""
+    venv_path = Path(venv_path)
+    venv_python = venv_path / 'bin' / 'python'
+    if not venv_python.exists() or Path(sys.prefix).resolve() == venv_path.resolve():
+        return
+    if all(importlib.util.find_spec(name) is not None for name in REQUIRED_MODULES):
+        return
+
+    site_packages = venv_site_packages(venv_path)
+    if site_packages is not None:
+        site.addsitedir(str(site_packages))
+        return
+
+    script = script or sys.argv[0]
+    argv = sys.argv[1:] if argv is None else argv
+    os.execv(str(venv_python), [str(venv_python), str(script), *argv])
@@ -0,0 +1,365 @@
+#!/usr/bin/env python3
+"""
+Docs Preview Server
+
+Serves `Docs/build` over HTTP for local preview (`docs_builder.py serve`):
+
+- strong ETags: the page path hashed with the build manifest's input digest
+  for generated pages (pages built from the same inputs still differ), a
+  content hash (cached by mtime/size) for everything else; `If-None-Match`
+  is answered with 304 Not Modified;
+- gzip, or brotli when the optional `brotli` package is installed, chosen
+  from `Accept-Encoding`; compressed bodies are cached per path and ETag;
+- live reload: HTML pages get a small script listening on a Server-Sent
+  Events stream, and `refresh()` after a rebuild tells open pages which
+  files changed; a page reloads only when it changed itself or it loaded
+  one of the changed files (so search index shards reload the search page only).
+"""
+
+import gzip
+import hashlib
+import mimetypes
+import os
+import threading
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import unquote, urlsplit
+
+from build_manifest import BuildManifest
+
+RELOAD_PATH = "/__reload"
+KEEPALIVE_SECONDS = 15
+COMPRESS_MIN_BYTES = 512
+COMPRESSIBLE_TYPES = ("text/", "application/javascript", "application/json", "image/svg+xml")
+RELOAD_SCRIPT = f"""<script>
+(function () {{
+  var here = location.pathname.replace(/\\/$/, "/index.html").replace(/^\\//, "");
+  // Build-relative paths of the files this page loaded (stylesheet, scripts incl. search shards, images)
+  function referenced() {{
+    var paths = {{}};
+    document.querySelectorAll("link[href], script[src], img[src], object[data], iframe[src]").forEach(function (node) {{
+      var url = new URL(node.getAttribute("href") || node.getAttribute("src") || node.getAttribute("data"), location.href);
+      if (url.origin === location.origin) {{
+        paths[decodeURIComponent(url.pathname).replace(/^\\//, "")] = true;
+      }}
+    }});
+    return paths;
+  }}
+  var events = new EventSource("{RELOAD_PATH}");
+  events.addEventListener("reload", function (event) {{
+    var changed = JSON.parse(event.data);
+    var uses = referenced();
+    if (changed.some(function (path) {{ return path === here || uses[path]; }})) {{
+      location.reload();
+    }}
+  }});
+}})();
+</script>
+"""
+
+
+def _brotli():
+    try:
+        import brotli
+    except ImportError:
+        return None
+    return brotli
+
+
+def _content_hash(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _page_etag(relative, inputs_digest):
+    """ETag of a generated page: its inputs digest alone is shared by pages with the same inputs."""
+    return hashlib.sha256(f"{relative}\0{inputs_digest}".encode("utf-8")).hexdigest()[:32]
+
+
+class BuildIndex:
+    """Current ETag of every file in the build folder."""
+
+    def __init__(self, build_path):
+        self.build_path = Path(build_path)
+        self.etags = {}
+        # path -> ((mtime_ns, size), content hash) for files the manifest does not cover
+        self._hashes = {}
+        self._lock = threading.Lock()
+
+    def _hash(self, relative, stat):
+        key = (stat.st_mtime_ns, stat.st_size)
+        cached = self._hashes.get(relative)
+        if cached is None or cached[0] != key:
+            cached = (key, _content_hash(self.build_path / relative))
+            self._hashes[relative] = cached
+        return cached[1]
+
+    def _scan(self):
+        manifest = BuildManifest(self.build_path)
+        try:
+            manifest_mtime = manifest.path.stat().st_mtime_ns
+        except OSError:
+            manifest_mtime = 0
+        etags = {}
+        for root, dirs, files in os.walk(self.build_path):
+            dirs[:] = [name for name in dirs if not name.startswith(".")]
+            for name in files:
+                if name.startswith(".") or name.endswith(".tmp"):
+                    continue
+                path = Path(root) / name
+                relative = path.relative_to(self.build_path).as_posix()
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                entry = manifest.pages.get(relative)
+                # Trust the manifest only for files not touched after it was saved
+                if entry and stat.st_mtime_ns <= manifest_mtime:
+                    etags[relative] = _page_etag(relative, entry["inputs"])
+                else:
+                    etags[relative] = self._hash(relative, stat)[:32]
+        return etags
+
+    def refresh(self) -> list:
+        """Rescan the build folder; returns the files whose ETag changed (including added/removed)."""
+        with self._lock:
+            etags = self._scan()
+            changed = sorted(path for path in etags.keys() | self.etags.keys()
+                             if etags.get(path) != self.etags.get(path))
+            self.etags = etags
+            self._hashes = {path: value for path, value in self._hashes.items() if path in etags}
+        return changed
+
+    def etag(self, relative):
+        with self._lock:
+            etag = self.etags.get(relative)
+            if etag is None:
+                # Written after the last refresh
+                try:
+                    etag = self._hash(relative, (self.build_path / relative).stat())[:32]
+                except OSError:
+                    return None
+        return etag
+
+
+class ReloadHub:
+    """Fans rebuild notifications out to the open Server-Sent Events streams."""
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._version = 0
+        self._changed = []
+
+    def publish(self, changed):
+        with self._condition:
+            self._version += 1
+            self._changed = list(changed)
+            self._condition.notify_all()
+
+    def wait(self, version, timeout):
+        """Block until a publish newer than `version`; returns (version, changed) or None on timeout."""
+        with self._condition:
+            if not self._condition.wait_for(lambda: self._version != version, timeout):
+                return None
+            return self._version, self._changed
+
+    @property
+    def version(self):
+        with self._condition:
+            return self._version
+
+
+def choose_encoding(accept_encoding) -> str:
+    """'br', 'gzip' or '' for an Accept-Encoding header."""
+    accepted = set()
+    for part in (accept_encoding or "").split(","):
+        name, _, params = part.partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.partition("=")
+            if key.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if quality > 0:
+            accepted.add(name.strip().lower())
+    if "br" in accepted and _brotli() is not None:
+        return "br"
+    if "gzip" in accepted or "*" in accepted:
+        return "gzip"
+    return ""
+
+
+def compress(data: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return _brotli().compress(data)
+    return gzip.compress(data, compresslevel=6, mtime=0)
+
+
+class DocsRequestHandler(BaseHTTPRequestHandler):
+    server_version = "DocsPreview"
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_HEAD(self):
+        self._serve(head=True)
+
+    def do_GET(self):
+        if urlsplit(self.path).path == RELOAD_PATH:
+            self._stream_reloads()
+        else:
+            self._serve(head=False)
+
+    def _resolve(self):
+        relative = unquote(urlsplit(self.path).path).lstrip("/")
+        if not relative or relative.endswith("/"):
+            relative += "index.html"
+        build_path = self.server.index.build_path
+        path = (build_path / relative).resolve()
+        if build_path.resolve() not in path.parents or any(part.startswith(".") for part in Path(relative).parts):
+            return None, None
+        return path.relative_to(build_path.resolve()).as_posix(), path
+
+    def _serve(self, head):
+        relative, path = self._resolve()
+        etag = self.server.index.etag(relative) if relative else None
+        if etag is None or not path.is_file():
+            self._send_error(HTTPStatus.NOT_FOUND)
+            return
+
+        content_type = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+        encoding = ""
+        if content_type.startswith(COMPRESSIBLE_TYPES) and path.stat().st_size >= COMPRESS_MIN_BYTES:
+            encoding = choose_encoding(self.headers.get("Accept-Encoding"))
+        live_reload = content_type == "text/html"
+        tag = f'"{etag}{"-lr" if live_reload else ""}{"-" + encoding if encoding else ""}"'
+
+        if_none_match = [value.strip() for value in self.headers.get("If-None-Match", "").split(",")]
+        if tag in if_none_match or "*" in if_none_match:
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self._common_headers(tag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        body = self.server.body(relative, tag, path, encoding, live_reload)
+        if body is None:
+            self._send_error(HTTPStatus.NOT_FOUND)
+            return
+        self.send_response(HTTPStatus.OK)
+        self._common_headers(tag)
+        self.send_header("Content-Type", f"{content_type}; charset=utf-8" if content_type.startswith("text/")
+                         else content_type)
+        if encoding:
+            self.send_header("Content-Encoding", encoding)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if not head:
+            self.wfile.write(body)
+
+    def _common_headers(self, tag):
+        self.send_header("ETag", tag)
+        # Always revalidate: cheap 304s, and edits show up without a hard refresh
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Vary", "Accept-Encoding")
+
+    def _send_error(self, status):
+        body = f"{status.value} {status.phrase}\n".encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "text/plain; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def _stream_reloads(self):
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+        hub = self.server.hub
+        version = hub.version
+        try:
+            self.wfile.write(b"retry: 1000\n\n")
+            self.wfile.flush()
+            while not self.server.stopping:
+                update = hub.wait(version, KEEPALIVE_SECONDS)
+                if update is None:
+                    self.wfile.write(b": keepalive\n\n")
+                else:
+                    version, changed = update
+                    data = "[" + ",".join(f'"{path}"' for path in changed) + "]"
+                    self.wfile.write(f"event: reload\ndata: {data}\n\n".encode("utf-8"))
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+
+class DocsServer(ThreadingHTTPServer):
+    """Threaded preview server over one build folder."""
+
+    daemon_threads = True
+
+    def __init__(self, build_path, host="127.0.0.1", port=8000):
+        super().__init__((host, port), DocsRequestHandler)
+        self.index = BuildIndex(Path(build_path).resolve())
+        self.index.refresh()
+        self.hub = ReloadHub()
+        self.stopping = False
+        # (path, tag) -> body; the tag carries the ETag and encoding, old entries are dropped on refresh
+        self._bodies = {}
+        self._bodies_lock = threading.Lock()
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def body(self, relative, tag, path, encoding, live_reload):
+        with self._bodies_lock:
+            cached = self._bodies.get((relative, tag))
+        if cached is not None:
+            return cached
+        try:
+            data = path.read_bytes()
+        except OSError:
+            return None
+        if live_reload:
+            data = data.replace(b"</body>", RELOAD_SCRIPT.encode("utf-8") + b"</body>", 1)
+        if encoding:
+            data = compress(data, encoding)
+        with self._bodies_lock:
+            self._bodies[(relative, tag)] = data
+        return data
+
+    def refresh(self) -> list:
+        """Pick up a rebuild: update ETags and tell open pages what changed."""
+        changed = self.index.refresh()
+        if changed:
+            with self._bodies_lock:
+                etags = self.index.etags
+                self._bodies = {key: body for key, body in self._bodies.items()
+                                if key[1].strip('"').split("-")[0] == etags.get(key[0])}
+            self.hub.publish(changed)
+        return changed
+
+    def start(self):
+        """Serve on a background thread."""
+        thread = threading.Thread(target=self.serve_forever, name="docs-server", daemon=True)
+        thread.start()
+        return thread
+
+    def stop(self):
+        self.stopping = True
+        self.hub.publish([])
+        self.shutdown()
+        self.server_close()
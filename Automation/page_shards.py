@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Requirement Page Shards
+
+Splits a requirements level into several smaller pages so large sets stay
+quick to open in a browser:
+
+- `size`: consecutive runs of `page_size` requirements;
+- `status`: one page per status (in workflow order);
+- `parent`: one page per refined high-level requirement (first parent wins),
+  with unlinked requirements on their own page.
+
+Groups larger than `page_size` are split further. The level page itself
+(`software.html`) becomes a compact index of its shards, and
+`TraceGraph.assign_pages` points cross-page anchors at the right shard.
+"""
+
+import re
+
+from requirement_model import Status
+
+SHARD_MODES = ("none", "size", "status", "parent")
+DEFAULT_PAGE_SIZE = 500
+
+
+class Shard:
+    """One output page holding the requirements at `indices` of a RequirementStore."""
+
+    __slots__ = ("page", "label", "indices")
+
+    def __init__(self, page, label, indices):
+        self.page = page
+        self.label = label
+        self.indices = indices
+
+
+def shard_slug(text) -> str:
+    return re.sub(r"[^A-Za-z0-9_-]+", "-", str(text)).strip("-") or "other"
+
+
+def _group_by_status(store):
+    """[(label, slug, indices)] per status, known statuses first in workflow order."""
+    groups = {}
+    for index, (label, slug, kind) in enumerate(zip(store.statuses, store.status_slugs, store.status_kinds)):
+        if kind is not None:
+            label, slug = kind.value.title(), kind.slug
+        groups.setdefault(slug, (label, slug, []))[2].append(index)
+    order = {status.slug: position for position, status in enumerate(Status)}
+    return sorted(groups.values(), key=lambda group: order.get(group[1], len(order)))
+
+
+def _group_by_parent(store, graph):
+    """[(label, slug, indices)] per first resolved parent; unlinked requirements go last."""
+    groups = {}
+    for index, req_id in enumerate(store.ids):
+        parents = graph.parents_of(req_id)
+        groups.setdefault(parents[0] if parents else None, []).append(index)
+    result = [(f"Refines {parent}", shard_slug(parent), indices) for parent, indices in groups.items() if parent]
+    if None in groups:
+        result.append(("Unlinked", "unlinked", groups[None]))
+    return result
+
+
+def plan_shards(level, store, mode, page_size=DEFAULT_PAGE_SIZE, graph=None):
+    """Return the list of Shards for one level, or [] when the level is not sharded."""
+    if mode == "none" or not len(store):
+        return []
+    page_size = max(1, page_size)
+
+    if mode == "parent" and graph is not None and any(graph.parents_of(req_id) for req_id in store.ids):
+        groups = _group_by_parent(store, graph)
+    elif mode == "status":
+        groups = _group_by_status(store)
+    else:
+        # `size`, and `parent` on a level that refines nothing
+        groups = [(None, None, list(range(len(store))))]
+
+    shards = []
+    used = set()
+    for label, slug, indices in groups:
+        chunks = [indices[start:start + page_size] for start in range(0, len(indices), page_size)]
+        for part, chunk in enumerate(chunks, start=1):
+            if label is None:
+                stem = f"{level}-{part}"
+                chunk_label = f"{store.ids[chunk[0]]} – {store.ids[chunk[-1]]}"
+            else:
+                stem = f"{level}-{slug}" if part == 1 else f"{level}-{slug}-{part}"
+                chunk_label = label if len(chunks) == 1 else f"{label} ({part}/{len(chunks)})"
+            # Distinct ids can share a slug (e.g. "A B" and "A-B")
+            page, counter = f"{stem}.html", 1
+            while page in used:
+                counter += 1
+                page = f"{stem}~{counter}.html"
+            used.add(page)
+            shards.append(Shard(page, chunk_label, chunk))
+    return shards
+
+
+def page_map(shards, store) -> dict:
+    """{requirement id: shard page} for every requirement in the shards."""
+    pages = {}
+    for shard in shards:
+        for index in shard.indices:
+            pages[store.ids[index]] = shard.page
+    return pages
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+PlantUML Codec
+
+Encodes and decodes the text format used in PlantUML server URLs: raw DEFLATE
+followed by a base64 variant with PlantUML's own 6-bit alphabet. The mapping
+is done in bulk with the C base64 codec plus a translation table instead of a
+per-byte Python loop.
+"""
+
+import base64
+import re
+import zlib
+
+_BASE64_ALPHABET = b"ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/"
+_PLANTUML_ALPHABET = b"0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz-_"
+
+_TO_PLANTUML = bytes.maketrans(_BASE64_ALPHABET, _PLANTUML_ALPHABET)
+_TO_BASE64 = bytes.maketrans(_PLANTUML_ALPHABET, _BASE64_ALPHABET)
+_ENCODED_RE = re.compile(r"[0-9A-Za-z\-_]*")
+
+
+def deflate(puml_text: str) -> bytes:
+    """Compress text with raw DEFLATE (no zlib header/checksum), as PlantUML expects."""
+    compressor = zlib.compressobj(level=9, wbits=-zlib.MAX_WBITS)
+    return compressor.compress(puml_text.encode("utf-8")) + compressor.flush()
+
+
+def inflate(data: bytes) -> str:
+    decompressor = zlib.decompressobj(wbits=-zlib.MAX_WBITS)
+    return (decompressor.decompress(data) + decompressor.flush()).decode("utf-8")
+
+
+def encode_bytes(data: bytes) -> str:
+    """Map bytes to PlantUML's 6-bit alphabet (unpadded, 3 bytes -> 4 chars)."""
+    return base64.b64encode(data).rstrip(b"=").translate(_TO_PLANTUML).decode("ascii")
+
+
+def decode_bytes(encoded: str) -> bytes:
+    """Inverse of encode_bytes; raises ValueError on malformed input."""
+    if not _ENCODED_RE.fullmatch(encoded) or len(encoded) % 4 == 1:
+        raise ValueError("Not a valid PlantUML-encoded string.")
+    data = encoded.encode("ascii").translate(_TO_BASE64)
+    return base64.b64decode(data + b"=" * (-len(data) % 4))
+
+
+def encode(puml_text: str) -> str:
+    """Encode PlantUML source for a server URL."""
+    return encode_bytes(deflate(puml_text))
+
+
+def decode(encoded: str) -> str:
+    """Decode a server URL fragment back to PlantUML source."""
+    try:
+        return inflate(decode_bytes(encoded))
+    except zlib.error as e:
+        raise ValueError(f"Encoded diagram does not inflate: {e}") from e
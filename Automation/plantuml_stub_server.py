@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+PlantUML Stub Server
+
+Minimal local stand-in for the PlantUML server's `/svg/<encoded>` endpoint.
+It decodes each diagram request (answering 400 on malformed URLs) and returns
+a small deterministic SVG, so the docs pipeline can be exercised and timed
+without network access. Latency and failures can be injected to exercise the
+render backend's retries and circuit breaker:
+
+    python3 plantuml_stub_server.py --port 8765 --delay 0.2 --fail-rate 0.3
+    python3 docs_builder.py --plantuml-server http://127.0.0.1:8765/plantuml
+"""
+
+import argparse
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import plantuml_codec
+
+
+class StubPlantUMLHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        if "/svg/" not in self.path:
+            self._send(404, "text/plain", b"not found")
+            return
+
+        if self.server.delay:
+            time.sleep(self.server.delay)
+
+        if self.server.should_fail():
+            self._send(self.server.fail_status, "text/plain", b"injected failure")
+            return
+
+        encoded = self.path.rsplit("/", 1)[-1]
+        try:
+            source = plantuml_codec.decode(encoded)
+        except ValueError as e:
+            self._send(400, "text/plain", f"bad diagram encoding: {e}".encode("utf-8"))
+            return
+
+        body = (
+            "<svg xmlns=\"http://www.w3.org/2000/svg\" width=\"200\" height=\"40\">"
+            f"<text x=\"4\" y=\"24\">stub {len(source)} chars</text></svg>"
+        ).encode("utf-8")
+        self._send(200, "image/svg+xml", body)
+
+    def _send(self, status, content_type, body):
+        with self.server.stats_lock:
+            self.server.request_count += 1
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class StubPlantUMLServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, delay=0.0, verbose=False, fail_first=0, fail_rate=0.0, fail_status=503, seed=None):
+        super().__init__(address, StubPlantUMLHandler)
+        self.delay = delay
+        self.verbose = verbose
+        self.fail_first = fail_first
+        self.fail_rate = fail_rate
+        self.fail_status = fail_status
+        self.rng = random.Random(seed)
+        self.request_count = 0
+        self.failure_count = 0
+        self.stats_lock = threading.Lock()
+
+    def should_fail(self):
+        """Decide whether to inject a failure into the current request."""
+        with self.stats_lock:
+            fail = self.fail_first > 0 or (self.fail_rate and self.rng.random() < self.fail_rate)
+            if self.fail_first > 0:
+                self.fail_first -= 1
+            if fail:
+                self.failure_count += 1
+            return bool(fail)
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/plantuml"
+
+
+def start_stub_server(port=0, delay=0.0, **faults):
+    """Start a stub server on a background thread; returns the server (call shutdown() to stop).
+
+    `faults` accepts fail_first, fail_rate, fail_status and seed (see StubPlantUMLServer).
+    """
+    server = StubPlantUMLServer(("127.0.0.1", port), delay=delay, **faults)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve stub SVGs in place of the PlantUML server.")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--delay", type=float, default=0.0, help="Seconds to wait before each response.")
+    parser.add_argument("--fail-first", type=int, default=0, help="Fail this many requests before succeeding.")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="Probability of failing any request.")
+    parser.add_argument("--fail-status", type=int, default=503, help="HTTP status used for injected failures.")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+
+    server = StubPlantUMLServer(
+        ("127.0.0.1", args.port),
+        delay=args.delay,
+        verbose=args.verbose,
+        fail_first=args.fail_first,
+        fail_rate=args.fail_rate,
+        fail_status=args.fail_status,
+        seed=args.seed,
+    )
+    print(f"Stub PlantUML server listening on {server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
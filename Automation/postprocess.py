@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+Build Post-Processing
+
+Prepares `Docs/build` for a static web server (`docs_builder.py --optimize`):
+
+- minifies HTML (comments and whitespace outside `<pre>`, `<script>` and
+  `<textarea>`), inline and standalone SVG (PlantUML comments, processing
+  instructions, `<metadata>`, whitespace between tags) and CSS;
+- writes `.gz` siblings at level 9 and `.br` siblings at quality 11 (when the
+  optional `brotli` package is installed), for servers that serve
+  precompressed files (e.g. nginx `gzip_static` / `brotli_static`).
+
+Files are processed in parallel. `.postprocess.json` records the stat and
+content hash of every processed file, so a file is only minified and
+compressed again after the build actually rewrote it.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+POSTPROCESS_VERSION = 3
+STATE_NAME = ".postprocess.json"
+EXTENSIONS = (".html", ".svg", ".css", ".js")
+MIN_COMPRESS_BYTES = 256
+COMPRESSED_SUFFIXES = (".gz", ".br")
+
+_HTML_PROTECTED = re.compile(r"(<(pre|script|textarea)\b.*?</\2\s*>)", re.S | re.I)
+_HTML_COMMENT = re.compile(r"<!--(?!\[if).*?-->", re.S)
+_STYLE_BLOCK = re.compile(r"(<style\b[^>]*>)(.*?)(</style\s*>)", re.S | re.I)
+_SVG_BLOCK = re.compile(r"<svg\b.*?</svg\s*>", re.S | re.I)
+# Whitespace around these tags never renders; inline elements (input, svg, span, a, ...) keep theirs
+_BLOCK_TAG = re.compile(
+    r"\s*(</?(?:!doctype|html|head|body|meta|link|title|div|main|nav|header|footer|section|article|aside|"
+    r"ul|ol|li|p|h[1-6]|table|thead|tbody|tr|td|th|form|br|hr)\b[^>]*>)\s*", re.I
+)
+_WHITESPACE = re.compile(r"\s+")
+_SVG_NOISE = re.compile(r"<\?.*?\?>|<!--.*?-->|<metadata\b.*?</metadata\s*>", re.S | re.I)
+_BETWEEN_TAGS = re.compile(r">\s+<")
+_CSS_STRING = r"""("(?:[^"\\\n]|\\.)*"|'(?:[^'\\\n]|\\.)*')"""
+_CSS_COMMENT = re.compile(_CSS_STRING + r"|/\*.*?\*/", re.S)
+_CSS_TOKEN = re.compile(_CSS_STRING + r"|\s*([{};,>])\s*|(\s*):\s*|\s+")
+_CSS_BLOCK_MARK = re.compile(r"[{};]")
+
+
+def _brotli():
+    try:
+        import brotli
+    except ImportError:
+        return None
+    return brotli
+
+
+def _css_token(match):
+    string, punctuation, before_colon = match.group(1, 2, 3)
+    if string:
+        return string
+    if punctuation:
+        # The last declaration of a block needs no semicolon
+        return "" if punctuation == ";" and match.string.startswith("}", match.end()) else punctuation
+    if before_colon is None:
+        return " "
+    # A colon followed by `{` before any `;`/`}` is in a selector, where `nav :hover` differs from `nav:hover`
+    mark = _CSS_BLOCK_MARK.search(match.string, match.end())
+    return " :" if before_colon and mark is not None and mark.group() == "{" else ":"
+
+
+def minify_css(css: str) -> str:
+    """Strip comments and insignificant whitespace from a stylesheet (also the builder's shared one).
+
+    Quoted strings are kept as written.
+    """
+    css = _CSS_COMMENT.sub(lambda match: match.group(1) or " ", css)
+    return _CSS_TOKEN.sub(_css_token, css).strip()
+
+
+def _minify_styles(text: str) -> str:
+    return _STYLE_BLOCK.sub(lambda m: m.group(1) + minify_css(m.group(2)) + m.group(3), text)
+
+
+def minify_svg(svg: str) -> str:
+    svg = _SVG_NOISE.sub("", svg)
+    svg = _minify_styles(svg)
+    return _BETWEEN_TAGS.sub("><", svg).strip()
+
+
+def minify_html(html: str) -> str:
+    """Minify an HTML page, leaving `<pre>`, `<script>` and `<textarea>` content untouched."""
+    parts = _HTML_PROTECTED.split(html)
+    out = []
+    # split() yields [text, protected block, tag name, text, ...]
+    for position in range(0, len(parts), 3):
+        text = _HTML_COMMENT.sub("", parts[position])
+        text = _SVG_BLOCK.sub(lambda m: minify_svg(m.group(0)), text)
+        text = _minify_styles(text)
+        text = _WHITESPACE.sub(" ", text)
+        out.append(_BLOCK_TAG.sub(r"\1", text))
+        if position + 1 < len(parts):
+            out.append(parts[position + 1])
+    return "".join(out).strip()
+
+
+MINIFIERS = {".html": minify_html, ".svg": minify_svg, ".css": minify_css}
+
+
+def _write_bytes(path, data: bytes):
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
+
+
+def process_file(path) -> dict:
+    """Minify one file in place and write its compressed siblings; returns byte counts."""
+    path = Path(path)
+    original = path.read_bytes()
+    data = original
+    minifier = MINIFIERS.get(path.suffix)
+    if minifier is not None:
+        data = minifier(original.decode("utf-8")).encode("utf-8")
+        if len(data) < len(original):
+            _write_bytes(path, data)
+        else:
+            data = original
+
+    result = {"original": len(original), "minified": len(data), "gzip": None, "br": None}
+    encoders = {".gz": lambda raw: gzip.compress(raw, compresslevel=9, mtime=0)}
+    brotli = _brotli()
+    if brotli is not None:
+        encoders[".br"] = lambda raw: brotli.compress(raw, quality=11)
+    for suffix in COMPRESSED_SUFFIXES:
+        sibling = path.with_name(path.name + suffix)
+        compressed = encoders[suffix](data) if suffix in encoders and len(data) >= MIN_COMPRESS_BYTES else None
+        if compressed is not None and len(compressed) < len(data):
+            _write_bytes(sibling, compressed)
+            result["gzip" if suffix == ".gz" else "br"] = len(compressed)
+        else:
+            sibling.unlink(missing_ok=True)
+    result["hash"] = hashlib.sha256(data).hexdigest()
+    return result
+
+
+def _stat_key(path):
+    stat = path.stat()
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def _load_state(state_path) -> dict:
+    try:
+        data = json.loads(state_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("version") != POSTPROCESS_VERSION:
+        return {}
+    return data.get("files", {})
+
+
+def _save_state(state_path, files):
+    payload = json.dumps({"version": POSTPROCESS_VERSION, "files": files}, indent=1, sort_keys=True)
+    _write_bytes(state_path, payload.encode("utf-8"))
+
+
+def _is_current(path, entry) -> bool:
+    if not entry:
+        return False
+    try:
+        if _stat_key(path) == entry["stat"]:
+            return True
+        return hashlib.sha256(path.read_bytes()).hexdigest() == entry["hash"]
+    except OSError:
+        return False
+
+
+def remove_orphans(build_path) -> int:
+    """Delete compressed siblings whose source file is gone."""
+    removed = 0
+    for suffix in COMPRESSED_SUFFIXES:
+        for sibling in Path(build_path).rglob(f"*{suffix}"):
+            if not sibling.with_suffix("").exists():
+                sibling.unlink()
+                removed += 1
+    return removed
+
+
+def clear_postprocess(build_path) -> int:
+    """Remove all compressed siblings and the state file (after a build without --optimize)."""
+    build_path = Path(build_path)
+    state_path = build_path / STATE_NAME
+    if not state_path.exists():
+        return 0
+    removed = 0
+    for suffix in COMPRESSED_SUFFIXES:
+        for sibling in build_path.rglob(f"*{suffix}"):
+            sibling.unlink()
+            removed += 1
+    state_path.unlink()
+    return removed
+
+
+def postprocess_build(build_path, workers=None) -> list:
+    """Minify and precompress every changed artifact in the build folder.
+
+    Returns [(relative path, byte counts)] for the files processed in this run.
+    """
+    build_path = Path(build_path)
+    state_path = build_path / STATE_NAME
+    state = _load_state(state_path)
+
+    candidates = sorted(
+        path for path in build_path.rglob("*")
+        if path.suffix in EXTENSIONS and path.is_file() and not path.name.startswith(".")
+    )
+    files = {}
+    pending = []
+    for path in candidates:
+        relative = path.relative_to(build_path).as_posix()
+        entry = state.get(relative)
+        if _is_current(path, entry):
+            files[relative] = {**entry, "stat": _stat_key(path)}
+        else:
+            pending.append((relative, path))
+
+    results = []
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count() or 1) as pool:
+        for (relative, path), result in zip(pending, pool.map(lambda item: process_file(item[1]), pending)):
+            files[relative] = {"stat": _stat_key(path), "hash": result.pop("hash")}
+            results.append((relative, result))
+
+    remove_orphans(build_path)
+    _save_state(state_path, files)
+    return results
+
+
+def _kb(size) -> str:
+    return "-" if size is None else f"{size / 1024:.1f} KB"
+
+
+def _report_row(label, original, minified, gzip_size, br_size, served) -> str:
+    saved = 1 - served / original if original else 0
+    return (f"{label}  {_kb(original):>10} {_kb(minified):>10} {_kb(gzip_size):>10} {_kb(br_size):>10} "
+            f"{saved:>6.0%}")
+
+
+def format_report(results, groups=()) -> str:
+    """Per-artifact byte savings plus a total line.
+
+    Artifacts under a folder in `groups` (e.g. the many small search index
+    shards) are summed into one line per folder.
+    """
+    if not results:
+        return "Post-processing: all artifacts up to date."
+    rows = []
+    grouped = {}
+    for relative, result in results:
+        served = min(size for size in (result["minified"], result["gzip"], result["br"]) if size is not None)
+        group = next((folder for folder in groups if relative.startswith(f"{folder}/")), None)
+        if group is None:
+            rows.append((relative, result["original"], result["minified"], result["gzip"], result["br"], served))
+            continue
+        sums = grouped.setdefault(group, {"files": 0, "original": 0, "minified": 0, "gzip": 0, "br": 0,
+                                          "served": 0, "encodings": set()})
+        sums["files"] += 1
+        sums["original"] += result["original"]
+        sums["minified"] += result["minified"]
+        sums["served"] += served
+        for key in ("gzip", "br"):
+            # Files too small to compress are served minified
+            sums[key] += result["minified"] if result[key] is None else result[key]
+            if result[key] is not None:
+                sums["encodings"].add(key)
+    for group, sums in grouped.items():
+        label = f"{group}/ ({sums['files']} files)"
+        gzip_size, br_size = (sums[key] if key in sums["encodings"] else None for key in ("gzip", "br"))
+        rows.append((label, sums["original"], sums["minified"], gzip_size, br_size, sums["served"]))
+
+    width = max(len(row[0]) for row in rows)
+    lines = [f"{'artifact':<{width}}  {'original':>10} {'minified':>10} {'gzip':>10} {'brotli':>10} {'saved':>6}"]
+    lines.extend(_report_row(f"{row[0]:<{width}}", *row[1:]) for row in rows)
+    original = sum(row[1] for row in rows)
+    served = sum(row[5] for row in rows)
+    saved = 1 - served / original if original else 0
+    lines.append(f"Post-processed {len(results)} artifact(s): {_kb(original)} -> "
+                 f"{_kb(served)} as served ({saved:.0%} smaller).")
+    return "\n".join(lines)
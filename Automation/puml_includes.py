@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+PlantUML Include Resolution
+
+Expands local `!include` directives before a diagram is rendered, so shared
+styles and components work with any renderer (a remote PlantUML server
+cannot read files from this checkout):
+
+- `!include file`, `!include_many file`, `!include_once file` (a repeated
+  `_once` include is skipped);
+- `!include file!N` (N-th `@startuml` block) and `!include file!ID`
+  (`@startuml(id=ID)`);
+- `!includesub file!NAME` (the `!startsub NAME` ... `!endsub` section).
+
+Paths are relative to the including file. Standard library (`<C4/...>`) and
+URL includes, and paths built from preprocessor variables, are left for
+PlantUML to resolve. Include cycles are reported with the full chain.
+
+The files a diagram pulls in form its include closure; `closure_digest`
+hashes all of them, so editing a shared include invalidates exactly the
+diagrams that depend on it.
+"""
+
+import json
+import os
+import re
+from pathlib import Path
+
+from build_manifest import hash_text
+
+_INCLUDE = re.compile(r"^\s*!(include|include_many|include_once|includesub)\s+(.+?)\s*$")
+_START = re.compile(r"^\s*@startuml\b(?:\(id=([^)]*)\))?")
+_END = re.compile(r"^\s*@enduml\b")
+_START_SUB = re.compile(r"^\s*!startsub\s+(\S+)")
+_END_SUB = re.compile(r"^\s*!endsub\b")
+
+
+class IncludeError(Exception):
+    """A local include could not be resolved (missing file, unknown block, cycle)."""
+
+
+def _blocks(lines):
+    """[(id, lines)] of the @startuml ... @enduml blocks of an included file."""
+    blocks = []
+    current = None
+    for line in lines:
+        start = _START.match(line)
+        if start and current is None:
+            current = (start.group(1), [])
+        elif _END.match(line) and current is not None:
+            blocks.append(current)
+            current = None
+        elif current is not None:
+            current[1].append(line)
+    return blocks
+
+
+def _select(lines, selector, sub, target):
+    """Lines of an included file, narrowed to the requested block or sub-part."""
+    if sub:
+        selected, inside = [], False
+        for line in lines:
+            start = _START_SUB.match(line)
+            if start:
+                inside = inside or start.group(1) == selector
+            elif _END_SUB.match(line):
+                inside = False
+            elif inside:
+                selected.append(line)
+        if not selected:
+            raise IncludeError(f"no '!startsub {selector}' in {target}")
+        return selected
+
+    blocks = _blocks(lines)
+    if selector is None:
+        return blocks[0][1] if blocks else lines
+    if selector.isdigit():
+        if int(selector) >= len(blocks):
+            raise IncludeError(f"{target} has no diagram block {selector}")
+        return blocks[int(selector)][1]
+    for block_id, block_lines in blocks:
+        if block_id == selector:
+            return block_lines
+    raise IncludeError(f"{target} has no '@startuml(id={selector})' block")
+
+
+def _is_local(target) -> bool:
+    return not (target.startswith("<") or "://" in target or "%" in target or "$" in target)
+
+
+class IncludeResolver:
+    """Expands includes; file reads are memoized by mtime/size, so one resolver can serve many builds."""
+
+    def __init__(self):
+        # path -> ((mtime_ns, size), text, sha256)
+        self._files = {}
+
+    def _read(self, path):
+        stat = path.stat()
+        key = (stat.st_mtime_ns, stat.st_size)
+        cached = self._files.get(path)
+        if cached is None or cached[0] != key:
+            text = path.read_text(encoding="utf-8")
+            cached = (key, text, hash_text(text))
+            self._files[path] = cached
+        return cached[1], cached[2]
+
+    def _expand(self, path, text, stack, closure, once, errors, out):
+        for line in text.splitlines():
+            match = _INCLUDE.match(line)
+            if not match or not _is_local(match.group(2)):
+                out.append(line)
+                continue
+            kind, target = match.groups()
+            file_part, _, selector = target.partition("!")
+            include_path = Path(os.path.normpath(path.parent / file_part.strip('"')))
+            if include_path in stack:
+                errors.append(f"include cycle: {' -> '.join(p.name for p in (*stack, include_path))}")
+                continue
+            if kind == "include_once" and include_path in once:
+                continue
+            once.add(include_path)
+            try:
+                included_text, digest = self._read(include_path)
+            except (OSError, UnicodeDecodeError) as e:
+                # Recorded without a digest, so creating the file later changes the closure hash
+                closure.setdefault(include_path, None)
+                reason = e.strerror if isinstance(e, OSError) else e
+                errors.append(f"cannot include {file_part} from {path.name}: {reason}")
+                continue
+            closure.setdefault(include_path, digest)
+            try:
+                lines = _select(included_text.splitlines(), selector or None, kind == "includesub", file_part)
+            except IncludeError as e:
+                errors.append(str(e))
+                continue
+            self._expand(include_path, "\n".join(lines), (*stack, include_path), closure, once, errors, out)
+
+    def expand(self, puml_path, text=None):
+        """Return (expanded text, {path: sha256 or None} include closure, [errors])."""
+        puml_path = Path(puml_path)
+        closure = {}
+        if text is None:
+            text, digest = self._read(puml_path)
+        else:
+            digest = hash_text(text)
+        closure[puml_path] = digest
+        out, errors = [], []
+        self._expand(puml_path, text, (puml_path,), closure, set(), errors, out)
+        return "\n".join(out) + ("\n" if text.endswith("\n") else ""), closure, errors
+
+    def closure_digest(self, puml_path):
+        """Hash over the diagram and every file it includes (None if the diagram cannot be read)."""
+        puml_path = Path(puml_path)
+        try:
+            _, closure, _ = self.expand(puml_path)
+        except (OSError, UnicodeDecodeError):
+            return None
+        entries = [[os.path.relpath(path, puml_path.parent), digest] for path, digest in closure.items()]
+        return hash_text(json.dumps(entries))
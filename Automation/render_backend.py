@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+"""
+PlantUML Render Backends
+
+Pluggable renderers turning PUML text into SVG markup:
+
+- `HttpRenderBackend` talks to a PlantUML server. Transient failures
+  (connection errors, 429/5xx) are retried with exponential backoff, a circuit
+  breaker short-circuits remaining renders after consecutive failures, and
+  per-request latency feeds an adaptive timeout so a slow or dead server does
+  not cost the full timeout for every diagram.
+- `LocalPipeRenderBackend` keeps long-lived local PlantUML processes in
+  `-pipe` mode and streams diagrams to them, so nothing leaves the machine and
+  no process is spawned per diagram.
+"""
+
+import os
+import queue
+import random
+import selectors
+import shlex
+import subprocess
+import threading
+import time
+from collections import deque
+
+import plantuml_codec
+from build_profile import NULL_PROFILER
+
+PLANTUML_SERVER = "https://www.plantuml.com/plantuml"
+PLANTUML_COMMAND = "plantuml"
+TRANSIENT_STATUS = {429, 500, 502, 503, 504}
+PIPE_DELIMITER = "@@INSPEKTOR-DOCS-END@@"
+BACKENDS = ("server", "local")
+
+
+def _requests():
+    """Import requests on first use; builds served from the SVG cache or a local renderer never pay for it."""
+    import requests
+    return requests
+
+
+class RenderError(Exception):
+    """A diagram could not be rendered by the backend."""
+
+
+class CircuitOpenError(RenderError):
+    """The backend is short-circuited after repeated failures."""
+
+
+class CircuitBreaker:
+    """Closed -> open after `failure_threshold` consecutive failures; half-open after `reset_after` s."""
+
+    def __init__(self, failure_threshold=3, reset_after=30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_after = reset_after
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self):
+        return self.opened_at is not None
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            # Half-open: let one probe through, re-arm the timer for everyone else
+            if time.monotonic() - self.opened_at >= self.reset_after:
+                self.opened_at = time.monotonic()
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.consecutive_failures = 0
+            self.opened_at = None
+
+    def record_failure(self):
+        with self._lock:
+            self.consecutive_failures += 1
+            if self.consecutive_failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+
+
+class LatencyTracker:
+    """Recent request latencies; timeout() adapts to a multiple of the slow tail."""
+
+    def __init__(self, initial_timeout=10.0, min_timeout=2.0, max_timeout=10.0, factor=3.0, window=50):
+        self.initial_timeout = initial_timeout
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.factor = factor
+        self.samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float):
+        with self._lock:
+            self.samples.append(seconds)
+
+    def timeout(self) -> float:
+        with self._lock:
+            if len(self.samples) < 3:
+                return self.initial_timeout
+            ordered = sorted(self.samples)
+        p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+        return max(self.min_timeout, min(self.max_timeout, p95 * self.factor))
+
+
+class RenderBackend:
+    """Interface shared by all renderers; implementations must be thread-safe."""
+
+    profiler = NULL_PROFILER
+
+    @property
+    def identity(self) -> str:
+        """Renderer identity, used in cache keys and build inputs."""
+        raise NotImplementedError
+
+    def render(self, puml_text: str) -> str:
+        """Return SVG markup; raises RenderError on failure."""
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class HttpRenderBackend(RenderBackend):
+    """Renders diagrams through a PlantUML server over one pooled keep-alive session."""
+
+    def __init__(self, server=PLANTUML_SERVER, pool_size=4, retries=2, backoff=0.5,
+                 breaker=None, latency=None):
+        self.server = server.rstrip("/")
+        self.retries = retries
+        self.backoff = backoff
+        self.breaker = breaker or CircuitBreaker()
+        self.latency = latency or LatencyTracker()
+        self.pool_size = max(1, pool_size)
+        self._session = None
+        self._session_lock = threading.Lock()
+
+    @property
+    def session(self):
+        """The pooled keep-alive session, created on the first request."""
+        with self._session_lock:
+            if self._session is None:
+                requests = _requests()
+                from requests.adapters import HTTPAdapter
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                self._session = session
+            return self._session
+
+    @property
+    def identity(self) -> str:
+        return f"server:{self.server}"
+
+    def close(self):
+        with self._session_lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+    def _sleep_before_retry(self, attempt):
+        delay = self.backoff * (2 ** attempt)
+        time.sleep(delay + random.uniform(0, delay / 2))
+
+    def render(self, puml_text: str) -> str:
+        if not self.breaker.allow():
+            raise CircuitOpenError(
+                f"PlantUML server skipped after {self.breaker.consecutive_failures} consecutive failures"
+            )
+
+        with self.profiler.stage("encode"):
+            url = f"{self.server}/svg/{plantuml_codec.encode(puml_text)}"
+        requests = _requests()
+        last_error = None
+        attempts = 0
+        for attempt in range(self.retries + 1):
+            if attempt:
+                # Other renders may have tripped the breaker meanwhile
+                if self.breaker.is_open:
+                    break
+                self._sleep_before_retry(attempt - 1)
+            attempts += 1
+            start = time.monotonic()
+            timeout = self.latency.timeout()
+            try:
+                with self.profiler.stage("http", attempt=attempt):
+                    response = self.session.get(url, timeout=timeout)
+            except requests.Timeout as e:
+                # Counted as a sample at the timeout, so a slow server raises the next timeout
+                self.latency.record(timeout)
+                last_error = e
+                continue
+            except requests.ConnectionError as e:
+                last_error = e
+                continue
+            self.latency.record(time.monotonic() - start)
+
+            if response.status_code == 200 and "<svg" in response.text:
+                self.breaker.record_success()
+                self.profiler.add_bytes("http", len(response.content))
+                return response.text
+
+            last_error = RenderError(
+                f"status={response.status_code}, content-type={response.headers.get('Content-Type')}"
+            )
+            if response.status_code not in TRANSIENT_STATUS:
+                # The server answered; the diagram itself is the problem, so do not trip the breaker
+                self.breaker.record_success()
+                raise last_error
+
+        self.breaker.record_failure()
+        raise RenderError(f"{last_error}; gave up after {attempts} attempt(s)")
+
+
+class _PipeWorker:
+    """One long-lived `plantuml -pipe` process answering diagrams one at a time."""
+
+    def __init__(self, command):
+        self.command = command
+        self.process = None
+        self._buffer = b""
+
+    def _start(self):
+        self.process = subprocess.Popen(
+            self.command + ["-pipe", "-tsvg", "-charset", "UTF-8", "-pipedelimitor", PIPE_DELIMITER],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+        self._buffer = b""
+
+    def render(self, puml_text: str, timeout: float) -> str:
+        if self.process is None or self.process.poll() is not None:
+            self._start()
+
+        source = puml_text if puml_text.endswith("\n") else puml_text + "\n"
+        try:
+            self.process.stdin.write(source.encode("utf-8"))
+            self.process.stdin.flush()
+            output = self._read_until_delimiter(timeout)
+        except (OSError, RenderError):
+            # A worker that timed out is presumably stuck; do not wait for it to exit
+            self.stop(kill=True)
+            raise
+        return output.decode("utf-8", errors="replace")
+
+    def _read_until_delimiter(self, timeout: float) -> bytes:
+        delimiter = PIPE_DELIMITER.encode("ascii")
+        deadline = time.monotonic() + timeout
+        stdout = self.process.stdout
+        with selectors.DefaultSelector() as selector:
+            selector.register(stdout, selectors.EVENT_READ)
+            while delimiter not in self._buffer:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not selector.select(remaining):
+                    raise RenderError(f"local renderer timed out after {timeout:.1f} s")
+                chunk = os.read(stdout.fileno(), 1 << 16)
+                if not chunk:
+                    raise RenderError(f"local renderer exited (code {self.process.poll()})")
+                self._buffer += chunk
+
+        output, _, self._buffer = self._buffer.partition(delimiter)
+        self._buffer = self._buffer.lstrip(b"\r\n")
+        return output
+
+    def stop(self, kill=False):
+        if self.process is None:
+            return
+        try:
+            if kill:
+                self.process.kill()
+            self.process.stdin.close()
+            self.process.wait(timeout=2)
+        except (OSError, subprocess.TimeoutExpired):
+            self.process.kill()
+            self.process.wait()
+        self.process = None
+
+
+class LocalPipeRenderBackend(RenderBackend):
+    """Renders diagrams with a pool of persistent local PlantUML processes."""
+
+    def __init__(self, command=PLANTUML_COMMAND, pool_size=2, timeout=30.0):
+        self.command = shlex.split(command) if isinstance(command, str) else list(command)
+        self.timeout = timeout
+        self._workers = [_PipeWorker(self.command) for _ in range(max(1, pool_size))]
+        self._idle = queue.Queue()
+        for worker in self._workers:
+            self._idle.put(worker)
+
+    @property
+    def identity(self) -> str:
+        return f"local:{' '.join(self.command)}"
+
+    def render(self, puml_text: str) -> str:
+        worker = self._idle.get()
+        try:
+            try:
+                svg = worker.render(puml_text, self.timeout)
+            except FileNotFoundError as e:
+                raise RenderError(f"local renderer not found: {e.filename}") from e
+            except OSError as e:
+                raise RenderError(f"local renderer failed: {e}") from e
+        finally:
+            self._idle.put(worker)
+
+        if "<svg" not in svg:
+            raise RenderError(f"local renderer returned no SVG: {svg.strip()[:200]}")
+        return svg.strip()
+
+    def close(self):
+        for worker in self._workers:
+            worker.stop()
+
+
+def create_backend(kind="server", server=PLANTUML_SERVER, command=PLANTUML_COMMAND, pool_size=4, retries=2):
+    """Build the render backend selected by config/CLI (`server` or `local`)."""
+    if kind == "server":
+        return HttpRenderBackend(server, pool_size=pool_size, retries=retries)
+    if kind == "local":
+        return LocalPipeRenderBackend(command, pool_size=pool_size)
+    raise ValueError(f"Unknown render backend '{kind}' (expected one of: {', '.join(BACKENDS)}).")
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Requirement Model
+
+Typed, compact representation of validated requirements:
+
+- `Status` is the closed set of workflow states; status labels, slugs and the
+  CSS classes derived from them are interned once per distinct label.
+- `Requirement` is a slotted record with the fields the pages need, already
+  normalized (string id, `refines` as a tuple of ids, cleaned description).
+- `RequirementStore` keeps a whole requirements file column by column, so a
+  large set costs a handful of lists instead of one dict per requirement, and
+  pages can render straight from the columns.
+"""
+
+import sys
+from enum import Enum
+
+
+class Status(Enum):
+    DRAFT = "draft"
+    IN_PROGRESS = "in progress"
+    IN_REVIEW = "in review"
+    FINISHED = "finished"
+
+    @property
+    def slug(self) -> str:
+        return self.value.replace(" ", "-")
+
+    @classmethod
+    def parse(cls, label):
+        """Status for a YAML label (case-insensitive), or None if it is not a known status."""
+        return _STATUS_BY_VALUE.get(str(label).lower())
+
+
+_STATUS_BY_VALUE = {status.value: status for status in Status}
+_LABELS = {}
+
+
+def status_label(raw) -> tuple:
+    """Return the interned (label, slug, Status or None) for a raw YAML status value."""
+    raw = str(raw)
+    entry = _LABELS.get(raw)
+    if entry is None:
+        label = sys.intern(raw)
+        entry = (label, sys.intern(label.lower().replace(" ", "-")), Status.parse(label))
+        _LABELS[label] = entry
+    return entry
+
+
+def clean_description(text) -> str:
+    return str(text).replace("> ", "").strip()
+
+
+def normalize_refines(refines) -> tuple:
+    if refines is None or refines == "":
+        return ()
+    if isinstance(refines, (list, tuple)):
+        return tuple(str(parent) for parent in refines if parent not in (None, ""))
+    return (str(refines),)
+
+
+class Requirement:
+    """One validated requirement; `status` is the label as written in YAML."""
+
+    __slots__ = ("id", "name", "status", "status_slug", "status_kind", "refines", "description")
+
+    def __init__(self, id, name, status, status_slug, status_kind, refines, description):
+        self.id = id
+        self.name = name
+        self.status = status
+        self.status_slug = status_slug
+        self.status_kind = status_kind
+        self.refines = refines
+        self.description = description
+
+    @classmethod
+    def from_dict(cls, item):
+        label, slug, kind = status_label(item.get("status", "draft"))
+        return cls(
+            str(item["id"]),
+            str(item["name"]),
+            label,
+            slug,
+            kind,
+            normalize_refines(item.get("refines")),
+            clean_description(item.get("description", "N/A")),
+        )
+
+    def __repr__(self):
+        return f"Requirement({self.id!r}, {self.name!r}, status={self.status!r})"
+
+
+class RequirementStore:
+    """Requirements of one level stored as parallel columns, in file order."""
+
+    __slots__ = ("ids", "names", "statuses", "status_slugs", "status_kinds", "refines", "descriptions")
+
+    def __init__(self):
+        self.ids = []
+        self.names = []
+        self.statuses = []
+        self.status_slugs = []
+        self.status_kinds = []
+        self.refines = []
+        self.descriptions = []
+
+    @classmethod
+    def from_items(cls, items):
+        """Build from requirement dicts (or Requirement objects); consumes iterators lazily."""
+        if isinstance(items, RequirementStore):
+            return items
+        store = cls()
+        for item in items or ():
+            store.append(item if isinstance(item, Requirement) else Requirement.from_dict(item))
+        return store
+
+    def append(self, req):
+        self.ids.append(req.id)
+        self.names.append(req.name)
+        self.statuses.append(req.status)
+        self.status_slugs.append(req.status_slug)
+        self.status_kinds.append(req.status_kind)
+        self.refines.append(req.refines)
+        self.descriptions.append(req.description)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __getitem__(self, index):
+        return Requirement(
+            self.ids[index],
+            self.names[index],
+            self.statuses[index],
+            self.status_slugs[index],
+            self.status_kinds[index],
+            self.refines[index],
+            self.descriptions[index],
+        )
+
+    def __iter__(self):
+        for row in zip(self.ids, self.names, self.statuses, self.status_slugs, self.status_kinds,
+                       self.refines, self.descriptions):
+            yield Requirement(*row)
+
+    def subset(self, indices):
+        """A new store with the rows at `indices`, in that order."""
+        store = RequirementStore()
+        for column in self.__slots__:
+            values = getattr(self, column)
+            setattr(store, column, [values[index] for index in indices])
+        return store
+
+    def rows(self):
+        """(id, name, status, status_slug, refines, description) tuples, without building Requirement objects."""
+        return zip(self.ids, self.names, self.statuses, self.status_slugs, self.refines, self.descriptions)
+
+
+def iter_rows(items):
+    """RequirementStore.rows() for a store; dicts or Requirements are converted one at a time, without a copy."""
+    if isinstance(items, RequirementStore):
+        return items.rows()
+    return (
+        (req.id, req.name, req.status, req.status_slug, req.refines, req.description)
+        for req in (item if isinstance(item, Requirement) else Requirement.from_dict(item) for item in items or ())
+    )
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Search Index
+
+Builds a static inverted index over requirement ids, names, descriptions and
+statuses in one linear pass, for the client-side search page:
+
+- `search/index.js`         meta: counts, document chunk size, term shard keys
+- `search/docs-<n>.js`      document table chunks: [id, name, status, href]
+- `search/terms-<key>.js`   {term: delta-encoded document numbers}, sharded by
+                            term prefix; prefixes holding too many postings
+                            are split into longer ones
+
+Files are plain scripts calling `DocsSearch.add(...)` rather than JSON, so the
+search page can load them with `<script>` tags and also works when the site is
+opened straight from disk (`file://` blocks `fetch`). A query only loads the
+shards of its own terms and the document chunks of the hits it shows.
+"""
+
+import json
+import re
+from collections import defaultdict
+from pathlib import Path
+
+from build_manifest import write_if_changed
+
+SEARCH_DIR = "search"
+SEARCH_META = f"{SEARCH_DIR}/index.js"
+DOC_CHUNK = 2000
+PREFIX_LENGTH = 2
+MAX_PREFIX_LENGTH = 32
+MAX_SHARD_POSTINGS = 20000
+INDEX_FORMAT = 1
+
+_WORD = re.compile(r"[^\W_]+")
+
+
+def tokenize(text) -> set:
+    """Lowercase word tokens of at least two characters."""
+    return {word for word in _WORD.findall(str(text).lower()) if len(word) > 1}
+
+
+def id_tokens(req_id) -> set:
+    """The whole id (for prefix search like `req-sw-00`) plus its trailing number."""
+    req_id = str(req_id).lower()
+    tokens = {req_id}
+    parts = _WORD.findall(req_id)
+    if parts and len(parts[-1]) > 1:
+        tokens.add(parts[-1])
+    return tokens
+
+
+def shard_key(term: str, length=None) -> str:
+    """File-name safe key of a term prefix; mirrored by `shardKey` in the search page.
+
+    Every character maps to a fixed-width code, so keys of prefixes are prefixes of keys.
+    """
+    return "".join(c if c.isascii() and c.isalnum() else f"_{ord(c):06x}" for c in term[:length])
+
+
+def shard_terms(postings, length=PREFIX_LENGTH, max_postings=MAX_SHARD_POSTINGS) -> dict:
+    """{shard key: [terms]}, splitting heavy prefixes into longer ones.
+
+    Terms are grouped by their own prefix (one code per character, so equal
+    prefixes have equal keys); each shard's key is computed once, from its first term.
+    """
+    weights = {term: len(numbers) + 1 for term, numbers in postings.items()}
+    shards = {}
+    pending = [(length, list(postings))]
+    while pending:
+        length, terms = pending.pop()
+        groups = defaultdict(list)
+        for term in terms:
+            groups[term[:length]].append(term)
+        for prefix, group in groups.items():
+            weight = sum(map(weights.__getitem__, group))
+            if weight > max_postings and length < MAX_PREFIX_LENGTH and any(len(t) > length for t in group):
+                pending.append((length + 1, group))
+            else:
+                shards[shard_key(prefix)] = group
+    return shards
+
+
+def build_index(levels, anchor, term_cache=None):
+    """Return (documents, {term: [doc numbers]}) for [(level, RequirementStore), ...].
+
+    `anchor(req_id)` gives the link target of a requirement (e.g. TraceGraph.anchor).
+    A `term_cache` dict kept between calls (watch mode) memoizes the terms of
+    unchanged requirements; it is left holding only the current ones.
+    """
+    documents = []
+    postings = defaultdict(list)
+    fresh_terms = {}
+    for _, store in levels:
+        for req_id, name, status, _, _, description in store.rows():
+            number = len(documents)
+            documents.append([req_id, name, status, anchor(req_id)])
+            key = (req_id, name, status, description)
+            terms = term_cache.get(key) if term_cache is not None else None
+            if terms is None:
+                terms = id_tokens(req_id) | tokenize(name) | tokenize(status) | tokenize(description)
+            fresh_terms[key] = terms
+            for term in terms:
+                postings[term].append(number)
+    if term_cache is not None:
+        term_cache.clear()
+        term_cache.update(fresh_terms)
+    return documents, postings
+
+
+def _delta(numbers):
+    previous = 0
+    encoded = []
+    for number in numbers:
+        encoded.append(number - previous)
+        previous = number
+    return encoded
+
+
+def _script(kind, key, payload) -> str:
+    body = json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+    return f"DocsSearch.add({json.dumps(kind)},{json.dumps(key)},{body});\n"
+
+
+def write_search_index(build_path, levels, anchor, term_cache=None, state=None) -> dict:
+    """Write the index files under build/search, removing stale shards; returns size stats.
+
+    A `state` dict kept between calls (watch mode, build daemon) remembers the
+    postings, shards and document chunks last written, so only files whose
+    content changed are serialized and written again.
+    """
+    search_path = Path(build_path) / SEARCH_DIR
+    search_path.mkdir(parents=True, exist_ok=True)
+    documents, postings = build_index(levels, anchor, term_cache)
+    shards = shard_terms(postings)
+    for terms in shards.values():
+        terms.sort()
+
+    previous = state if state and state.get("path") == search_path and (search_path / Path(SEARCH_META).name).exists() \
+        else {"postings": {}, "shards": {}, "documents": [], "sizes": {}}
+    old_postings = previous["postings"]
+    changed_terms = {term for term, numbers in postings.items() if old_postings.get(term) != numbers}
+
+    sizes = {}
+    files = {}
+    for start in range(0, len(documents), DOC_CHUNK):
+        chunk = start // DOC_CHUNK
+        name = f"docs-{chunk}.js"
+        rows = documents[start:start + DOC_CHUNK]
+        if name in previous["sizes"] and previous["documents"][start:start + DOC_CHUNK] == rows:
+            sizes[name] = previous["sizes"][name]
+        else:
+            files[name] = _script("docs", chunk, rows)
+    for key, terms in shards.items():
+        name = f"terms-{key}.js"
+        if name in previous["sizes"] and previous["shards"].get(key) == terms and changed_terms.isdisjoint(terms):
+            sizes[name] = previous["sizes"][name]
+        else:
+            files[name] = _script("terms", key, {term: _delta(postings[term]) for term in terms})
+    meta = {
+        "format": INDEX_FORMAT,
+        "documents": len(documents),
+        "docChunk": DOC_CHUNK,
+        "shards": sorted(shards),
+    }
+    files[Path(SEARCH_META).name] = _script("meta", "index", meta)
+
+    for name, content in files.items():
+        write_if_changed(search_path / name, content)
+        sizes[name] = len(content.encode("utf-8"))
+    for stale in search_path.glob("*.js"):
+        if stale.name not in sizes:
+            stale.unlink()
+
+    if state is not None:
+        state.clear()
+        state.update(path=search_path, postings=postings, shards=shards, documents=documents, sizes=sizes)
+    return {
+        "documents": len(documents),
+        "terms": len(postings),
+        "files": len(sizes),
+        "written": len(files),
+        "bytes": sum(sizes.values()),
+    }
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Persistent SVG Cache
+
+Content-addressed on-disk cache for rendered PlantUML diagrams.
+Entries are keyed by a hash of the PUML source and the renderer identity,
+so unchanged diagrams are served from disk without a network round trip.
+"""
+
+import hashlib
+import os
+import threading
+import time
+from pathlib import Path
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_MAX_AGE = 30 * 24 * 60 * 60
+
+
+def cache_key(puml_text: str, renderer: str) -> str:
+    """Return the content hash identifying one rendered diagram."""
+    digest = hashlib.sha256()
+    digest.update(renderer.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(puml_text.encode("utf-8"))
+    return digest.hexdigest()
+
+
+class SvgCache:
+    """On-disk SVG store with size- and age-based eviction."""
+
+    def __init__(self, cache_dir, max_bytes=DEFAULT_MAX_BYTES, max_age=DEFAULT_MAX_AGE):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.hits = 0
+        self.misses = 0
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.svg"
+
+    def get(self, puml_text: str, renderer: str):
+        """Return the cached SVG for this source/renderer pair, or None."""
+        path = self._entry_path(cache_key(puml_text, renderer))
+        try:
+            svg = path.read_text(encoding="utf-8")
+        except OSError:
+            self.misses += 1
+            return None
+
+        # mtime doubles as "last used" so eviction drops the coldest entries first
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
+        self.hits += 1
+        return svg
+
+    def put(self, puml_text: str, renderer: str, svg: str):
+        """Store a rendered SVG; write failures only disable caching for this entry."""
+        path = self._entry_path(cache_key(puml_text, renderer))
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path.write_text(svg, encoding="utf-8")
+            os.replace(tmp_path, path)
+        except OSError:
+            tmp_path.unlink(missing_ok=True)
+
+    def _entries(self):
+        if not self.cache_dir.exists():
+            return []
+        entries = []
+        for path in self.cache_dir.glob("*/*.svg"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def evict(self):
+        """Drop entries older than max_age, then least recently used ones until under max_bytes."""
+        now = time.time()
+        kept = []
+        removed = 0
+        for mtime, size, path in self._entries():
+            if self.max_age is not None and now - mtime > self.max_age:
+                path.unlink(missing_ok=True)
+                removed += 1
+            else:
+                kept.append((mtime, size, path))
+
+        if self.max_bytes is not None:
+            total = sum(size for _, size, _ in kept)
+            kept.sort()
+            for mtime, size, path in kept:
+                if total <= self.max_bytes:
+                    break
+                path.unlink(missing_ok=True)
+                total -= size
+                removed += 1
+        return removed
+
+    def purge(self):
+        """Remove every cached entry."""
+        removed = 0
+        for _, _, path in self._entries():
+            path.unlink(missing_ok=True)
+            removed += 1
+        return removed
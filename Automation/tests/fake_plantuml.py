@@ -0,0 +1,26 @@
+#!/usr/bin/env python3
+"""Stand-in for `plantuml -pipe`: answers each @startuml..@enduml block with a tiny SVG.
+
+A diagram containing `die` makes the process exit without answering, one
+containing `hang` makes it stop responding.
+"""
+
+import os
+import sys
+import time
+
+delimiter = sys.argv[sys.argv.index("-pipedelimitor") + 1]
+block = []
+for line in sys.stdin:
+    block.append(line)
+    if not line.strip().startswith("@enduml"):
+        continue
+    text = "".join(block)
+    block = []
+    if "die" in text:
+        sys.exit(3)
+    if "hang" in text:
+        time.sleep(60)
+    sys.stdout.write(f'<svg xmlns="http://www.w3.org/2000/svg"><text>{os.getpid()}:{len(text)}</text></svg>\n')
+    sys.stdout.write(delimiter + "\n")
+    sys.stdout.flush()
@@ -0,0 +1,141 @@
+"""The build manifest, and incremental builds regenerating only pages whose inputs changed."""
+
+import contextlib
+import io
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import docs_builder  # noqa: E402
+from build_manifest import MANIFEST_FORMAT, BuildManifest  # noqa: E402
+
+HIGH_LEVEL = """\
+- id: REQ-1
+  name: One
+  status: Draft
+  description: d
+- id: REQ-2
+  name: Two
+  status: Draft
+  description: d
+"""
+
+SOFTWARE = """\
+- id: REQ-SW-1
+  name: First
+  status: Draft
+  refines: REQ-1
+  description: d
+- id: REQ-SW-2
+  name: Second
+  status: Draft
+  refines: REQ-2
+  description: d
+"""
+
+
+class BuildManifestTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.build_path = Path(self.tmp.name)
+        (self.build_path / "page.html").write_text("page", encoding="utf-8")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_inputs_digest(self):
+        manifest = BuildManifest(self.build_path)
+        manifest.record("page.html", {"a": 1, "b": "x"})
+        manifest.save()
+
+        reloaded = BuildManifest(self.build_path)
+        self.assertTrue(reloaded.is_current("page.html", {"b": "x", "a": 1}))
+        self.assertFalse(reloaded.is_current("page.html", {"a": 2, "b": "x"}))
+        self.assertFalse(reloaded.is_current("other.html", {"a": 1, "b": "x"}))
+
+    def test_deleted_page_is_not_current(self):
+        manifest = BuildManifest(self.build_path)
+        manifest.record("page.html", {"a": 1})
+        (self.build_path / "page.html").unlink()
+        self.assertFalse(manifest.is_current("page.html", {"a": 1}))
+
+    def test_prune_removes_pages_no_longer_built(self):
+        (self.build_path / "old.html").write_text("old", encoding="utf-8")
+        manifest = BuildManifest(self.build_path)
+        manifest.record("page.html", {"a": 1})
+        manifest.record("old.html", {"a": 1})
+        self.assertEqual(manifest.prune({"page.html"}), ["old.html"])
+        self.assertFalse((self.build_path / "old.html").exists())
+        self.assertTrue((self.build_path / "page.html").exists())
+        self.assertEqual(list(manifest.pages), ["page.html"])
+
+    def test_corrupt_or_old_manifest_starts_empty(self):
+        manifest = BuildManifest(self.build_path)
+        for content in ("{not json", json.dumps({"format": MANIFEST_FORMAT - 1, "pages": {"page.html": {}}}),
+                        json.dumps(["page.html"])):
+            with self.subTest(content=content):
+                manifest.path.write_text(content, encoding="utf-8")
+                self.assertEqual(BuildManifest(self.build_path).pages, {})
+
+
+class IncrementalBuildTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.docs_path = Path(self.tmp.name) / "Docs"
+        self.requirements = self.docs_path / "requirements"
+        self.requirements.mkdir(parents=True)
+        (self.requirements / "high_level_requirements.yaml").write_text(HIGH_LEVEL, encoding="utf-8")
+        (self.requirements / "software_requirements.yaml").write_text(SOFTWARE, encoding="utf-8")
+        self.build_path = self.docs_path / "build"
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def build(self, **options):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return docs_builder.build_docs(self.docs_path, **options)
+
+    def page_times(self):
+        return {path.name: path.stat().st_mtime_ns for path in self.build_path.glob("*.html")}
+
+    def test_unchanged_build_regenerates_nothing(self):
+        first = self.build()
+        self.assertEqual(first["regenerated"], first["pages"])
+        second = self.build()
+        self.assertEqual((second["regenerated"], second["written"]), (0, 0))
+
+    def test_one_input_regenerates_its_pages_only(self):
+        self.build()
+        before = self.page_times()
+        path = self.requirements / "software_requirements.yaml"
+        path.write_text(SOFTWARE.replace("name: Second", "name: Renamed"), encoding="utf-8")
+
+        result = self.build()
+        self.assertEqual(result["regenerated"], 1)
+        after = self.page_times()
+        self.assertEqual([name for name in after if after[name] != before[name]], ["software.html"])
+        self.assertIn("Renamed", (self.build_path / "software.html").read_text(encoding="utf-8"))
+
+    def test_corrupt_manifest_rebuilds_everything(self):
+        self.build()
+        (self.build_path / ".manifest.json").write_text("{not json", encoding="utf-8")
+        result = self.build()
+        self.assertEqual(result["regenerated"], result["pages"])
+        self.assertEqual(self.build()["regenerated"], 0)
+
+    def test_layout_change_removes_stale_pages(self):
+        self.build(shard_mode="parent", page_size=1)
+        shards = {path.name for path in self.build_path.glob("software-*.html")}
+        self.assertTrue(shards)
+        self.build()
+        self.assertEqual({path.name for path in self.build_path.glob("software-*.html")}, set())
+        manifest = BuildManifest(self.build_path)
+        self.assertTrue(shards.isdisjoint(manifest.pages))
+
+
+if __name__ == "__main__":
+    unittest.main()
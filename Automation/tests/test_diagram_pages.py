@@ -0,0 +1,50 @@
+"""Diagram titles and PUML text are escaped in fallback assets and diagram pages."""
+
+import contextlib
+import io
+import sys
+import tempfile
+import unittest
+import xml.etree.ElementTree as ElementTree
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import docs_builder  # noqa: E402
+from render_backend import RenderBackend, RenderError  # noqa: E402
+
+
+class FailingBackend(RenderBackend):
+    identity = "failing"
+
+    def render(self, puml_text):
+        raise RenderError("server down")
+
+
+class EscapingTest(unittest.TestCase):
+    def test_fallback_svg_is_well_formed(self):
+        svg = docs_builder.fallback_svg("A & B <script>")
+        text = ElementTree.fromstring(svg).find("{http://www.w3.org/2000/svg}text").text
+        self.assertEqual(text, "A & B <script>: not rendered")
+
+    def test_unrendered_diagram_pages(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            docs_path = Path(tmp) / "Docs"
+            architecture = docs_path / "architecture"
+            architecture.mkdir(parents=True)
+            (architecture / "a&b<i>.puml").write_text("@startuml\nclass Foo <<interface>>\n@enduml\n",
+                                                       encoding="utf-8")
+            with contextlib.redirect_stdout(io.StringIO()):
+                docs_builder.build_docs(docs_path, backend=FailingBackend())
+            build_path = docs_path / "build"
+            (svg_path,) = (build_path / docs_builder.DIAGRAM_ASSET_DIR).glob("*.svg")
+            ElementTree.fromstring(svg_path.read_text(encoding="utf-8"))
+            page = (build_path / svg_path.with_suffix(".html").name).read_text(encoding="utf-8")
+            self.assertIn("&lt;&lt;interface&gt;&gt;", page)
+            self.assertIn("A&amp;B&lt;I&gt; Diagram", page)
+            self.assertNotIn("<i>", page)
+            self.assertNotIn("<I>", (build_path / "architecture.html").read_text(encoding="utf-8"))
+
+
+if __name__ == "__main__":
+    unittest.main()
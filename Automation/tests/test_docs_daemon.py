@@ -0,0 +1,58 @@
+"""Who may use the build daemon's socket and which requests it refuses."""
+
+import os
+import stat
+import sys
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import docs_daemon  # noqa: E402
+
+
+class DaemonAccessTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.docs_path = Path(self.tmp.name) / "Docs"
+        (self.docs_path / "requirements").mkdir(parents=True)
+        self.socket_path = Path(self.tmp.name) / "builder.sock"
+        self.daemon = docs_daemon.BuildDaemon(self.socket_path, self.docs_path)
+        self.thread = threading.Thread(target=self.daemon.serve_forever, daemon=True)
+        self.thread.start()
+
+    def tearDown(self):
+        self.daemon.shutdown()
+        self.thread.join()
+        self.daemon.close()
+        self.tmp.cleanup()
+
+    def build(self, *argv):
+        return docs_daemon.send_request(self.socket_path, {"command": "build", "argv": list(argv)}, timeout=30)
+
+    def test_socket_is_private(self):
+        self.assertEqual(stat.S_IMODE(os.stat(self.socket_path).st_mode), 0o600)
+
+    def test_refuses_executables_and_outside_paths(self):
+        # The project is the folder holding Docs
+        outside = Path(self.tmp.name).parent / f"{Path(self.tmp.name).name}-elsewhere.sqlite"
+        for argv in (["--renderer", "local", "--plantuml-cmd", "touch pwned"],
+                     ["--trace-db", str(outside)],
+                     ["--trace-db", "../../../x.sqlite"],
+                     ["--trace-file", str(outside)]):
+            with self.subTest(argv=argv):
+                reply = self.build(*argv)
+                self.assertEqual(reply["status"], 2)
+                self.assertTrue(reply["refused"])
+        self.assertFalse(outside.exists())
+
+    def test_runs_builds_inside_the_project(self):
+        reply = self.build("--check-only", "--trace-db", "trace.sqlite")
+        self.assertNotIn("refused", reply)
+        self.assertIn('"ok"', reply["output"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+"""The preview server's responses, and which pages the live reload script reloads (in node, against a stub DOM)."""
+
+import gzip
+import http.client
+import json
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import docs_server  # noqa: E402
+from build_manifest import BuildManifest  # noqa: E402
+
+HARNESS = """
+var reloaded = false, listener = null;
+var location = {pathname: PATHNAME, origin: "http://localhost:8000", href: "http://localhost:8000" + PATHNAME,
+                reload: function () { reloaded = true; }};
+var document = {querySelectorAll: function () {
+  return NODES.map(function (attrs) { return {getAttribute: function (name) { return attrs[name] || null; }}; });
+}};
+function EventSource() { this.addEventListener = function (name, callback) { listener = callback; }; }
+SCRIPT
+listener({data: JSON.stringify(CHANGED)});
+console.log(JSON.stringify(reloaded));
+"""
+
+
+@unittest.skipUnless(shutil.which("node"), "node is not installed")
+class ReloadScriptTest(unittest.TestCase):
+    def reloads(self, pathname, nodes, changed) -> bool:
+        script = docs_server.RELOAD_SCRIPT.replace("<script>", "").replace("</script>", "")
+        source = (HARNESS.replace("PATHNAME", json.dumps(pathname)).replace("NODES", json.dumps(nodes))
+                  .replace("CHANGED", json.dumps(changed)).replace("SCRIPT", script))
+        output = subprocess.run(["node", "-e", source], capture_output=True, text=True, check=True).stdout
+        return json.loads(output)
+
+    def test_search_shards_only_reload_the_search_page(self):
+        page = [{"href": "styles.abc.css"}]
+        search = page + [{"src": "search/index.js"}, {"src": "search/terms-mo.js"}]
+        changed = ["search/index.js", "search/terms-mo.js"]
+        self.assertFalse(self.reloads("/software.html", page, changed))
+        self.assertTrue(self.reloads("/search.html", search, changed))
+        self.assertFalse(self.reloads("/search.html", search, ["search/terms-zz.js"]))
+
+    def test_own_page_and_shared_assets(self):
+        page = [{"href": "styles.abc.css"}, {"src": "diagrams/runtime.svg"}, {"href": "https://cdn.example/x.css"}]
+        self.assertTrue(self.reloads("/runtime.html", page, ["runtime.html"]))
+        self.assertTrue(self.reloads("/", page, ["index.html"]))
+        self.assertTrue(self.reloads("/runtime.html", page, ["styles.abc.css"]))
+        self.assertTrue(self.reloads("/runtime.html", page, ["diagrams/runtime.svg"]))
+        self.assertFalse(self.reloads("/runtime.html", page, ["diagrams/class.svg", "class.html"]))
+        self.assertFalse(self.reloads("/runtime.html", page, ["x.css"]))
+
+
+class DocsServerTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        build_path = Path(self.tmp.name)
+        inputs = {"builder": 1, "template": "abc"}
+        manifest = BuildManifest(build_path)
+        for page, title in (("index.html", "Home"), ("search.html", "Search")):
+            (build_path / page).write_text(f"<html><body><h1>{title}</h1>{'<p>text</p>' * 100}</body></html>",
+                                           encoding="utf-8")
+            # index.html and search.html are built from the same inputs
+            manifest.record(page, inputs)
+        manifest.save()
+        self.server = docs_server.DocsServer(build_path, port=0)
+        self.server.start()
+
+    def tearDown(self):
+        self.server.stop()
+        self.tmp.cleanup()
+
+    def get(self, path, **headers):
+        connection = http.client.HTTPConnection(*self.server.server_address[:2], timeout=5)
+        try:
+            connection.request("GET", path, headers=headers)
+            response = connection.getresponse()
+            return response, response.read()
+        finally:
+            connection.close()
+
+    def test_ok_and_not_modified(self):
+        response, body = self.get("/index.html")
+        self.assertEqual(response.status, 200)
+        self.assertIn(b"<h1>Home</h1>", body)
+        self.assertIn(docs_server.RELOAD_PATH.encode("utf-8"), body)
+        etag = response.getheader("ETag")
+        response, body = self.get("/index.html", **{"If-None-Match": etag})
+        self.assertEqual((response.status, body), (304, b""))
+
+    def test_pages_with_the_same_inputs_differ(self):
+        home, home_body = self.get("/index.html")
+        search, search_body = self.get("/search.html", **{"If-None-Match": home.getheader("ETag")})
+        self.assertEqual(search.status, 200)
+        self.assertNotEqual(home.getheader("ETag"), search.getheader("ETag"))
+        self.assertIn(b"<h1>Search</h1>", search_body)
+        self.assertIn(b"<h1>Home</h1>", self.get("/")[1])
+
+    def test_gzip_negotiation(self):
+        plain, plain_body = self.get("/search.html")
+        response, body = self.get("/search.html", **{"Accept-Encoding": "gzip"})
+        self.assertEqual(response.getheader("Content-Encoding"), "gzip")
+        self.assertEqual(gzip.decompress(body), plain_body)
+        self.assertNotEqual(response.getheader("ETag"), plain.getheader("ETag"))
+        response, _ = self.get("/search.html", **{"Accept-Encoding": "gzip;q=0"})
+        self.assertIsNone(response.getheader("Content-Encoding"))
+
+
+if __name__ == "__main__":
+    unittest.main()
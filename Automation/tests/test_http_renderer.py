@@ -0,0 +1,112 @@
+"""HttpRenderBackend retries, adaptive timeouts and circuit breaker against plantuml_stub_server."""
+
+import sys
+import time
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from plantuml_stub_server import start_stub_server  # noqa: E402
+from render_backend import (  # noqa: E402
+    CircuitBreaker, CircuitOpenError, HttpRenderBackend, LatencyTracker, RenderError,
+)
+
+DIAGRAM = "@startuml\nA -> B : hello\n@enduml\n"
+
+
+class StubServerTestCase(unittest.TestCase):
+    def start_server(self, **options):
+        server = start_stub_server(**options)
+        self.addCleanup(server.shutdown)
+        return server
+
+    def backend(self, server, **options):
+        backend = HttpRenderBackend(server.base_url, backoff=0, **options)
+        self.addCleanup(backend.close)
+        return backend
+
+
+class HttpRenderBackendTest(StubServerTestCase):
+    def test_transient_status_is_retried(self):
+        server = self.start_server(fail_first=1)
+        self.assertIn("<svg", self.backend(server, retries=1).render(DIAGRAM))
+
+    def test_timeout_is_retried_with_a_longer_timeout(self):
+        server = self.start_server(delay=0.3)
+        latency = LatencyTracker(initial_timeout=0.1, min_timeout=0.1, max_timeout=2.0, factor=3.0)
+        for _ in range(10):
+            latency.record(0.01)
+        backend = self.backend(server, retries=2, latency=latency)
+        self.assertAlmostEqual(latency.timeout(), 0.1)
+
+        self.assertIn("<svg", backend.render(DIAGRAM))
+        self.assertGreater(latency.timeout(), 0.3)
+        self.assertEqual(backend.breaker.consecutive_failures, 0)
+
+    def test_timeouts_count_against_the_breaker(self):
+        server = self.start_server(delay=0.5)
+        breaker = CircuitBreaker(failure_threshold=1)
+        latency = LatencyTracker(initial_timeout=0.05, min_timeout=0.05, max_timeout=0.05)
+        backend = self.backend(server, retries=1, breaker=breaker, latency=latency)
+        with self.assertRaisesRegex(RenderError, "gave up after 2 attempt"):
+            backend.render(DIAGRAM)
+        self.assertTrue(breaker.is_open)
+        self.assertEqual(len(latency.samples), 2)
+
+
+class TrippedInFlight(CircuitBreaker):
+    """Another render opens the breaker right after this one is let through."""
+
+    def allow(self):
+        allowed = super().allow()
+        self.record_failure()
+        return allowed
+
+
+class CircuitBreakerTest(StubServerTestCase):
+    def test_open_breaker_skips_the_server(self):
+        server = self.start_server(fail_first=2)
+        breaker = CircuitBreaker(failure_threshold=2, reset_after=60)
+        backend = self.backend(server, retries=0, breaker=breaker)
+        for _ in range(2):
+            with self.assertRaisesRegex(RenderError, "gave up after 1 attempt"):
+                backend.render(DIAGRAM)
+        self.assertEqual(server.request_count, 2)
+
+        with self.assertRaises(CircuitOpenError):
+            backend.render(DIAGRAM)
+        self.assertEqual(server.request_count, 2)
+
+    def test_half_open_lets_one_probe_through(self):
+        server = self.start_server(fail_first=1)
+        breaker = CircuitBreaker(failure_threshold=1, reset_after=0.2)
+        backend = self.backend(server, retries=0, breaker=breaker)
+        with self.assertRaises(RenderError):
+            backend.render(DIAGRAM)
+        with self.assertRaises(CircuitOpenError):
+            backend.render(DIAGRAM)
+
+        time.sleep(0.25)
+        # The probe is let through; everyone else waits for its outcome
+        self.assertTrue(breaker.allow())
+        self.assertFalse(breaker.allow())
+        with self.assertRaises(CircuitOpenError):
+            backend.render(DIAGRAM)
+        self.assertEqual(server.request_count, 1)
+
+        time.sleep(0.25)
+        self.assertIn("<svg", backend.render(DIAGRAM))
+        self.assertFalse(breaker.is_open)
+        self.assertEqual(server.request_count, 2)
+
+    def test_attempts_stop_when_another_render_opens_the_breaker(self):
+        server = self.start_server(fail_first=5)
+        backend = self.backend(server, retries=3, breaker=TrippedInFlight(failure_threshold=1))
+        with self.assertRaisesRegex(RenderError, "gave up after 1 attempt"):
+            backend.render(DIAGRAM)
+        self.assertEqual(server.request_count, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+"""LocalPipeRenderBackend against a fake `-pipe` renderer (tests/fake_plantuml.py)."""
+
+import sys
+import time
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from render_backend import LocalPipeRenderBackend, RenderError  # noqa: E402
+
+FAKE_RENDERER = [sys.executable, str(Path(__file__).resolve().parent / "fake_plantuml.py")]
+DIAGRAM = "@startuml\nA -> B : hello\n@enduml\n"
+
+
+def rendered_pid(svg):
+    return int(svg.split("<text>")[1].split(":")[0])
+
+
+class LocalPipeRenderBackendTest(unittest.TestCase):
+    def setUp(self):
+        self.backend = LocalPipeRenderBackend(FAKE_RENDERER, pool_size=1, timeout=5.0)
+
+    def tearDown(self):
+        self.backend.close()
+
+    def test_renders_with_one_persistent_process(self):
+        first = self.backend.render(DIAGRAM)
+        second = self.backend.render(DIAGRAM.replace("hello", "again"))
+        self.assertTrue(first.startswith("<svg"))
+        self.assertEqual(rendered_pid(first), rendered_pid(second))
+
+    def test_dead_worker_is_restarted(self):
+        pid = rendered_pid(self.backend.render(DIAGRAM))
+        with self.assertRaisesRegex(RenderError, "exited"):
+            self.backend.render("@startuml\ndie\n@enduml\n")
+        self.assertNotEqual(rendered_pid(self.backend.render(DIAGRAM)), pid)
+
+    def test_timed_out_render_kills_the_worker(self):
+        self.backend.timeout = 0.5
+        self.backend.render(DIAGRAM)
+        process = self.backend._workers[0].process
+        start = time.monotonic()
+        with self.assertRaisesRegex(RenderError, "timed out"):
+            self.backend.render("@startuml\nhang\n@enduml\n")
+        self.assertLess(time.monotonic() - start, 1.5)
+        self.assertIsNotNone(process.poll())
+        self.assertIsNone(self.backend._workers[0].process)
+        self.backend.timeout = 5.0
+        self.assertTrue(self.backend.render(DIAGRAM).startswith("<svg"))
+
+    def test_close_reaps_every_process(self):
+        backend = LocalPipeRenderBackend(FAKE_RENDERER, pool_size=3, timeout=5.0)
+        for worker in backend._workers:
+            worker.render(DIAGRAM, backend.timeout)
+        processes = [worker.process for worker in backend._workers]
+        backend.close()
+        for process in processes:
+            self.assertIsNotNone(process.returncode)
+        self.assertTrue(all(worker.process is None for worker in backend._workers))
+
+    def test_missing_executable_is_a_render_error(self):
+        backend = LocalPipeRenderBackend(["/nonexistent/plantuml"], pool_size=1)
+        with self.assertRaisesRegex(RenderError, "not found"):
+            backend.render(DIAGRAM)
+        backend.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,145 @@
+"""Shard plans of page_shards, and links between sharded requirement pages."""
+
+import contextlib
+import io
+import re
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import docs_builder  # noqa: E402
+from page_shards import page_map, plan_shards, shard_slug  # noqa: E402
+from requirement_model import RequirementStore  # noqa: E402
+from traceability import TraceGraph  # noqa: E402
+
+STATUSES = ["Draft", "Finished", "In Progress", "Custom"]
+
+
+def high_level(count):
+    return [{"id": f"REQ-{i}", "name": f"High {i}", "status": "Draft", "description": "d"} for i in range(count)]
+
+
+def software(count, parents):
+    return [
+        {
+            "id": f"REQ-SW-{i}",
+            "name": f"Software {i}",
+            "status": STATUSES[i % len(STATUSES)],
+            "description": "d",
+            # Every fifth requirement refines nothing
+            **({"refines": [f"REQ-{i % parents}"]} if i % 5 else {}),
+        }
+        for i in range(count)
+    ]
+
+
+def to_yaml(items):
+    lines = []
+    for item in items:
+        lines.append(f"- id: {item['id']}")
+        for key in ("name", "status", "description"):
+            lines.append(f"  {key}: {item[key]}")
+        if "refines" in item:
+            lines.append(f"  refines: [{', '.join(item['refines'])}]")
+    return "\n".join(lines) + "\n"
+
+
+class PlanShardsTest(unittest.TestCase):
+    def setUp(self):
+        self.high = RequirementStore.from_items(high_level(3))
+        self.software = RequirementStore.from_items(software(20, 3))
+        self.graph = TraceGraph.build([("high_level", high_level(3)), ("software", software(20, 3))])
+
+    def assert_partition(self, shards, store):
+        indices = [index for shard in shards for index in shard.indices]
+        self.assertEqual(sorted(indices), list(range(len(store))))
+        self.assertEqual(len({shard.page for shard in shards}), len(shards))
+
+    def test_none_and_empty(self):
+        self.assertEqual(plan_shards("software", self.software, "none"), [])
+        self.assertEqual(plan_shards("software", RequirementStore.from_items([]), "size"), [])
+
+    def test_size(self):
+        shards = plan_shards("software", self.software, "size", page_size=6)
+        self.assertEqual([len(shard.indices) for shard in shards], [6, 6, 6, 2])
+        self.assertEqual([shard.page for shard in shards][:2], ["software-1.html", "software-2.html"])
+        self.assertEqual(shards[0].label, "REQ-SW-0 – REQ-SW-5")
+        self.assert_partition(shards, self.software)
+
+    def test_status_in_workflow_order(self):
+        shards = plan_shards("software", self.software, "status", page_size=100)
+        self.assertEqual([shard.page for shard in shards], [
+            "software-draft.html", "software-in-progress.html", "software-finished.html", "software-custom.html",
+        ])
+        self.assert_partition(shards, self.software)
+
+    def test_parent_groups_are_split_by_page_size(self):
+        shards = plan_shards("software", self.software, "parent", page_size=3, graph=self.graph)
+        self.assert_partition(shards, self.software)
+        pages = page_map(shards, self.software)
+        for req_id, page in pages.items():
+            parents = self.graph.parents_of(req_id)
+            expected = f"software-{shard_slug(parents[0])}" if parents else "software-unlinked"
+            self.assertTrue(page.startswith(expected), (req_id, page))
+        self.assertTrue(all(len(shard.indices) <= 3 for shard in shards))
+        self.assertEqual(shards[-1].label.split(" (")[0], "Unlinked")
+
+    def test_parent_on_the_top_level_falls_back_to_size(self):
+        shards = plan_shards("high_level", self.high, "parent", page_size=2, graph=self.graph)
+        self.assertEqual([shard.page for shard in shards], ["high_level-1.html", "high_level-2.html"])
+
+    def test_colliding_slugs_get_distinct_pages(self):
+        items = [{"id": "A B", "name": "n", "status": "Draft", "description": "d"},
+                 {"id": "A-B", "name": "n", "status": "Draft", "description": "d"},
+                 {"id": "X", "name": "n", "status": "Draft", "refines": ["A B"], "description": "d"},
+                 {"id": "Y", "name": "n", "status": "Draft", "refines": ["A-B"], "description": "d"}]
+        store = RequirementStore.from_items(items[2:])
+        graph = TraceGraph.build([("high_level", items[:2]), ("software", items[2:])])
+        shards = plan_shards("software", store, "parent", graph=graph)
+        self.assertEqual([shard.page for shard in shards], ["software-A-B.html", "software-A-B~2.html"])
+
+
+class ShardedBuildLinksTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.docs_path = Path(self.tmp.name) / "Docs"
+        requirements = self.docs_path / "requirements"
+        requirements.mkdir(parents=True)
+        (requirements / "high_level_requirements.yaml").write_text(to_yaml(high_level(4)), encoding="utf-8")
+        (requirements / "software_requirements.yaml").write_text(to_yaml(software(30, 4)), encoding="utf-8")
+        self.build_path = self.docs_path / "build"
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def build(self, mode, page_size):
+        with contextlib.redirect_stdout(io.StringIO()):
+            docs_builder.build_docs(self.docs_path, shard_mode=mode, page_size=page_size)
+        anchors = {path.name: set(re.findall(r'id="([^"]+)"', path.read_text(encoding="utf-8")))
+                   for path in self.build_path.glob("*.html")}
+        links = [
+            (path.name, page, anchor)
+            for path in self.build_path.glob("*.html")
+            for page, anchor in re.findall(r'href="([^"#:]+\.html)(?:#([^"]*))?"', path.read_text(encoding="utf-8"))
+        ]
+        return anchors, links
+
+    def test_every_link_reaches_its_anchor(self):
+        for mode, page_size in (("parent", 3), ("size", 7), ("status", 4), ("none", 500)):
+            with self.subTest(mode=mode):
+                anchors, links = self.build(mode, page_size)
+                broken = [link for link in links
+                          if link[1] not in anchors or (link[2] and link[2] not in anchors[link[1]])]
+                self.assertEqual(broken, [])
+                # Each requirement is defined on exactly one page, the one links point at
+                for req_id in ("REQ-SW-7", "REQ-2"):
+                    homes = [page for page, ids in anchors.items() if req_id in ids]
+                    self.assertEqual(len(homes), 1)
+                    self.assertEqual({page for _, page, anchor in links if anchor == req_id}, set(homes))
+
+
+if __name__ == "__main__":
+    unittest.main()
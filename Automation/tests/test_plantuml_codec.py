@@ -0,0 +1,53 @@
+"""Round-trip and reference-equality properties of plantuml_codec."""
+
+import random
+import sys
+import unittest
+from pathlib import Path
+
+AUTOMATION_PATH = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(AUTOMATION_PATH))
+sys.path.insert(0, str(AUTOMATION_PATH / "benchmarks"))
+
+import plantuml_codec  # noqa: E402
+from bench_plantuml_codec import legacy_encode, synthetic_class_diagram  # noqa: E402
+
+
+def random_text(rng, max_len):
+    alphabet = "@startuml enduml ->:{}[]()\n\tčćšđž日本 ABCxyz0123456789"
+    return "".join(rng.choice(alphabet) for _ in range(rng.randint(0, max_len)))
+
+
+class PlantumlCodecTest(unittest.TestCase):
+    def setUp(self):
+        self.rng = random.Random(1)
+
+    def assert_round_trip(self, text):
+        encoded = plantuml_codec.encode(text)
+        self.assertEqual(encoded, legacy_encode(text), f"encoder mismatch for {len(text)} chars")
+        self.assertEqual(plantuml_codec.decode(encoded), text, f"round-trip mismatch for {len(text)} chars")
+
+    def test_random_text(self):
+        for _ in range(300):
+            self.assert_round_trip(random_text(self.rng, 2000))
+
+    def test_empty_text(self):
+        self.assert_round_trip("")
+
+    def test_repository_diagrams(self):
+        for path in (AUTOMATION_PATH.parent / "Docs").rglob("*.puml"):
+            with self.subTest(path=path.name):
+                self.assert_round_trip(path.read_text(encoding="utf-8"))
+
+    def test_large_diagram(self):
+        self.assert_round_trip(synthetic_class_diagram(300_000, seed=1))
+
+    def test_byte_mapping_every_remainder(self):
+        for length in range(64):
+            data = bytes(self.rng.randrange(256) for _ in range(length))
+            with self.subTest(length=length):
+                self.assertEqual(plantuml_codec.decode_bytes(plantuml_codec.encode_bytes(data)), data)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,50 @@
+"""Minifiers and the size report of postprocess."""
+
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import docs_builder  # noqa: E402
+import postprocess  # noqa: E402
+
+
+class MinifyTest(unittest.TestCase):
+    def test_css(self):
+        css = "/* c */ nav :hover ,  a > b { color : red ;  margin: 0 ; }\n@media (max-width: 600px) { p { x: y } }"
+        self.assertEqual(postprocess.minify_css(css),
+                         "nav :hover,a>b{color:red;margin:0}@media (max-width:600px){p{x:y}}")
+
+    def test_css_strings_are_kept(self):
+        css = 'a::before { content : "a , b : c /* x */ ; }" ; }  div  p:hover { quotes: \'{\' "}" }'
+        self.assertEqual(postprocess.minify_css(css),
+                         'a::before{content:"a , b : c /* x */ ; }"}div p:hover{quotes:\'{\' "}"}')
+
+    def test_builder_stylesheet_uses_the_same_minifier(self):
+        self.assertIs(docs_builder.minify_css, postprocess.minify_css)
+        _, css = docs_builder.stylesheet_asset()
+        self.assertEqual(postprocess.minify_css(css), css)
+
+    def test_html_keeps_space_around_inline_elements(self):
+        html = "<div>\n  <p>Search <input type=search> now <svg><g/></svg> done</p>\n</div>"
+        self.assertEqual(postprocess.minify_html(html),
+                         "<div><p>Search <input type=search> now <svg><g/></svg> done</p></div>")
+
+
+class ReportTest(unittest.TestCase):
+    def test_groups_are_one_line(self):
+        results = [("index.html", {"original": 4000, "minified": 3000, "gzip": 1000, "br": None})]
+        results += [(f"search/terms-{i}.js", {"original": 300, "minified": 300, "gzip": 200 if i else None, "br": None})
+                    for i in range(50)]
+        report = postprocess.format_report(results, groups=("search",)).splitlines()
+        self.assertEqual(len(report), 4)
+        self.assertTrue(report[2].startswith("search/ (50 files)"))
+        # 49 gzipped shards plus one served minified
+        self.assertIn(postprocess._kb(49 * 200 + 300), report[2])
+        self.assertIn("Post-processed 51 artifact(s)", report[3])
+        self.assertIn(postprocess._kb(1000 + 49 * 200 + 300), report[3])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+"""Include expansion, cycles, missing files and the closure digest of puml_includes."""
+
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from puml_includes import IncludeResolver  # noqa: E402
+
+
+class IncludeResolverTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        self.write("shared/colors.iuml", "skinparam backgroundColor White\n")
+        self.write("shared/style.iuml", "!include colors.iuml\nskinparam shadowing false\n")
+        self.write("parts.iuml", "!startsub ACTORS\nactor User\n!endsub\n!startsub OTHER\nactor Admin\n!endsub\n")
+        self.write("blocks.iuml", "@startuml\nclass First\n@enduml\n@startuml(id=second)\nclass Second\n@enduml\n")
+        self.write("login.puml", "@startuml\n!include shared/style.iuml\n!includesub parts.iuml!ACTORS\n"
+                                 "User -> System : login\n@enduml\n")
+        self.write("report.puml", "@startuml\n!include parts.iuml\nSystem -> DB : query\n@enduml\n")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, relative, text):
+        path = self.root / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding="utf-8")
+        return path
+
+    def edit(self, relative, text):
+        # A later mtime, so the resolver's mtime/size memo cannot hide the edit
+        path = self.write(relative, text)
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    def test_nested_includes_and_selectors(self):
+        text, closure, errors = IncludeResolver().expand(self.root / "login.puml")
+        self.assertEqual(errors, [])
+        self.assertEqual(text, "@startuml\nskinparam backgroundColor White\nskinparam shadowing false\n"
+                               "actor User\nUser -> System : login\n@enduml\n")
+        self.assertEqual({path.relative_to(self.root).as_posix() for path in closure},
+                         {"login.puml", "shared/style.iuml", "shared/colors.iuml", "parts.iuml"})
+
+    def test_block_selectors(self):
+        self.write("pick.puml", "@startuml\n!include blocks.iuml!1\n!include blocks.iuml!second\n"
+                                "!include blocks.iuml\n@enduml\n")
+        text, _, errors = IncludeResolver().expand(self.root / "pick.puml")
+        self.assertEqual(errors, [])
+        self.assertEqual(text.splitlines()[1:4], ["class Second", "class Second", "class First"])
+
+    def test_include_once(self):
+        self.write("twice.puml", "@startuml\n!include_once shared/colors.iuml\n!include_once shared/colors.iuml\n@enduml\n")
+        text, _, _ = IncludeResolver().expand(self.root / "twice.puml")
+        self.assertEqual(text.count("backgroundColor"), 1)
+
+    def test_cycle_reports_the_chain(self):
+        self.write("a.iuml", "!include b.iuml\n")
+        self.write("b.iuml", "!include a.iuml\n")
+        self.write("loop.puml", "@startuml\n!include a.iuml\n@enduml\n")
+        _, _, errors = IncludeResolver().expand(self.root / "loop.puml")
+        self.assertEqual(errors, ["include cycle: loop.puml -> a.iuml -> b.iuml -> a.iuml"])
+
+    def test_missing_file_and_selector(self):
+        self.write("broken.puml", "@startuml\n!include nope.iuml\n!includesub parts.iuml!NONE\n"
+                                  "!include blocks.iuml!7\n!include <C4/C4_Context>\n@enduml\n")
+        text, closure, errors = IncludeResolver().expand(self.root / "broken.puml")
+        self.assertEqual(len(errors), 3)
+        self.assertTrue(errors[0].startswith("cannot include nope.iuml from broken.puml"))
+        self.assertEqual(errors[1], "no '!startsub NONE' in parts.iuml")
+        self.assertEqual(errors[2], "blocks.iuml has no diagram block 7")
+        # Standard library includes are left for PlantUML
+        self.assertIn("!include <C4/C4_Context>", text)
+        self.assertIsNone(closure[self.root / "nope.iuml"])
+
+    def test_closure_digest_follows_transitive_includes(self):
+        resolver = IncludeResolver()
+        login = resolver.closure_digest(self.root / "login.puml")
+        report = resolver.closure_digest(self.root / "report.puml")
+
+        self.edit("shared/colors.iuml", "skinparam backgroundColor Black\n")
+        self.assertNotEqual(resolver.closure_digest(self.root / "login.puml"), login)
+        self.assertEqual(resolver.closure_digest(self.root / "report.puml"), report)
+
+    def test_closure_digest_changes_when_a_missing_include_appears(self):
+        self.write("later.puml", "@startuml\n!include later.iuml\n@enduml\n")
+        resolver = IncludeResolver()
+        before = resolver.closure_digest(self.root / "later.puml")
+        self.write("later.iuml", "class Later\n")
+        self.assertNotEqual(resolver.closure_digest(self.root / "later.puml"), before)
+        self.assertIsNone(resolver.closure_digest(self.root / "gone.puml"))
+
+
+if __name__ == "__main__":
+    unittest.main()
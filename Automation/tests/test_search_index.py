@@ -0,0 +1,116 @@
+"""Shard layout and incremental writes of search_index."""
+
+import filecmp
+import random
+import sys
+import tempfile
+import unittest
+from collections import defaultdict
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import search_index  # noqa: E402
+from requirement_model import RequirementStore  # noqa: E402
+
+
+def keyed_shard_terms(postings, length, max_postings):
+    """The layout computed with shard_key at every depth (the original definition)."""
+    shards = {}
+    pending = [(length, list(postings))]
+    while pending:
+        length, terms = pending.pop()
+        groups = defaultdict(list)
+        for term in terms:
+            groups[search_index.shard_key(term, length)].append(term)
+        for key, group in groups.items():
+            weight = sum(len(postings[term]) + 1 for term in group)
+            if weight > max_postings and length < search_index.MAX_PREFIX_LENGTH and any(len(t) > length for t in group):
+                pending.append((length + 1, group))
+            else:
+                shards[key] = group
+    return shards
+
+
+def requirements(rng, count):
+    words = ["motor", "mođul", "senzor", "čvor", "ćelija", "req-sw", "日本", "status", "x-ray", "a_b"]
+    return [
+        {
+            "id": f"REQ-SW-{i:05d}",
+            "name": " ".join(rng.choice(words) for _ in range(3)),
+            "status": rng.choice(["draft", "approved"]),
+            "description": " ".join(rng.choice(words) + str(rng.randint(0, 50)) for _ in range(8)),
+        }
+        for i in range(count)
+    ]
+
+
+def anchor(req_id):
+    return f"software_requirements.html#{req_id}"
+
+
+class ShardTermsTest(unittest.TestCase):
+    def test_layout_matches_per_depth_keys(self):
+        rng = random.Random(3)
+        _, postings = search_index.build_index([("software", RequirementStore.from_items(requirements(rng, 800)))],
+                                               anchor)
+        for max_postings in (50, 400, 5000):
+            with self.subTest(max_postings=max_postings):
+                expected = keyed_shard_terms(postings, search_index.PREFIX_LENGTH, max_postings)
+                actual = search_index.shard_terms(postings, max_postings=max_postings)
+                self.assertEqual({k: sorted(v) for k, v in actual.items()},
+                                 {k: sorted(v) for k, v in expected.items()})
+
+
+class IncrementalWriteTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        self.items = requirements(random.Random(5), 3000)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, name, state=None):
+        levels = [("software", RequirementStore.from_items(self.items))]
+        return search_index.write_search_index(self.root / name, levels, anchor, None, state)
+
+    def assert_same_as_cold(self, incremental):
+        cold_name = f"cold{len(list(self.root.iterdir()))}"
+        self.write(cold_name)
+        left, right = self.root / incremental / "search", self.root / cold_name / "search"
+        self.assertEqual(sorted(p.name for p in left.iterdir()), sorted(p.name for p in right.iterdir()))
+        names = [p.name for p in right.iterdir()]
+        self.assertEqual(filecmp.cmpfiles(left, right, names, shallow=False)[1:], ([], []))
+
+    def test_edits_rewrite_only_changed_files(self):
+        state = {}
+        first = self.write("site", state)
+        self.assertEqual(first["written"], first["files"])
+
+        self.items[10]["description"] += " zzunique"
+        stats = self.write("site", state)
+        # The new term's shard, the edited term shards and the meta file; never the whole index
+        self.assertLess(stats["written"], stats["files"] // 2)
+        self.assert_same_as_cold("site")
+
+        self.items.insert(0, {"id": "REQ-HL-NEW", "name": "new", "status": "draft", "description": "fresh"})
+        self.write("site", state)
+        self.assert_same_as_cold("site")
+
+        del self.items[1:1500]
+        self.write("site", state)
+        self.assert_same_as_cold("site")
+
+    def test_state_is_ignored_when_the_index_is_gone(self):
+        state = {}
+        self.write("site", state)
+        for path in (self.root / "site" / "search").iterdir():
+            path.unlink()
+        stats = self.write("site", state)
+        self.assertEqual(stats["written"], stats["files"])
+        self.assert_same_as_cold("site")
+
+
+if __name__ == "__main__":
+    unittest.main()
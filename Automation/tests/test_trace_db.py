@@ -0,0 +1,74 @@
+"""The diagnostics table of the traceability database written by build_docs."""
+
+import contextlib
+import io
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import docs_builder  # noqa: E402
+import trace_db  # noqa: E402
+
+HIGH_LEVEL = """\
+- id: REQ-1
+  name: One
+  status: Draft
+  description: d
+"""
+
+SOFTWARE = """\
+- id: REQ-SW-1
+  name: Dangling
+  status: Draft
+  refines: REQ-NOPE
+  description: d
+- id: REQ-SW-2
+  name: Also dangling
+  status: Draft
+  refines: [REQ-1, REQ-GONE]
+  description: d
+- id: REQ-SW-3
+  name: Fine
+  status: Draft
+  refines: REQ-1
+  description: d
+"""
+
+
+class DiagnosticsTableTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.docs_path = Path(self.tmp.name) / "Docs"
+        requirements = self.docs_path / "requirements"
+        requirements.mkdir(parents=True)
+        (requirements / "high_level_requirements.yaml").write_text(HIGH_LEVEL, encoding="utf-8")
+        (requirements / "software_requirements.yaml").write_text(SOFTWARE, encoding="utf-8")
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.errors = docs_builder.build_docs(self.docs_path, trace_db=trace_db.TRACE_DB_NAME)["errors"]
+        self.db_path = self.docs_path / "build" / trace_db.TRACE_DB_NAME
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_one_row_per_dangling_requirement(self):
+        columns, rows = trace_db.run_query(self.db_path, "diagnostics", rule="dangling-refines")
+        found = [dict(zip(columns, row)) for row in rows]
+        self.assertEqual([(row["requirement"], row["file"]) for row in found], [
+            ("REQ-SW-1", "requirements/software_requirements.yaml"),
+            ("REQ-SW-2", "requirements/software_requirements.yaml"),
+        ])
+        self.assertTrue(all(row["severity"] == "error" for row in found))
+
+    def test_rows_match_build_errors(self):
+        _, rows = trace_db.run_query(self.db_path, "diagnostics")
+        self.assertEqual([row[-1] for row in rows], self.errors)
+        _, rows = trace_db.run_query(self.db_path, "diagnostics", requirement="REQ-SW-2")
+        self.assertEqual(len(rows), 1)
+        self.assertIn("REQ-GONE", rows[0][-1])
+
+
+if __name__ == "__main__":
+    unittest.main()
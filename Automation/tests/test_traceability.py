@@ -0,0 +1,81 @@
+"""Refines edges, traversal, orphans and page anchors of the traceability graph."""
+
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from requirement_model import RequirementStore  # noqa: E402
+from traceability import TraceGraph  # noqa: E402
+
+HIGH_LEVEL = [
+    {"id": "REQ-1", "name": "One"},
+    {"id": "REQ-2", "name": "Two"},
+    {"id": "REQ-3", "name": "Three", "refines": "REQ-1"},
+]
+SOFTWARE = [
+    {"id": "REQ-SW-1", "refines": "REQ-1"},
+    {"id": "REQ-SW-2", "refines": ["REQ-1", "REQ-3", "REQ-NOPE"]},
+    {"id": "REQ-SW-3", "refines": []},
+    {"id": "REQ-SW-4", "refines": "REQ-GONE"},
+    {"id": "REQ-SW-5", "refines": "REQ-SW-1"},
+    # A duplicate id keeps its first definition
+    {"id": "REQ-1", "refines": "REQ-2"},
+]
+
+
+class TraceGraphTest(unittest.TestCase):
+    def setUp(self):
+        self.graph = TraceGraph.build([("high_level", HIGH_LEVEL), ("software", SOFTWARE)])
+
+    def test_edges_both_ways(self):
+        self.assertEqual(self.graph.parents_of("REQ-SW-2"), ["REQ-1", "REQ-3"])
+        self.assertEqual(self.graph.children_of("REQ-1"), ["REQ-3", "REQ-SW-1", "REQ-SW-2"])
+        self.assertEqual(self.graph.children_of("REQ-2"), [])
+        self.assertEqual(self.graph.parents_of("REQ-1"), [])
+        self.assertEqual(self.graph.level_of["REQ-1"], "high_level")
+        self.assertEqual(self.graph.parents_of("unknown"), [])
+
+    def test_dangling_orphans_and_uncovered(self):
+        self.assertEqual(self.graph.dangling(), {"REQ-SW-2": ["REQ-NOPE"], "REQ-SW-4": ["REQ-GONE"]})
+        self.assertEqual(self.graph.orphans("software"), ["REQ-SW-3", "REQ-SW-4"])
+        self.assertEqual(self.graph.orphans("high_level"), ["REQ-1", "REQ-2"])
+        self.assertEqual(self.graph.uncovered("high_level"), ["REQ-2"])
+        self.assertEqual(self.graph.uncovered("missing-level"), [])
+
+    def test_transitive_walks(self):
+        self.assertEqual(sorted(self.graph.ancestors("REQ-SW-5")), ["REQ-1", "REQ-SW-1"])
+        self.assertEqual(sorted(self.graph.descendants("REQ-1")), ["REQ-3", "REQ-SW-1", "REQ-SW-2", "REQ-SW-5"])
+
+    def test_cycles_terminate(self):
+        graph = TraceGraph.build([("software", [
+            {"id": "A", "refines": "B"}, {"id": "B", "refines": "C"}, {"id": "C", "refines": "A"},
+        ])])
+        self.assertEqual(sorted(graph.ancestors("A")), ["A", "B", "C"])
+        self.assertEqual(sorted(graph.descendants("A")), ["A", "B", "C"])
+
+    def test_stores_and_dicts_give_the_same_graph(self):
+        items = [{"status": "Draft", "description": "d", "name": "n", **item} for item in SOFTWARE[:-1]]
+        stores = TraceGraph.build([("high_level", RequirementStore.from_items(
+            [{"status": "Draft", "description": "d", **item} for item in HIGH_LEVEL])),
+            ("software", RequirementStore.from_items(items))])
+        dicts = TraceGraph.build([("high_level", HIGH_LEVEL), ("software", SOFTWARE[:-1])])
+        self.assertEqual(stores.parents, dicts.parents)
+        self.assertEqual(dict(stores.children), dict(dicts.children))
+        self.assertEqual(stores.missing, dicts.missing)
+
+    def test_page_links_follow_assigned_pages(self):
+        links = self.graph.page_links()
+        self.assertEqual(links["refines_REQ-SW-2"], ["high_level.html#REQ-1", "high_level.html#REQ-3"])
+        self.assertEqual(links["refined_by_REQ-3"], ["software.html#REQ-SW-2"])
+        self.assertNotIn("refines_REQ-SW-3", links)
+
+        self.graph.assign_pages({"REQ-SW-2": "software-REQ-1.html"})
+        links = self.graph.page_links()
+        self.assertEqual(links["refined_by_REQ-3"], ["software-REQ-1.html#REQ-SW-2"])
+        self.assertEqual(self.graph.anchor("REQ-SW-1"), "software.html#REQ-SW-1")
+
+
+if __name__ == "__main__":
+    unittest.main()
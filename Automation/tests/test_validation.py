@@ -0,0 +1,148 @@
+"""validate_docs (--check-only) and build_docs report the same requirement problems."""
+
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import docs_builder  # noqa: E402
+import validation  # noqa: E402
+
+HIGH_LEVEL = """\
+- id: REQ-1
+  name: One
+  status: Draft
+  description: d
+- id: REQ-1
+  name: Dup
+  status: Weird
+  description: d
+- just a string
+- id: REQ-2
+  name: Two
+  status: Finished
+  description: d
+  refines: REQ-3
+- id: REQ-3
+  name: Three
+  status: Finished
+  description: d
+  refines: [REQ-2]
+"""
+
+SOFTWARE = """\
+- id: REQ-SW-1
+  name: Dangling
+  status: Draft
+  refines: REQ-NOPE
+  description: d
+- id: REQ-1
+  name: Cross-file duplicate
+  status: Draft
+  refines: REQ-1
+  description: d
+- id: REQ-SW-2
+  name: Self
+  status: Draft
+  refines: REQ-SW-2
+  description: d
+- id: REQ-SW-3
+  name: Refines nothing
+  status: Draft
+  refines: []
+  description: d
+- id: REQ-SW-4
+  name: Fine
+  status: Draft
+  refines: REQ-3
+  description: d
+"""
+
+
+class BuildMatchesCheckOnlyTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.docs_path = Path(self.tmp.name) / "Docs"
+        requirements = self.docs_path / "requirements"
+        requirements.mkdir(parents=True)
+        (requirements / "high_level_requirements.yaml").write_text(HIGH_LEVEL, encoding="utf-8")
+        (requirements / "software_requirements.yaml").write_text(SOFTWARE, encoding="utf-8")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_same_messages(self):
+        report = validation.validate_docs(self.docs_path)
+        checked = [diagnostic["message"] for diagnostic in report["diagnostics"]]
+        with contextlib.redirect_stdout(io.StringIO()):
+            built = docs_builder.build_docs(self.docs_path)["errors"]
+        self.assertEqual(built, checked)
+        rules = {diagnostic["rule"] for diagnostic in report["diagnostics"]}
+        self.assertLessEqual({"duplicate-id", "dangling-refines", "refines-cycle", "orphan"}, rules)
+
+    def test_item_diagnostics_carry_start_lines(self):
+        report = validation.validate_docs(self.docs_path)
+        found = {(d["file"].rsplit("/", 1)[-1], d["rule"], d.get("line")) for d in report["diagnostics"]}
+        for expected in [
+            ("high_level_requirements.yaml", "duplicate-id", 5),
+            ("high_level_requirements.yaml", "schema", 9),
+            ("high_level_requirements.yaml", "refines-cycle", 10),
+            ("software_requirements.yaml", "duplicate-id", 6),
+            ("software_requirements.yaml", "dangling-refines", 1),
+            ("software_requirements.yaml", "orphan", 16),
+        ]:
+            self.assertIn(expected, found)
+
+
+class MainTest(unittest.TestCase):
+    """docs_builder.main on a tree whose only diagram has a PUML include cycle."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        root = Path(self.tmp.name)
+        self.docs_path = root / "Docs"
+        architecture = self.docs_path / "architecture"
+        architecture.mkdir(parents=True)
+        (self.docs_path / "requirements").mkdir()
+        (architecture / "cycle.puml").write_text("@startuml\n!include style.iuml\nA -> B\n@enduml\n", encoding="utf-8")
+        (architecture / "style.iuml").write_text("!include cycle.puml\n", encoding="utf-8")
+        (root / "Automation").mkdir()
+        self.cwd = os.getcwd()
+        os.chdir(root / "Automation")
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.tmp.cleanup()
+
+    def run_main(self, *argv):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output), self.assertRaises(SystemExit) as caught:
+            docs_builder.main(list(argv))
+        return caught.exception.code, output.getvalue()
+
+    def test_same_severity_both_ways(self):
+        report = validation.validate_docs(self.docs_path)
+        cycles = [d for d in report["diagnostics"] if d["message"].startswith("include cycle")]
+        self.assertEqual([(d["file"], d["severity"]) for d in cycles], [("architecture/cycle.puml", "error")])
+
+        status, _ = self.run_main("--check-only")
+        self.assertEqual(status, 1)
+        status, output = self.run_main("--no-cache")
+        self.assertEqual(status, 1)
+        self.assertIn(f" - {cycles[0]['message']}", output)
+        self.assertNotIn("built successfully", output)
+
+    def test_purge_keeps_check_only_output_json(self):
+        status, output = self.run_main("--purge-cache", "--check-only")
+        self.assertEqual(status, 1)
+        self.assertFalse(json.loads(output)["ok"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,164 @@
+"""Streaming ingest with the parse cache on: batched cache entries and GC state."""
+
+import gc
+import multiprocessing
+import sys
+import tempfile
+import threading
+import tracemalloc
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import yaml_ingest  # noqa: E402
+
+
+def write_requirements(path, count):
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(count):
+            f.write(f"- id: REQ-{i}\n  title: Requirement {i}\n  description: {'text ' * 20}\n  status: draft\n")
+
+
+class StreamingCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        self.yaml_path = self.root / "requirements.yaml"
+        write_requirements(self.yaml_path, 3000)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def ingest(self):
+        return yaml_ingest.YamlIngest(yaml_ingest.YamlCache(self.root / "cache"), batch=100)
+
+    def peak_streaming(self, ingest):
+        tracemalloc.start()
+        count = 0
+        for _ in ingest.iter_items(self.yaml_path):
+            count += 1
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        self.assertEqual(count, 3000)
+        return peak
+
+    def test_cold_and_warm_stream_stay_flat(self):
+        tracemalloc.start()
+        whole = yaml_ingest.load_file(self.yaml_path)
+        whole_peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        cold_ingest = yaml_ingest.YamlIngest(yaml_ingest.YamlCache(self.root / "cold"), batch=100)
+        self.assertLess(self.peak_streaming(cold_ingest), whole_peak / 4)
+        self.assertEqual(cold_ingest.cache.memory, {})
+
+        warm_ingest = yaml_ingest.YamlIngest(yaml_ingest.YamlCache(self.root / "cold"), batch=100)
+        self.assertLess(self.peak_streaming(warm_ingest), whole_peak / 4)
+        self.assertEqual(warm_ingest.cache.hits, 1)
+        self.assertEqual(list(warm_ingest.iter_items(self.yaml_path)), whole)
+
+    def test_batched_entry_serves_whole_document_load(self):
+        ingest = self.ingest()
+        streamed = list(ingest.iter_items(self.yaml_path))
+        fresh = yaml_ingest.YamlIngest(yaml_ingest.YamlCache(self.root / "cache"))
+        self.assertEqual(fresh.load(self.yaml_path), streamed)
+        self.assertEqual(fresh.cache.hits, 1)
+
+    def test_abandoned_stream_is_not_cached(self):
+        ingest = self.ingest()
+        items = ingest.iter_items(self.yaml_path)
+        next(items)
+        items.close()
+        self.assertEqual(list((self.root / "cache").glob("*")), [])
+
+    def test_changed_file_is_streamed_again(self):
+        list(self.ingest().iter_items(self.yaml_path))
+        write_requirements(self.yaml_path, 10)
+        self.assertEqual(len(list(self.ingest().iter_items(self.yaml_path))), 10)
+
+
+class NumberedItemsTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.pool = ProcessPoolExecutor(2, mp_context=multiprocessing.get_context("forkserver"))
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.pool.shutdown()
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        self.yaml_path = self.root / "requirements.yaml"
+        self.yaml_path.write_text("# header\n\n" + "".join(
+            f"- id: REQ-{i}\n  name: N{i}\n" + ("  description: |\n    two\n    lines\n" if i % 3 else "")
+            for i in range(50)
+        ), encoding="utf-8")
+        self.lines = [number for number, line in enumerate(self.yaml_path.read_text().splitlines(), 1)
+                      if line.startswith("- ")]
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_lines_in_every_mode(self):
+        expected = list(zip(self.lines, yaml_ingest.load_file(self.yaml_path)))
+        for streaming in (False, True):
+            for pool in (None, self.pool):
+                for cache in (None, yaml_ingest.YamlCache(self.root / f"cache-{streaming}-{pool is None}")):
+                    with self.subTest(streaming=streaming, pool=pool is not None, cache=cache is not None):
+                        ingest = yaml_ingest.YamlIngest(cache, streaming=streaming, batch=7)
+                        self.assertEqual(list(ingest.iter_numbered_items(self.yaml_path, pool)), expected)
+                        # Second pass is served by the cache when there is one
+                        self.assertEqual(list(ingest.iter_numbered_items(self.yaml_path, pool)), expected)
+
+    def test_flow_list_has_no_lines(self):
+        self.yaml_path.write_text("[{id: A}, {id: B}]\n", encoding="utf-8")
+        for pool in (None, self.pool):
+            ingest = yaml_ingest.YamlIngest(streaming=True)
+            self.assertEqual(list(ingest.iter_numbered_items(self.yaml_path, pool)), [(None, {"id": "A"}), (None, {"id": "B"})])
+
+    def test_syntax_error_line_in_a_later_batch(self):
+        text = self.yaml_path.read_text().splitlines(keepends=True)
+        broken = self.lines[40] + 1
+        text[broken - 1] = "  name: [unclosed\n"
+        self.yaml_path.write_text("".join(text), encoding="utf-8")
+        for pool in (None, self.pool):
+            with self.subTest(pool=pool is not None), self.assertRaises(Exception) as caught:
+                list(yaml_ingest.YamlIngest(streaming=True, batch=7).iter_numbered_items(self.yaml_path, pool))
+            self.assertGreaterEqual(caught.exception.problem_mark.line + 1, broken)
+            self.assertLessEqual(caught.exception.problem_mark.line + 1, broken + 3)
+
+
+class GcPauseTest(unittest.TestCase):
+    def test_overlapping_pauses_restore_gc_after_the_last(self):
+        self.assertTrue(gc.isenabled())
+        first_in = threading.Event()
+        release = threading.Event()
+
+        def hold():
+            with yaml_ingest._gc_paused():
+                first_in.set()
+                release.wait(5)
+
+        thread = threading.Thread(target=hold)
+        thread.start()
+        first_in.wait(5)
+        with yaml_ingest._gc_paused():
+            self.assertFalse(gc.isenabled())
+        self.assertFalse(gc.isenabled())
+        release.set()
+        thread.join()
+        self.assertTrue(gc.isenabled())
+
+    def test_gc_runs_outside_parser_calls(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "r.yaml"
+            write_requirements(path, 500)
+            seen = [gc.isenabled() for _ in yaml_ingest.iter_list_items(path, 50)]
+        self.assertTrue(all(seen))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+Traceability Database
+
+Exports the validated requirements, their `refines` edges (dangling ones
+included), statuses and the build's validation diagnostics (one row per
+finding, with its rule, requirement id, file and line) into an indexed SQLite
+file (`docs_builder.py --trace-db`), and answers coverage questions from it
+without re-parsing any YAML:
+
+    python3 trace_db.py ../Docs/build/traceability.sqlite coverage
+    python3 trace_db.py ../Docs/build/traceability.sqlite uncovered --level high_level
+    python3 trace_db.py ../Docs/build/traceability.sqlite status-by-parent --parent REQ-000012
+    python3 trace_db.py ../Docs/build/traceability.sqlite orphans --json
+    python3 trace_db.py ../Docs/build/traceability.sqlite diagnostics --requirement REQ-SW-000042
+
+The export runs as one transaction into a temporary file that replaces the
+old database atomically, with indexes created after the bulk insert. Per-row
+parent/child counts and small summary tables are materialized at export
+time, so the queries are index lookups rather than scans of the edge table.
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+TRACE_DB_NAME = "traceability.sqlite"
+TRACE_DB_FORMAT = 2
+
+SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT) WITHOUT ROWID;
+CREATE TABLE requirements (
+    id TEXT PRIMARY KEY,
+    level TEXT NOT NULL,
+    name TEXT,
+    status TEXT,
+    status_slug TEXT,
+    description TEXT,
+    page TEXT,
+    parent_count INTEGER NOT NULL,
+    child_count INTEGER NOT NULL
+);
+CREATE TABLE refines (child TEXT NOT NULL, parent TEXT NOT NULL, resolved INTEGER NOT NULL);
+CREATE TABLE diagnostics (
+    seq INTEGER PRIMARY KEY,
+    rule TEXT NOT NULL,
+    severity TEXT NOT NULL,
+    requirement TEXT,
+    file TEXT,
+    line INTEGER,
+    message TEXT NOT NULL
+);
+CREATE TABLE status_counts (level TEXT, status TEXT, count INTEGER, PRIMARY KEY (level, status)) WITHOUT ROWID;
+CREATE TABLE parent_status_counts (
+    parent TEXT, status TEXT, count INTEGER, PRIMARY KEY (parent, status)
+) WITHOUT ROWID;
+CREATE TABLE level_coverage (
+    level TEXT PRIMARY KEY, total INTEGER, covered INTEGER, linked INTEGER
+) WITHOUT ROWID;
+"""
+
+# Created after the bulk insert, which is faster than maintaining them row by row
+INDEXES = """
+CREATE INDEX requirements_uncovered ON requirements (level, child_count);
+CREATE INDEX requirements_orphans ON requirements (level, parent_count);
+CREATE INDEX refines_parent ON refines (parent, child);
+CREATE INDEX refines_child ON refines (child, parent);
+CREATE INDEX refines_dangling ON refines (resolved, child);
+CREATE INDEX diagnostics_requirement ON diagnostics (requirement, seq);
+CREATE INDEX diagnostics_rule ON diagnostics (rule, seq);
+INSERT INTO status_counts SELECT level, status, count(*) FROM requirements GROUP BY level, status;
+INSERT INTO level_coverage
+    SELECT level, count(*), sum(child_count > 0), sum(parent_count > 0) FROM requirements GROUP BY level;
+"""
+
+
+def _requirement_rows(levels, graph):
+    seen = set()
+    parents, children, pages = graph.parents, graph.children, graph.pages
+    for level, store in levels:
+        level_page = f"{level}.html"
+        columns = zip(store.ids, store.names, store.statuses, store.status_slugs, store.descriptions)
+        for req_id, name, status, status_slug, description in columns:
+            # The graph keeps the first of duplicate ids; so does the database
+            if req_id in seen:
+                continue
+            seen.add(req_id)
+            yield (
+                req_id, level, name, status, status_slug, description, pages.get(req_id, level_page),
+                len(parents.get(req_id, ())), len(children.get(req_id, ())),
+            )
+
+
+def _parent_status_rows(levels, graph):
+    """(parent, status, count) of the requirements refining each parent."""
+    status_of = {}
+    for _, store in levels:
+        for req_id, status in zip(store.ids, store.statuses):
+            status_of.setdefault(req_id, status)
+    for parent, children in graph.children.items():
+        counts = {}
+        for child in children:
+            status = status_of[child]
+            counts[status] = counts.get(status, 0) + 1
+        for status, count in counts.items():
+            yield parent, status, count
+
+
+def _edge_rows(graph):
+    for child, parents in graph.parents.items():
+        for parent in parents:
+            yield child, parent, 1
+    for child, parents in graph.missing.items():
+        for parent in parents:
+            yield child, parent, 0
+
+
+def _diagnostic_rows(diagnostics):
+    """(rule, severity, requirement, file, line, message) rows of validation.Diagnostic objects."""
+    for diagnostic in diagnostics:
+        req_id = None if diagnostic.id is None else str(diagnostic.id)
+        yield diagnostic.rule, diagnostic.severity, req_id, diagnostic.file, diagnostic.line, diagnostic.message
+
+
+def export_trace_db(db_path, levels, graph, diagnostics=()) -> dict:
+    """Write the database for [(level, RequirementStore), ...] and their TraceGraph; returns row counts.
+
+    `diagnostics` are the build's validation.Diagnostic findings, stored one row each.
+    """
+    db_path = Path(db_path)
+    tmp_path = db_path.with_name(f"{db_path.name}.{os.getpid()}.tmp")
+    tmp_path.unlink(missing_ok=True)
+    connection = sqlite3.connect(tmp_path, isolation_level=None)
+    try:
+        # A half-written temp file is simply discarded, so durability settings can be relaxed
+        connection.execute("PRAGMA journal_mode = OFF")
+        connection.execute("PRAGMA synchronous = OFF")
+        connection.execute("PRAGMA cache_size = -65536")
+        connection.execute("BEGIN")
+        for statement in SCHEMA.split(";"):
+            if statement.strip():
+                connection.execute(statement)
+        connection.executemany("INSERT OR IGNORE INTO requirements VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                               _requirement_rows(levels, graph))
+        connection.executemany("INSERT INTO refines VALUES (?, ?, ?)", _edge_rows(graph))
+        connection.executemany("INSERT INTO parent_status_counts VALUES (?, ?, ?)", _parent_status_rows(levels, graph))
+        connection.executemany(
+            "INSERT INTO diagnostics (rule, severity, requirement, file, line, message) VALUES (?, ?, ?, ?, ?, ?)",
+            _diagnostic_rows(diagnostics),
+        )
+        for statement in INDEXES.split(";"):
+            if statement.strip():
+                connection.execute(statement)
+        connection.executemany("INSERT INTO meta VALUES (?, ?)", [
+            ("format", str(TRACE_DB_FORMAT)),
+            ("levels", json.dumps([level for level, _ in levels])),
+        ])
+        connection.execute("COMMIT")
+        counts = {
+            table: connection.execute(f"SELECT count(*) FROM {table}").fetchone()[0]
+            for table in ("requirements", "refines", "diagnostics")
+        }
+    finally:
+        connection.close()
+    os.replace(tmp_path, db_path)
+    return counts
+
+
+# name -> (help, SQL, parameters taken from the parsed arguments)
+QUERIES = {
+    "coverage": (
+        "Requirements per level, how many are refined (covered) and how many refine something (linked).",
+        "SELECT level, total, covered, linked, round(100.0 * covered / max(total, 1), 1) AS covered_pct "
+        "FROM level_coverage ORDER BY level",
+        (),
+    ),
+    "uncovered": (
+        "Requirements of a level that nothing refines (default level: high_level).",
+        "SELECT id, status, name FROM requirements WHERE level = ? AND child_count = 0 ORDER BY id",
+        ("level",),
+    ),
+    "orphans": (
+        "Requirements of a level that refine no existing requirement (default level: software).",
+        "SELECT id, status, name FROM requirements WHERE level = ? AND parent_count = 0 ORDER BY id",
+        ("level",),
+    ),
+    "dangling": (
+        "Refines edges pointing at ids that do not exist.",
+        "SELECT child, parent FROM refines WHERE resolved = 0 ORDER BY child",
+        (),
+    ),
+    "status-counts": (
+        "Number of requirements per level and status.",
+        "SELECT level, status, count FROM status_counts ORDER BY level, status",
+        (),
+    ),
+    "status-by-parent": (
+        "Status counts of the requirements refining each parent (or only --parent).",
+        "SELECT parent, status, count FROM parent_status_counts {where} ORDER BY parent, status",
+        ("parent",),
+    ),
+    "children": (
+        "Requirements refining --parent.",
+        "SELECT requirements.id, requirements.status, requirements.name FROM refines "
+        "JOIN requirements ON requirements.id = refines.child WHERE refines.parent = ? ORDER BY requirements.id",
+        ("parent",),
+    ),
+    "diagnostics": (
+        "Validation findings of the build that wrote the database (or only those of --requirement/--rule).",
+        "SELECT rule, severity, requirement, file, line, message FROM diagnostics {where} ORDER BY seq",
+        ("requirement", "rule"),
+    ),
+}
+DEFAULT_LEVELS = {"uncovered": "high_level", "orphans": "software"}
+
+
+def run_query(db_path, name, limit=None, **params):
+    """Return (column names, rows) of one of the QUERIES."""
+    _, sql, param_names = QUERIES[name]
+    values = [params.get(param) for param in param_names]
+    if "{where}" in sql:
+        # Optional filters: unset ones are left out, so a set one stays an index lookup
+        filters = [f"{param} = ?" for param, value in zip(param_names, values) if value is not None]
+        values = [value for value in values if value is not None]
+        sql = sql.format(where=f"WHERE {' AND '.join(filters)}" if filters else "")
+    if limit is not None:
+        sql += f" LIMIT {int(limit)}"
+    connection = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    try:
+        cursor = connection.execute(sql, values)
+        return [column[0] for column in cursor.description], cursor.fetchall()
+    finally:
+        connection.close()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Query a traceability database written by docs_builder.py --trace-db."
+    )
+    parser.add_argument("database", type=Path, help=f"Path to {TRACE_DB_NAME}.")
+    parser.add_argument("query", choices=sorted(QUERIES), help="; ".join(
+        f"{name}: {help_text}" for name, (help_text, _, _) in sorted(QUERIES.items())
+    ))
+    parser.add_argument("--level", default=None, help="Requirements level for uncovered/orphans.")
+    parser.add_argument("--parent", default=None, help="Parent requirement id for status-by-parent/children.")
+    parser.add_argument("--requirement", default=None, help="Requirement id for diagnostics.")
+    parser.add_argument("--rule", default=None, help="Validation rule for diagnostics (e.g. dangling-refines).")
+    parser.add_argument("--limit", type=int, default=None, help="Return at most this many rows.")
+    parser.add_argument("--json", action="store_true", help="Print rows as JSON objects instead of a table.")
+    return parser.parse_args(argv)
+
+
+def main():
+    args = parse_args()
+    if not args.database.exists():
+        print(f"Database not found: {args.database} (build with docs_builder.py --trace-db)")
+        sys.exit(1)
+    if args.query == "children" and not args.parent:
+        print("The children query needs --parent.")
+        sys.exit(1)
+
+    start = time.perf_counter()
+    columns, rows = run_query(
+        args.database, args.query, args.limit,
+        level=args.level or DEFAULT_LEVELS.get(args.query), parent=args.parent,
+        requirement=args.requirement, rule=args.rule,
+    )
+    elapsed = time.perf_counter() - start
+
+    if args.json:
+        print(json.dumps([dict(zip(columns, row)) for row in rows], ensure_ascii=False, indent=1))
+    else:
+        print("\t".join(columns))
+        for row in rows:
+            print("\t".join("" if value is None else str(value) for value in row))
+    print(f"{len(rows)} row(s) in {elapsed * 1e3:.1f} ms", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Traceability Graph
+
+Indexes `refines` relations between requirements. Forward (child -> parents)
+and reverse (parent -> children) adjacency lists are built in a single pass,
+so link generation and coverage queries stay linear in the number of edges.
+`refines` may be a single id or a list of ids, and chains may be any depth.
+Requirements may be raw YAML dicts or `requirement_model.Requirement` objects.
+"""
+
+from collections import defaultdict
+
+from requirement_model import normalize_refines
+
+
+def requirement_id(req):
+    return req["id"] if isinstance(req, dict) else req.id
+
+
+def refined_ids(req) -> list:
+    """Normalize a requirement's `refines` field to a list of parent ids."""
+    if not isinstance(req, dict):
+        return list(req.refines)
+    return list(normalize_refines(req.get("refines")))
+
+
+class TraceGraph:
+    """Requirements grouped by level (page) with indexed refines edges."""
+
+    def __init__(self):
+        self.nodes = {}
+        self.level_of = {}
+        self.levels = {}
+        self.parents = {}
+        self.children = defaultdict(list)
+        self.missing = {}
+        self.pages = {}
+
+    @classmethod
+    def build(cls, levels):
+        """Build from [(level_name, requirements), ...] ordered from the top level down."""
+        graph = cls()
+        for level, requirements in levels:
+            ids = []
+            for req in requirements or []:
+                req_id = requirement_id(req)
+                if req_id in graph.nodes:
+                    continue
+                graph.nodes[req_id] = req
+                graph.level_of[req_id] = level
+                ids.append(req_id)
+            graph.levels[level] = ids
+
+        for req_id, req in graph.nodes.items():
+            resolved = []
+            for parent_id in refined_ids(req):
+                if parent_id in graph.nodes:
+                    resolved.append(parent_id)
+                    graph.children[parent_id].append(req_id)
+                else:
+                    graph.missing.setdefault(req_id, []).append(parent_id)
+            graph.parents[req_id] = resolved
+        return graph
+
+    def parents_of(self, req_id) -> list:
+        return self.parents.get(req_id, [])
+
+    def children_of(self, req_id) -> list:
+        return self.children.get(req_id, [])
+
+    def _walk(self, req_id, adjacency):
+        seen = set()
+        stack = list(adjacency(req_id))
+        order = []
+        while stack:
+            current = stack.pop()
+            if current in seen:
+                continue
+            seen.add(current)
+            order.append(current)
+            stack.extend(adjacency(current))
+        return order
+
+    def ancestors(self, req_id) -> list:
+        """Every requirement reachable through refines, at any depth (cycle-safe)."""
+        return self._walk(req_id, self.parents_of)
+
+    def descendants(self, req_id) -> list:
+        """Every requirement that refines this one directly or transitively."""
+        return self._walk(req_id, self.children_of)
+
+    def dangling(self) -> dict:
+        """{requirement id: [refined ids that do not exist]}."""
+        return dict(self.missing)
+
+    def orphans(self, level) -> list:
+        """Requirements of a level that do not refine any existing requirement."""
+        return [req_id for req_id in self.levels.get(level, []) if not self.parents.get(req_id)]
+
+    def uncovered(self, level) -> list:
+        """Requirements of a level that nothing refines."""
+        return [req_id for req_id in self.levels.get(level, []) if not self.children.get(req_id)]
+
+    def assign_pages(self, pages):
+        """Override the page of individual requirements ({id: page file}), e.g. for sharded levels."""
+        self.pages.update(pages)
+
+    def anchor(self, req_id) -> str:
+        page = self.pages.get(req_id) or f"{self.level_of[req_id]}.html"
+        return f"{page}#{req_id}"
+
+    def page_links(self) -> dict:
+        """Link map used by the HTML pages.
+
+        `refines_<id>` lists anchors of the requirements <id> refines and
+        `refined_by_<id>` lists anchors of the requirements refining <id>.
+        """
+        links = {}
+        for req_id, parents in self.parents.items():
+            if parents:
+                links[f"refines_{req_id}"] = [self.anchor(parent) for parent in parents]
+        for req_id, children in self.children.items():
+            links[f"refined_by_{req_id}"] = [self.anchor(child) for child in children]
+        return links
@@ -0,0 +1,390 @@
+#!/usr/bin/env python3
+"""
+Validation Engine
+
+Checks a Docs tree without generating any HTML (`docs_builder.py --check-only`):
+
+- each requirement file gets one fused pass over its items that applies every
+  item rule at once (schema and field types, required fields, duplicate ids,
+  status values) and reports all problems of an item, not just the first;
+  the same pass collects the ids and `refines` edges for the link rules;
+- requirement files and PUML diagrams (balanced `@startuml`/`@enduml`, local
+  `!include` resolution and cycles) are checked on a thread pool; that only
+  overlaps file I/O, since libyaml parses under the GIL, so with more than
+  one CPU large requirement files are split at item boundaries and parsed
+  in a process pool;
+- a final pass over the collected ids reports ids duplicated across files,
+  dangling `refines` and `refines` cycles.
+
+The build validates items with the same rules (`check_item`). Diagnostics are
+structured (rule, severity, file, item start line, item index, id, message) and
+serialize to JSON for pre-commit hooks and CI.
+"""
+
+import contextlib
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+
+import yaml_ingest
+from puml_includes import IncludeResolver
+from requirement_model import normalize_refines, status_label
+
+REPORT_FORMAT = 1
+
+# (level, label, path relative to Docs, required fields), ordered from the top level down
+REQUIREMENT_FILES = (
+    ('high_level', 'High-level', 'requirements/high_level_requirements.yaml',
+     ('id', 'name', 'status', 'description')),
+    ('software', 'Software', 'requirements/software_requirements.yaml',
+     ('id', 'name', 'status', 'refines', 'description')),
+)
+PUML_SUFFIXES = ('.puml', '.iuml', '.pu', '.plantuml')
+# Requirement files at least this large are parsed in a process pool when more than one CPU is available
+PARALLEL_PARSE_BYTES = 1 << 20
+
+# Fields checked by check_item, in the order missing ones are reported
+ITEM_FIELDS = ('id', 'name', 'status', 'refines', 'description')
+SCALAR_TYPES = (str, int, float)
+SCALAR_CLASSES = frozenset(SCALAR_TYPES)
+
+
+class Diagnostic:
+    """One finding; `file` is relative to the Docs folder, `index` is the item position in its file."""
+
+    __slots__ = ("rule", "severity", "message", "file", "line", "index", "id")
+
+    def __init__(self, rule, message, severity="error", file=None, line=None, index=None, id=None):
+        self.rule = rule
+        self.severity = severity
+        self.message = message
+        self.file = file
+        self.line = line
+        self.index = index
+        self.id = id
+
+    def to_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__ if getattr(self, name) is not None}
+
+    def __repr__(self):
+        return f"Diagnostic({self.rule!r}, {self.message!r})"
+
+
+def _type_name(value) -> str:
+    return "list" if isinstance(value, list) else "mapping" if isinstance(value, dict) else type(value).__name__
+
+
+def check_item(item, index, label, required_keys, seen_ids, report) -> bool:
+    """Apply every item rule, calling report(rule, message, id) per problem.
+
+    Returns whether the item can be kept: items that are not mappings, lack a
+    required field, have a malformed field or repeat an id are dropped; an
+    unknown status is reported but the item kept.
+    """
+    if not isinstance(item, dict):
+        report("schema", f"{label}[{index}] must be a mapping/dict.", None)
+        return False
+
+    item_id = item.get("id")
+    if item_id.__class__ not in SCALAR_CLASSES and not isinstance(item_id, SCALAR_TYPES):
+        item_id = None
+    valid = True
+    missing = None
+    # One lookup per field for the required and the type rules
+    for key in ITEM_FIELDS:
+        value = item.get(key)
+        if value is None or value == "":
+            if key in required_keys:
+                missing = (missing or []) + [key]
+        elif value.__class__ in SCALAR_CLASSES or isinstance(value, SCALAR_TYPES):
+            continue
+        elif key != "refines":
+            report("schema", f"{label}[{index}] field '{key}' must be a scalar, not a {_type_name(value)}.", item_id)
+            valid = False
+        elif not isinstance(value, list):
+            report("schema", f"{label}[{index}] field 'refines' must be an id or a list of ids, "
+                             f"not a {_type_name(value)}.", item_id)
+            valid = False
+        elif not all(parent is None or isinstance(parent, SCALAR_TYPES) for parent in value):
+            report("schema", f"{label}[{index}] field 'refines' must list requirement ids.", item_id)
+            valid = False
+    if missing:
+        report("required", f"{label}[{index}] missing required fields: {', '.join(missing)}.", item_id)
+        valid = False
+
+    if item_id is not None:
+        key = str(item_id)
+        if key in seen_ids:
+            report("duplicate-id", f"{label} duplicate id '{item_id}'.", item_id)
+            valid = False
+        elif valid:
+            seen_ids.add(key)
+
+    status = item.get("status")
+    if status and isinstance(status, SCALAR_TYPES) and status_label(status)[2] is None:
+        report("status", f"{label} '{item_id}' has unknown status '{status}'.", item_id)
+    return valid
+
+
+class FileResult:
+    """Outcome of the fused pass over one requirements file."""
+
+    def __init__(self, level, label, file):
+        self.level = level
+        self.label = label
+        self.file = file
+        self.diagnostics = []
+        # [(id, item index, (refined ids), start line)] of the items that passed the item rules
+        self.items = []
+
+
+def _parse_error(error):
+    """(message, 1-based line or None) for a YAML loading error."""
+    mark = getattr(error, "problem_mark", None)
+    if isinstance(error, OSError):
+        return error.strerror or str(error), None
+    return str(error).replace("\n", " "), mark.line + 1 if mark is not None else None
+
+
+def check_requirements_file(docs_path, level, label, relative, required_keys, ingest=None, pool=None) -> FileResult:
+    """Item rules over one requirements file; `pool` is a process pool for parsing batches of items."""
+    result = FileResult(level, label, relative)
+    path = Path(docs_path) / relative
+    ingest = ingest or yaml_ingest.YamlIngest()
+
+    def report(rule, message, item_id=None, line=None):
+        result.diagnostics.append(Diagnostic(rule, message, file=relative, line=line or item_line, index=index,
+                                             id=item_id))
+
+    index = item_line = None
+    try:
+        seen_ids = set()
+        items = result.items
+        for index, (item_line, item) in enumerate(ingest.iter_numbered_items(path, pool)):
+            if check_item(item, index, label, required_keys, seen_ids, report):
+                items.append((str(item["id"]), index, normalize_refines(item.get("refines")), item_line))
+        if index is None:
+            report("yaml", f"{label} YAML file {relative} is empty.")
+    except yaml_ingest.YamlShapeError:
+        index = item_line = None
+        report("schema", f"{label} YAML must be a list of items.")
+    except Exception as e:
+        message, line = _parse_error(e)
+        index = item_line = None
+        report("yaml", f"Could not load {relative}: {message}", line=line)
+    return result
+
+
+def check_puml_file(docs_path, relative, resolver) -> list:
+    """Structure and include diagnostics of one PlantUML file."""
+    path = Path(docs_path) / relative
+    diagnostics = []
+
+    def report(message, line=None, severity="error"):
+        diagnostics.append(Diagnostic("puml", message, severity=severity, file=relative, line=line))
+
+    try:
+        text = path.read_text(encoding="utf-8")
+    except (OSError, UnicodeDecodeError) as e:
+        report(f"Cannot read {relative}: {e.strerror if isinstance(e, OSError) else e}")
+        return diagnostics
+
+    open_line = None
+    blocks = 0
+    body = 0
+    for number, line in enumerate(text.splitlines(), 1):
+        stripped = line.strip()
+        if stripped.startswith("@startuml"):
+            if open_line is not None:
+                report(f"@startuml on line {open_line} is not closed before the next @startuml.", open_line)
+            open_line, body = number, 0
+        elif stripped.startswith("@enduml"):
+            if open_line is None:
+                report("@enduml without a matching @startuml.", number)
+            elif body == 0:
+                report("Empty diagram block.", open_line, severity="warning")
+            else:
+                blocks += 1
+            open_line = None
+        elif stripped and not stripped.startswith("'"):
+            body += 1
+    if open_line is not None:
+        report(f"@startuml on line {open_line} has no matching @enduml.", open_line)
+
+    # Files without @startuml are include fragments; their includes are checked through the diagrams using them
+    if blocks or open_line is not None:
+        _, _, errors = resolver.expand(path, text)
+        for message in errors:
+            report(message)
+    return diagnostics
+
+
+def _puml_sources(docs_path):
+    architecture_path = Path(docs_path) / 'architecture'
+    if not architecture_path.is_dir():
+        return []
+    return sorted(
+        path.relative_to(docs_path).as_posix()
+        for path in architecture_path.rglob('*') if path.suffix in PUML_SUFFIXES and path.is_file()
+    )
+
+
+def store_result(level, label, relative, store) -> FileResult:
+    """FileResult over an already loaded RequirementStore (the build), for check_links; item positions are unknown."""
+    result = FileResult(level, label, relative)
+    result.items = [(req_id, None, refined, None) for req_id, refined in zip(store.ids, store.refines)]
+    return result
+
+
+def check_links(results) -> list:
+    """Ids duplicated across files, dangling refines, requirements refining nothing and refines cycles.
+
+    `results` are ordered from the top level down; only top-level requirements may refine nothing.
+    """
+    diagnostics = []
+    # id -> (file result, item index, start line) of its first definition
+    owner = {}
+    parents = {}
+    for result in results:
+        for req_id, index, refined, line in result.items:
+            first = owner.get(req_id)
+            if first is not None:
+                diagnostics.append(Diagnostic(
+                    "duplicate-id", f"{result.label} id '{req_id}' is already defined in {first[0].file}.",
+                    file=result.file, line=line, index=index, id=req_id,
+                ))
+                continue
+            owner[req_id] = (result, index, line)
+            if refined:
+                parents[req_id] = refined
+            elif result.level != REQUIREMENT_FILES[0][0]:
+                diagnostics.append(Diagnostic(
+                    "orphan", f"{result.label} '{req_id}' does not refine any requirement.",
+                    file=result.file, line=line, index=index, id=req_id,
+                ))
+
+    for req_id, refined in parents.items():
+        for parent in refined:
+            if parent not in owner:
+                result, index, line = owner[req_id]
+                diagnostics.append(Diagnostic(
+                    "dangling-refines", f"{result.label} '{req_id}' refines unknown requirement '{parent}'.",
+                    file=result.file, line=line, index=index, id=req_id,
+                ))
+
+    for cycle in find_cycles(parents):
+        result, index, line = owner[cycle[0]]
+        diagnostics.append(Diagnostic(
+            "refines-cycle", f"refines cycle: {' -> '.join(cycle + [cycle[0]])}",
+            file=result.file, line=line, index=index, id=cycle[0],
+        ))
+    return diagnostics
+
+
+def find_cycles(parents) -> list:
+    """One [id, ...] path per cycle found in the {id: [parent ids]} graph (iterative DFS)."""
+    done = set()
+    cycles = []
+    for root, root_parents in parents.items():
+        if root in done:
+            continue
+        # Usual case: refines only requirements that refine nothing themselves
+        if parents.keys().isdisjoint(root_parents):
+            done.add(root)
+            continue
+        position = {root: 0}
+        path = [root]
+        stack = [iter(root_parents)]
+        while stack:
+            parent = next(stack[-1], None)
+            if parent is None:
+                stack.pop()
+                finished = path.pop()
+                del position[finished]
+                done.add(finished)
+            elif parent in position:
+                cycles.append(path[position[parent]:])
+            elif parent not in done and parent in parents:
+                position[parent] = len(path)
+                path.append(parent)
+                stack.append(iter(parents[parent]))
+    return cycles
+
+
+def _stat_key(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _parse_pool(sizes):
+    """A process pool for parsing requirement items when several CPUs can share a large file, else None.
+
+    libyaml parses under the GIL, so the checker threads alone parse one file at a time.
+    """
+    cpus = os.cpu_count() or 1
+    if cpus < 2 or not any(size >= PARALLEL_PARSE_BYTES for size in sizes):
+        return None
+    # forkserver: the checker threads may hold locks a forked worker would inherit
+    return ProcessPoolExecutor(max_workers=cpus, mp_context=multiprocessing.get_context("forkserver"))
+
+
+def validate_docs(docs_path, ingest=None, workers=None, resolver=None, cache=None) -> dict:
+    """Run every rule over the Docs tree; returns the JSON-ready report.
+
+    `cache` ({file: (stat key, FileResult)}, kept by the build daemon) skips
+    the item pass for requirement files unchanged since the last check.
+    """
+    start = time.perf_counter()
+    docs_path = Path(docs_path)
+    resolver = resolver or IncludeResolver()
+    puml_files = _puml_sources(docs_path)
+    workers = workers or min(32, (os.cpu_count() or 1) + 4)
+    checks = []
+    for level, label, relative, required_keys in REQUIREMENT_FILES:
+        key = _stat_key(docs_path / relative)
+        cached = cache.get(relative) if cache is not None else None
+        result = cached[1] if key is not None and cached is not None and cached[0] == key else None
+        checks.append((level, label, relative, required_keys, key, result))
+    parse_pool = _parse_pool([key[1] for *_, key, result in checks if result is None and key is not None])
+    with parse_pool or contextlib.nullcontext(), ThreadPoolExecutor(max_workers=workers) as pool:
+        requirement_jobs = []
+        for level, label, relative, required_keys, key, result in checks:
+            job = None
+            if result is None:
+                job = pool.submit(check_requirements_file, docs_path, level, label, relative, required_keys, ingest,
+                                  parse_pool)
+            requirement_jobs.append((relative, key, job, result))
+        puml_jobs = [pool.submit(check_puml_file, docs_path, relative, resolver) for relative in puml_files]
+        results = []
+        for relative, key, job, result in requirement_jobs:
+            if job is not None:
+                result = job.result()
+                if cache is not None:
+                    cache[relative] = (key, result)
+            results.append(result)
+        diagnostics = [diagnostic for result in results for diagnostic in result.diagnostics]
+        diagnostics.extend(check_links(results))
+        for job in puml_jobs:
+            diagnostics.extend(job.result())
+
+    errors = sum(1 for diagnostic in diagnostics if diagnostic.severity == "error")
+    return {
+        "format": REPORT_FORMAT,
+        "ok": errors == 0,
+        "errors": errors,
+        "warnings": len(diagnostics) - errors,
+        "requirements": {result.file: len(result.items) for result in results},
+        "diagrams": puml_files,
+        "seconds": round(time.perf_counter() - start, 4),
+        "diagnostics": [diagnostic.to_dict() for diagnostic in diagnostics],
+    }
+
+
+def report_json(report) -> str:
+    return json.dumps(report, ensure_ascii=False, indent=1)
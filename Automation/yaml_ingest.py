@@ -0,0 +1,550 @@
+#!/usr/bin/env python3
+"""
+YAML Ingestion
+
+Fast loading of requirement YAML files:
+
+- uses the libyaml-backed `CSafeLoader` when PyYAML was built with it;
+- a streaming mode parses a top-level block list in small batches of items,
+  so the whole document tree is never built at once and items can be
+  validated as they arrive;
+- a parsed-result cache (in memory and on disk) keyed by file mtime/size and
+  content hash skips parsing entirely for unchanged files.
+
+Cached results are shared between callers and must be treated as read-only.
+"""
+
+import functools
+import gc
+import hashlib
+import itertools
+import os
+import pickle
+import threading
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+from build_manifest import hash_file
+
+STREAM_BATCH = 200
+CACHE_FORMAT = 2
+
+
+@functools.lru_cache(maxsize=None)
+def safe_loader():
+    """The libyaml-backed CSafeLoader when available, else SafeLoader.
+
+    PyYAML is imported here rather than at module import, so builds whose YAML
+    comes from the parse cache never load it.
+    """
+    import yaml
+    return getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def has_libyaml() -> bool:
+    return safe_loader().__name__ == "CSafeLoader"
+
+
+def _load(stream):
+    """yaml.load with the safe loader, for a file object or a string."""
+    loader = safe_loader()(stream)
+    try:
+        return loader.get_single_data()
+    finally:
+        loader.dispose()
+
+
+class YamlShapeError(ValueError):
+    """The YAML document is not a top-level list."""
+
+
+_gc_lock = threading.Lock()
+_gc_depth = 0
+_gc_was_enabled = False
+
+
+@contextmanager
+def _gc_paused():
+    """Pause cyclic GC around one parser call (parsed YAML has no cycles).
+
+    Nested and concurrent pauses share one GC state, re-enabled when the last one ends.
+    """
+    global _gc_depth, _gc_was_enabled
+    with _gc_lock:
+        if _gc_depth == 0:
+            _gc_was_enabled = gc.isenabled()
+            gc.disable()
+        _gc_depth += 1
+    try:
+        yield
+    finally:
+        with _gc_lock:
+            _gc_depth -= 1
+            if _gc_depth == 0 and _gc_was_enabled:
+                gc.enable()
+
+
+def load_file(file_path):
+    """Parse a whole YAML file with the fastest available safe loader."""
+    with open(file_path, "r", encoding="utf-8") as f, _gc_paused():
+        return _load(f)
+
+
+def _is_item_start(line: str) -> bool:
+    # "- " (or a bare "-") at column 0 opens a new top-level item; "---" does not
+    return line[:1] == "-" and line[1:2] in (" ", "\t", "\n", "\r", "")
+
+
+class _NotBlockList(Exception):
+    """The file is not a plain top-level block list and has to be parsed whole."""
+
+
+def _shift_marks(error, offset):
+    """Move the marks of a yaml.MarkedYAMLError raised for a batch to the batch's place in the file."""
+    from yaml.error import Mark
+    for name in ("context_mark", "problem_mark"):
+        mark = getattr(error, name, None)
+        if mark is not None:
+            setattr(error, name, Mark(mark.name, mark.index, mark.line + offset, mark.column, None, None))
+
+
+def _parse_batch(lines, first_line=1):
+    try:
+        with _gc_paused():
+            items = _load("".join(lines))
+    except Exception as e:
+        if first_line > 1:
+            _shift_marks(e, first_line - 1)
+        raise
+    return items or []
+
+
+def iter_item_batches(file_path, batch=STREAM_BATCH):
+    """Yield (first line, [item start lines], [source lines]) per `batch` top-level list items.
+
+    Line numbers are 1-based. Raises _NotBlockList before yielding anything
+    when the file is not a plain block list (flow style, directives, a mapping
+    at the top); yields nothing for a file of comments and blank lines.
+    """
+    with open(file_path, "r", encoding="utf-8") as f:
+        pending = []
+        number = 0
+        # Leading comments/blank lines decide whether the file can be streamed
+        for line in f:
+            number += 1
+            pending.append(line)
+            stripped = line.strip()
+            if not stripped or stripped.startswith("#") or stripped == "---":
+                continue
+            if not _is_item_start(line):
+                raise _NotBlockList(file_path)
+            first, starts = 1, [number]
+            for line in f:
+                number += 1
+                if _is_item_start(line):
+                    if len(starts) == batch:
+                        yield first, starts, pending
+                        first, starts, pending = number, [], []
+                    starts.append(number)
+                pending.append(line)
+            yield first, starts, pending
+            return
+
+
+def item_start_lines(file_path):
+    """Yield the 1-based start line of each top-level list item; nothing if the file is not a plain block list."""
+    try:
+        with open(file_path, "r", encoding="utf-8") as f:
+            for number, line in enumerate(f, 1):
+                stripped = line.strip()
+                if not stripped or stripped.startswith("#") or stripped == "---":
+                    continue
+                if not _is_item_start(line):
+                    return
+                yield number
+                for number, line in enumerate(f, number + 1):
+                    if line[:1] == "-" and _is_item_start(line):
+                        yield number
+                return
+    except (OSError, UnicodeDecodeError):
+        return
+
+
+def _numbered_batch(starts, items):
+    # A batch split at a line that did not start an item gets no line numbers
+    return zip(starts if len(starts) == len(items) else [None] * len(items), items)
+
+
+def _numbered(items, lines):
+    lines = iter(lines)
+    for item in items:
+        yield next(lines, None), item
+
+
+def iter_list_items(file_path, batch=STREAM_BATCH):
+    """Yield the items of a top-level YAML list, parsing `batch` items at a time.
+
+    Files that are not a plain block list (flow style, directives, a mapping at
+    the top) are parsed whole instead. Raises YamlShapeError if the document is
+    not a list, and yaml.YAMLError for syntax errors (including aliases that
+    point into another batch).
+    """
+    try:
+        for first, _, lines in iter_item_batches(file_path, batch):
+            yield from _parse_batch(lines, first)
+        return
+    except _NotBlockList:
+        pass
+
+    data = load_file(file_path)
+    if data is None:
+        return
+    if not isinstance(data, list):
+        raise YamlShapeError(f"{file_path} is not a YAML list.")
+    yield from data
+
+
+def iter_pool_items(file_path, pool, batch=STREAM_BATCH, ahead=4):
+    """Yield (start line, item) like iter_list_items, parsing batches in a process `pool`.
+
+    At most `ahead` batches are in flight, so the file is still read as the items are consumed.
+    Files that are not a plain block list are parsed whole in this process.
+    """
+    in_flight = deque()
+    try:
+        for first, starts, lines in iter_item_batches(file_path, batch):
+            in_flight.append((starts, pool.submit(_parse_batch, lines, first)))
+            if len(in_flight) >= ahead:
+                starts, job = in_flight.popleft()
+                yield from _numbered_batch(starts, job.result())
+        while in_flight:
+            starts, job = in_flight.popleft()
+            yield from _numbered_batch(starts, job.result())
+    except _NotBlockList:
+        yield from zip(itertools.repeat(None), iter_list_items(file_path, batch))
+    finally:
+        # An abandoned or failed file leaves nothing queued in the pool
+        for _, job in in_flight:
+            job.cancel()
+
+
+class YamlCache:
+    """Parsed YAML keyed by path, validated by mtime/size and then content hash."""
+
+    def __init__(self, cache_dir=None):
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self.memory = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _disk_path(self, key: str) -> Path:
+        return self.cache_dir / f"{hashlib.sha256(key.encode('utf-8')).hexdigest()[:32]}.pickle"
+
+    def _open_disk(self, key, stat, digest_fn):
+        """The cache file positioned after a header that still matches the file, and the header; else None."""
+        if self.cache_dir is None:
+            return None
+        try:
+            f = open(self._disk_path(key), "rb")
+        except OSError:
+            return None
+        try:
+            header = pickle.load(f)
+            if header.get("format") == CACHE_FORMAT and header.get("path") == key:
+                if (header["mtime_ns"], header["size"]) == (stat.st_mtime_ns, stat.st_size) \
+                        or header["sha256"] == digest_fn():
+                    return f, header
+        except (OSError, EOFError, pickle.UnpicklingError, KeyError, AttributeError):
+            pass
+        f.close()
+        return None
+
+    @staticmethod
+    def _read_batches(f):
+        """Items of a batched entry (written by put_stream), one pickled batch at a time."""
+        while True:
+            with _gc_paused():
+                batch = pickle.load(f)
+            if batch is None:
+                return
+            yield from batch
+
+    def _load_disk(self, key, stat, digest_fn):
+        """Return (header, data) from disk if the header still matches the file, else None."""
+        opened = self._open_disk(key, stat, digest_fn)
+        if opened is None:
+            return None
+        f, header = opened
+        try:
+            with f:
+                if header.get("batched"):
+                    return header, list(self._read_batches(f))
+                with _gc_paused():
+                    return header, pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError):
+            return None
+
+    def _store_disk(self, key, header, data):
+        if self.cache_dir is None:
+            return
+        path = self._disk_path(key)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, "wb") as f:
+                pickle.dump({**header, "batched": False}, f, protocol=pickle.HIGHEST_PROTOCOL)
+                pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except OSError:
+            tmp_path.unlink(missing_ok=True)
+
+    def get(self, file_path):
+        """Return (True, data) for an up-to-date entry, else (False, content sha256 or None)."""
+        key = str(Path(file_path).resolve())
+        try:
+            stat = os.stat(key)
+        except OSError:
+            return False, None
+
+        digest = None
+
+        def digest_fn():
+            nonlocal digest
+            if digest is None:
+                digest = hash_file(key)
+            return digest
+
+        entry = self.memory.get(key)
+        if entry is not None:
+            header, data = entry
+            same_stat = (header["mtime_ns"], header["size"]) == (stat.st_mtime_ns, stat.st_size)
+            if not same_stat and header["sha256"] != digest_fn():
+                entry = None
+        if entry is None:
+            entry = self._load_disk(key, stat, digest_fn)
+
+        if entry is None:
+            self.misses += 1
+            return False, digest_fn()
+
+        header, data = entry
+        if (header["mtime_ns"], header["size"]) != (stat.st_mtime_ns, stat.st_size):
+            # Touched but unchanged: refresh the stat part of the key
+            header = {**header, "mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+            self._store_disk(key, header, data)
+        self.memory[key] = (header, data)
+        self.hits += 1
+        return True, data
+
+    def put(self, file_path, data, digest=None):
+        key = str(Path(file_path).resolve())
+        try:
+            stat = os.stat(key)
+        except OSError:
+            return
+        header = self._header(key, stat, digest)
+        self.memory[key] = (header, data)
+        self._store_disk(key, header, data)
+
+    def _header(self, key, stat, digest):
+        return {
+            "format": CACHE_FORMAT,
+            "path": key,
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "sha256": digest or hash_file(key),
+        }
+
+    def is_current(self, file_path) -> bool:
+        """Whether an up-to-date entry exists, without loading it."""
+        key = str(Path(file_path).resolve())
+        try:
+            stat = os.stat(key)
+        except OSError:
+            return False
+        entry = self.memory.get(key)
+        if entry is not None and (entry[0]["mtime_ns"], entry[0]["size"]) == (stat.st_mtime_ns, stat.st_size):
+            return True
+        opened = self._open_disk(key, stat, lambda: hash_file(key))
+        if opened is None:
+            return False
+        opened[0].close()
+        return True
+
+    def iter_cached(self, file_path):
+        """Like get(), but a batched disk entry comes back as an iterator reading one batch at a time."""
+        key = str(Path(file_path).resolve())
+        try:
+            stat = os.stat(key)
+        except OSError:
+            return False, None
+        entry = self.memory.get(key)
+        if entry is not None and (entry[0]["mtime_ns"], entry[0]["size"]) == (stat.st_mtime_ns, stat.st_size):
+            self.hits += 1
+            return True, entry[1]
+        digest = None
+
+        def digest_fn():
+            nonlocal digest
+            if digest is None:
+                digest = hash_file(key)
+            return digest
+
+        opened = self._open_disk(key, stat, digest_fn)
+        if opened is None or not opened[1].get("batched"):
+            if opened is not None:
+                opened[0].close()
+            # Whole-document and touched-but-unchanged entries go through get()
+            return self.get(file_path)
+        self.hits += 1
+        return True, self._iterate_file(opened[0])
+
+    def _iterate_file(self, f):
+        with f:
+            yield from self._read_batches(f)
+
+    def put_stream(self, file_path, items, digest=None, batch=STREAM_BATCH):
+        """Yield `items`, appending them to the disk cache in pickled batches as they pass.
+
+        The entry only replaces the old one once every item was read; an empty
+        stream is left uncached, like a failed or abandoned one.
+        """
+        key = str(Path(file_path).resolve())
+        try:
+            stat = os.stat(key)
+        except OSError:
+            stat = None
+        if self.cache_dir is None or stat is None:
+            yield from items
+            return
+
+        path = self._disk_path(key)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            f = open(tmp_path, "wb")
+        except OSError:
+            yield from items
+            return
+
+        complete = False
+        count = 0
+        try:
+            pickle.dump({**self._header(key, stat, digest), "batched": True}, f, protocol=pickle.HIGHEST_PROTOCOL)
+            pending = []
+            for item in items:
+                pending.append(item)
+                count += 1
+                if len(pending) >= batch:
+                    pickle.dump(pending, f, protocol=pickle.HIGHEST_PROTOCOL)
+                    pending = []
+                yield item
+            if pending:
+                pickle.dump(pending, f, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump(None, f, protocol=pickle.HIGHEST_PROTOCOL)
+            complete = count > 0
+        finally:
+            f.close()
+            try:
+                if complete:
+                    os.replace(tmp_path, path)
+                    self.memory.pop(key, None)
+                else:
+                    tmp_path.unlink(missing_ok=True)
+            except OSError:
+                tmp_path.unlink(missing_ok=True)
+
+    def purge(self):
+        self.memory.clear()
+        removed = 0
+        if self.cache_dir is not None and self.cache_dir.exists():
+            for path in self.cache_dir.glob("*.pickle"):
+                path.unlink(missing_ok=True)
+                removed += 1
+        return removed
+
+
+class YamlIngest:
+    """Loads requirement files, optionally streaming and/or through a YamlCache."""
+
+    def __init__(self, cache=None, streaming=False, batch=STREAM_BATCH):
+        self.cache = cache
+        self.streaming = streaming
+        self.batch = batch
+
+    def load(self, file_path):
+        """Parse a whole file (cached); raises OSError / yaml.YAMLError."""
+        digest = None
+        if self.cache is not None:
+            found, value = self.cache.get(file_path)
+            if found:
+                return value
+            digest = value
+        data = load_file(file_path)
+        if self.cache is not None:
+            self.cache.put(file_path, data, digest)
+        return data
+
+    def iter_items(self, file_path):
+        """Yield top-level list items (cached, streamed); raises YamlShapeError for non-lists.
+
+        Items go to the cache in batches while they stream (YamlCache.put_stream),
+        so memory stays flat with the cache on as well.
+        """
+        if self.cache is None:
+            yield from iter_list_items(file_path, self.batch)
+            return
+
+        found, value = self.cache.iter_cached(file_path)
+        if found:
+            if value is None:
+                return
+            if not isinstance(value, (list, Iterator)):
+                raise YamlShapeError(f"{file_path} is not a YAML list.")
+            yield from value
+            return
+        yield from self.cache.put_stream(file_path, iter_list_items(file_path, self.batch), value, self.batch)
+
+    def iter_numbered_items(self, file_path, pool=None, ahead=4):
+        """Yield (1-based start line or None, item) per top-level list item; raises YamlShapeError for non-lists.
+
+        Files without an up-to-date cache entry are parsed in batches in the
+        process `pool` when one is given, and the result still goes to the cache.
+        Lines are None for files that are not a plain block list.
+        """
+        if pool is None or (self.cache is not None and self.cache.is_current(file_path)):
+            if self.streaming:
+                items = self.iter_items(file_path)
+            else:
+                items = self.load(file_path)
+                if items is None:
+                    return
+                if not isinstance(items, list):
+                    raise YamlShapeError(f"{file_path} is not a YAML list.")
+            yield from _numbered(items, item_start_lines(file_path))
+            return
+
+        numbered = iter_pool_items(file_path, pool, self.batch, ahead)
+        if self.cache is None:
+            yield from numbered
+            return
+        lines = deque()
+
+        def items():
+            for line, item in numbered:
+                lines.append(line)
+                yield item
+
+        if self.streaming:
+            for item in self.cache.put_stream(file_path, items(), batch=self.batch):
+                yield lines.popleft(), item
+            return
+        parsed = []
+        for item in items():
+            parsed.append(item)
+            yield lines.popleft(), item
+        # Same cache entry load() would have written
+        if parsed:
+            self.cache.put(file_path, parsed)